@@ -9,17 +9,38 @@ This script runs inside the plugin-runner Docker container and provides:
 4. Secure output formatting
 """
 
-import json
+import os
 import sys
 import traceback
-import signal
+import threading
+import time
 import resource
-from pathlib import Path
-from typing import Any, Dict
+import struct
+import types
+from types import CodeType, MappingProxyType
+from typing import Any, Dict, List, Optional, Tuple
 
-from RestrictedPython import compile_restricted, safe_builtins, limited_builtins
+import orjson
+from RestrictedPython import compile_restricted_exec, safe_builtins, limited_builtins
 from RestrictedPython.Guards import safe_globals, guarded_iter_unpack_sequence
 
+# Plugin SDK - resolved once at startup, outside the timed execution path
+try:
+    from nadoo_plugin import PluginContext
+    from nadoo_plugin.api import InternalAPIClient
+
+    SDK_AVAILABLE = True
+    SDK_IMPORT_ERROR = None
+except ImportError as e:
+    SDK_AVAILABLE = False
+    SDK_IMPORT_ERROR = str(e)
+    PluginContext = None
+    InternalAPIClient = None
+
+
+# Input/output frame header: 4-byte little-endian payload length
+FRAME_HEADER = struct.Struct('<I')
+
 
 def setup_resource_limits():
     """Set OS-level resource limits"""
@@ -41,9 +62,39 @@ def setup_resource_limits():
     resource.setrlimit(resource.RLIMIT_NPROC, (10, 10))
 
 
-def timeout_handler(signum, frame):
-    """Handle execution timeout"""
-    raise TimeoutError("Plugin execution exceeded time limit")
+# Execution deadline (monotonic seconds, 0 = disarmed) polled by a single
+# watchdog thread, instead of arming SIGALRM for every run
+EXECUTION_TIMEOUT = 30.0
+WATCHDOG_INTERVAL = 0.05
+_deadline = [0.0]
+_output_lock = threading.Lock()
+_watchdog: Optional[threading.Thread] = None
+
+
+def _watchdog_loop():
+    """Report a timeout and exit once the deadline passes"""
+    while True:
+        time.sleep(WATCHDOG_INTERVAL)
+        deadline = _deadline[0]
+        if deadline and time.monotonic() > deadline:
+            with _output_lock:
+                # Main thread may have written its result in the meantime
+                if _deadline[0]:
+                    _write_frame({
+                        'success': False,
+                        'error': 'Execution timeout',
+                        'details': 'Plugin execution exceeded time limit',
+                    })
+                    os._exit(124)  # Standard timeout exit code
+
+
+def arm_deadline(timeout: float) -> None:
+    """Start the watchdog (once) and set the execution deadline"""
+    global _watchdog
+    _deadline[0] = time.monotonic() + timeout
+    if _watchdog is None:
+        _watchdog = threading.Thread(target=_watchdog_loop, name='watchdog', daemon=True)
+        _watchdog.start()
 
 
 def create_safe_builtins():
@@ -110,6 +161,49 @@ def create_safe_builtins():
     return safe_dict
 
 
+class PluginClassRegistry:
+    """
+    Class factory used as RestrictedPython's __metaclass__
+
+    RestrictedPython compiles every class statement with
+    metaclass=__metaclass__, so classes are recorded as they are defined
+    instead of scanning the globals afterwards.
+    """
+
+    def __init__(self):
+        self.plugin_classes: List[type] = []
+
+    def __call__(self, name: str, bases: tuple, namespace: dict) -> type:
+        metaclass, _, _ = types.prepare_class(name, bases)
+        cls = metaclass(name, bases, namespace)
+
+        if any(base.__name__ == 'NadooPlugin' for base in bases):
+            self.plugin_classes.append(cls)
+
+        return cls
+
+
+# Builtins never change between runs - build them once at import time and
+# freeze the template so a run can't leak changes into the next one
+_SAFE_BUILTINS_TEMPLATE = MappingProxyType(create_safe_builtins())
+
+
+def compile_plugin(code: str) -> Tuple[Optional[CodeType], Tuple[str, ...]]:
+    """
+    Compile plugin code with RestrictedPython
+
+    Args:
+        code: Plugin source code
+
+    Returns:
+        Tuple of (code object or None, compilation errors)
+    """
+    byte_code = compile_restricted_exec(code, filename='<plugin>')
+    if byte_code.errors:
+        return None, tuple(byte_code.errors)
+    return byte_code.code, ()
+
+
 def execute_plugin(code: str, config: Dict[str, Any]) -> Dict[str, Any]:
     """
     Execute plugin code in RestrictedPython sandbox
@@ -122,28 +216,30 @@ def execute_plugin(code: str, config: Dict[str, Any]) -> Dict[str, Any]:
         Execution result dictionary
     """
     # Compile code with RestrictedPython
-    byte_code = compile_restricted(
-        code,
-        filename='<plugin>',
-        mode='exec'
-    )
+    byte_code, errors = compile_plugin(code)
 
     # Check for compilation errors
-    if byte_code.errors:
+    if errors:
         return {
             'success': False,
             'error': 'Compilation failed',
-            'details': byte_code.errors
+            'details': errors
         }
 
     # Create safe execution environment
-    safe_dict = create_safe_builtins()
+    safe_dict = dict(_SAFE_BUILTINS_TEMPLATE)
+    registry = PluginClassRegistry()
+    safe_dict['__metaclass__'] = registry
+
+    if not SDK_AVAILABLE:
+        return {
+            'success': False,
+            'error': 'Failed to initialize plugin environment',
+            'details': SDK_IMPORT_ERROR
+        }
 
     # Add plugin SDK components
     try:
-        from nadoo_plugin import PluginContext
-        from nadoo_plugin.api import InternalAPIClient
-
         # Create context from config
         context = PluginContext(
             execution_id=config['execution_id'],
@@ -185,25 +281,17 @@ def execute_plugin(code: str, config: Dict[str, Any]) -> Dict[str, Any]:
 
     # Execute plugin code
     try:
-        exec(byte_code.code, safe_dict)
+        exec(byte_code, safe_dict)
 
         # Find plugin class
-        plugin_class = None
-        for name, obj in safe_dict.items():
-            if (isinstance(obj, type) and
-                hasattr(obj, '__bases__') and
-                any(base.__name__ == 'NadooPlugin' for base in obj.__bases__)):
-                plugin_class = obj
-                break
-
-        if not plugin_class:
+        if not registry.plugin_classes:
             return {
                 'success': False,
                 'error': 'No NadooPlugin subclass found in code'
             }
 
         # Instantiate and execute
-        plugin_instance = plugin_class()
+        plugin_instance = registry.plugin_classes[0]()
         plugin_instance.initialize(context=context, api=api_client)
 
         result = plugin_instance.execute(
@@ -221,82 +309,88 @@ def execute_plugin(code: str, config: Dict[str, Any]) -> Dict[str, Any]:
         }
 
     except Exception as e:
-        return {
+        result = {
             'success': False,
             'error': str(e),
-            'traceback': traceback.format_exc(),
         }
+        # Formatting the stack is costly - only plugins in debug mode need it
+        if config.get('debug_mode', False):
+            result['traceback'] = traceback.format_exc()
+        return result
+
+
+def read_frame(stream) -> bytes:
+    """Read one length-prefixed frame from a binary stream"""
+    header = stream.read(FRAME_HEADER.size)
+    if len(header) != FRAME_HEADER.size:
+        raise ValueError('Truncated input frame header')
+
+    (length,) = FRAME_HEADER.unpack(header)
+    data = stream.read(length)
+    if len(data) != length:
+        raise ValueError('Truncated input frame')
+    return data
+
+
+def _write_frame(result: Dict[str, Any]) -> None:
+    """Write result to stdout as a length-prefixed JSON frame"""
+    payload = orjson.dumps(result, option=orjson.OPT_NON_STR_KEYS)
+    sys.stdout.buffer.write(FRAME_HEADER.pack(len(payload)))
+    sys.stdout.buffer.write(payload)
+    sys.stdout.buffer.flush()
+
+
+def write_output(result: Dict[str, Any]) -> None:
+    """Disarm the deadline and write the final result"""
+    with _output_lock:
+        _deadline[0] = 0.0
+        _write_frame(result)
 
 
 def main():
     """Main execution entry point"""
+    debug_mode = False
+
     try:
         # Setup resource limits
         setup_resource_limits()
 
         # Setup timeout (30 seconds)
-        signal.signal(signal.SIGALRM, timeout_handler)
-        signal.alarm(30)
-
-        # Read configuration from stdin or environment
-        config_path = Path('/plugin/config.json')
-        if config_path.exists():
-            with open(config_path, 'r') as f:
-                config = json.load(f)
-        else:
-            # Read from stdin
-            config = json.loads(sys.stdin.read())
-
-        # Read plugin code
-        code_path = Path('/plugin/code') / config.get('entry_point', 'main.py')
-        if not code_path.exists():
-            print(json.dumps({
-                'success': False,
-                'error': f'Plugin code not found: {code_path}'
-            }))
-            sys.exit(1)
+        arm_deadline(EXECUTION_TIMEOUT)
 
-        with open(code_path, 'r', encoding='utf-8') as f:
-            code = f.read()
+        # Read config and code frames from stdin: <len><config JSON><len><code>
+        config = orjson.loads(read_frame(sys.stdin.buffer))
+        code = read_frame(sys.stdin.buffer).decode('utf-8')
+        debug_mode = config.get('debug_mode', False)
 
         # Execute plugin
         result = execute_plugin(code, config)
 
         # Output result as JSON
-        print(json.dumps(result, ensure_ascii=False, indent=2))
+        write_output(result)
 
         # Exit with appropriate code
         sys.exit(0 if result['success'] else 1)
 
-    except TimeoutError as e:
-        print(json.dumps({
-            'success': False,
-            'error': 'Execution timeout',
-            'details': str(e)
-        }))
-        sys.exit(124)  # Standard timeout exit code
-
     except MemoryError as e:
-        print(json.dumps({
+        write_output({
             'success': False,
             'error': 'Memory limit exceeded',
             'details': str(e)
-        }))
+        })
         sys.exit(137)  # Standard OOM exit code
 
     except Exception as e:
-        print(json.dumps({
+        result = {
             'success': False,
             'error': 'Unexpected error',
             'details': str(e),
-            'traceback': traceback.format_exc()
-        }))
+        }
+        if debug_mode:
+            result['traceback'] = traceback.format_exc()
+        write_output(result)
         sys.exit(1)
 
-    finally:
-        # Cancel alarm
-        signal.alarm(0)
-
 
 if __name__ == '__main__':
     main()
@@ -5,6 +5,7 @@ from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
 from pydantic import BaseModel, Field
 from typing import Optional, Dict, List
 from datetime import datetime
+import asyncio
 import uuid
 
 from ..core.config import get_settings
@@ -15,6 +16,9 @@ from ..utils.auth import verify_api_key
 router = APIRouter(prefix="/execute", tags=["execution"])
 settings = get_settings()
 
+# Membership set for per-request language validation
+SUPPORTED_LANGUAGES = frozenset(settings.supported_languages)
+
 class ExecuteRequest(BaseModel):
     """Code execution request"""
     code: str = Field(..., description="Code to execute")
@@ -56,7 +60,7 @@ async def execute_code(
     """Execute code in a sandboxed environment"""
 
     # Validate language
-    if request.language not in settings.supported_languages:
+    if request.language not in SUPPORTED_LANGUAGES:
         raise HTTPException(
             status_code=400,
             detail=f"Unsupported language: {request.language}. Supported languages: {', '.join(settings.supported_languages)}"
@@ -96,7 +100,7 @@ async def execute_code_async(
     """Execute code asynchronously"""
 
     # Validate language
-    if request.language not in settings.supported_languages:
+    if request.language not in SUPPORTED_LANGUAGES:
         raise HTTPException(
             status_code=400,
             detail=f"Unsupported language: {request.language}"
@@ -152,10 +156,12 @@ async def execute_batch(
             detail="Maximum 10 executions allowed in a batch"
         )
 
-    results = []
-    for request in requests:
-        try:
-            result = await execution_service.execute(
+    # Run independently, bounded by the container concurrency limit
+    semaphore = asyncio.Semaphore(settings.max_concurrent_executions)
+
+    async def run(request: ExecuteRequest) -> ExecuteResponse:
+        async with semaphore:
+            return await execution_service.execute(
                 code=request.code,
                 language=request.language,
                 stdin=request.stdin,
@@ -163,18 +169,27 @@ async def execute_batch(
                 timeout=request.timeout,
                 session_id=request.session_id,
             )
-            results.append(result)
-        except Exception as e:
+
+    outcomes = await asyncio.gather(
+        *(run(request) for request in requests),
+        return_exceptions=True,
+    )
+
+    results = []
+    for request, outcome in zip(requests, outcomes):
+        if isinstance(outcome, Exception):
             # Return error as result
             results.append(ExecuteResponse(
                 execution_id=str(uuid.uuid4()),
                 stdout="",
-                stderr=str(e),
+                stderr=str(outcome),
                 exit_code=-1,
                 execution_time=0,
                 language=request.language,
                 session_id=request.session_id,
             ))
+        else:
+            results.append(outcome)
 
     return results
 
@@ -187,7 +202,7 @@ async def get_supported_languages():
 async def get_language_info(language: str):
     """Get information about a specific language"""
 
-    if language not in settings.supported_languages:
+    if language not in SUPPORTED_LANGUAGES:
         raise HTTPException(
             status_code=404,
             detail=f"Language {language} not supported"
@@ -2,14 +2,13 @@
 Plugin Execution API - Execute Nadoo plugins in secure containers
 """
 import asyncio
-import json
 import logging
-import tempfile
-from pathlib import Path
+import time
 from typing import Any, Dict, Optional
 
-from fastapi import APIRouter, HTTPException, Header, Depends
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, HTTPException, Header, Depends, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, Field, ValidationError
 
 from core.config import get_settings
 from services.plugin_runner import PluginRunner
@@ -77,34 +76,52 @@ def verify_api_key(x_api_key: str = Header(..., alias="X-API-Key")) -> str:
     return x_api_key
 
 
-@router.post("/execute", response_model=PluginExecutionResponse)
+async def parse_plugin_request(request: Request) -> PluginExecutionRequest:
+    """
+    Parse plugin execution request directly from the raw JSON body
+
+    pydantic-core parses and validates in a single pass, skipping FastAPI's
+    intermediate json.loads() and dict validation for this ~20 field model.
+    """
+    try:
+        return PluginExecutionRequest.model_validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError([
+            {**error, "loc": ("body", *error["loc"])}
+            for error in e.errors(include_url=False)
+        ])
+
+
+@router.post(
+    "/execute",
+    response_model=PluginExecutionResponse,
+    # Authenticate before the body is read and validated
+    dependencies=[Depends(verify_api_key)],
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/json": {"schema": PluginExecutionRequest.model_json_schema()}
+            },
+            "required": True,
+        }
+    },
+)
 async def execute_plugin(
-    request: PluginExecutionRequest,
-    api_key: str = Depends(verify_api_key)
+    request: PluginExecutionRequest = Depends(parse_plugin_request),
 ):
     """
     Execute a plugin in a secure sandboxed environment
 
     This endpoint:
-    1. Creates a temporary directory with plugin code
-    2. Generates execution config
-    3. Spawns a plugin-runner Docker container
+    1. Generates execution config
+    2. Takes a pre-booted plugin-runner container from the warm pool
+    3. Pipes config and code to the wrapper over stdin
     4. Executes plugin with RestrictedPython
-    5. Returns results and cleans up
+    5. Returns results and retires the container
     """
     logger.info(f"Executing plugin {request.plugin_id}, tool: {request.tool_name}")
 
-    temp_dir = None
     try:
-        # Create temporary directory for plugin code
-        temp_dir = Path(tempfile.mkdtemp(dir=settings.temp_dir))
-        plugin_dir = temp_dir / "code"
-        plugin_dir.mkdir()
-
-        # Write plugin code
-        entry_point_path = plugin_dir / request.entry_point
-        entry_point_path.write_text(request.plugin_code, encoding='utf-8')
-
         # Create execution config
         config = {
             "execution_id": request.execution_id,
@@ -128,13 +145,10 @@ async def execute_plugin(
             "entry_point": request.entry_point,
         }
 
-        config_path = temp_dir / "config.json"
-        config_path.write_text(json.dumps(config, indent=2), encoding='utf-8')
-
-        # Execute in plugin-runner container
+        # Execute in a (warm) plugin-runner container
         result = await plugin_runner.execute(
-            plugin_dir=str(plugin_dir),
-            config_path=str(config_path),
+            config=config,
+            code=request.plugin_code,
             timeout=request.timeout or settings.max_execution_time,
             memory_limit=request.memory_limit or settings.max_memory,
         )
@@ -153,33 +167,37 @@ async def execute_plugin(
         return PluginExecutionResponse(
             success=False,
             error=str(e),
-            traceback=str(e),
+            traceback=str(e) if settings.debug else None,
         )
 
-    finally:
-        # Cleanup temp directory
-        if temp_dir and temp_dir.exists():
-            try:
-                import shutil
-                shutil.rmtree(temp_dir, ignore_errors=True)
-            except Exception as e:
-                logger.warning(f"Failed to cleanup temp dir: {e}")
+
+# Plugin-runner image lookups are cached between health probes
+RUNNER_IMAGE_CHECK_INTERVAL = 30.0
+_runner_image_checked_at: Optional[float] = None
+_runner_available = False
 
 
 @router.get("/health")
 async def plugin_health():
     """Plugin execution health check"""
-    # Check if plugin-runner image exists
-    try:
-        import docker
-        client = docker.from_env()
-        client.images.get("nadoo-plugin-runner:latest")
-        runner_available = True
-    except:
-        runner_available = False
+    global _runner_image_checked_at, _runner_available
+
+    now = time.monotonic()
+    if (
+        _runner_image_checked_at is None
+        or now - _runner_image_checked_at >= RUNNER_IMAGE_CHECK_INTERVAL
+    ):
+        # Check if plugin-runner image exists, reusing the runner's client
+        try:
+            plugin_runner.client.images.get("nadoo-plugin-runner:latest")
+            _runner_available = True
+        except Exception:
+            _runner_available = False
+        _runner_image_checked_at = now
 
     return {
-        "status": "healthy" if runner_available else "degraded",
-        "plugin_runner_image": runner_available,
+        "status": "healthy" if _runner_available else "degraded",
+        "plugin_runner_image": _runner_available,
         "max_concurrent": settings.max_concurrent_executions,
+        "warm_pool": plugin_runner.get_pool_status(),
     }
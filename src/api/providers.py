@@ -4,19 +4,51 @@ Provider Management API
 Endpoints for managing and monitoring execution providers.
 """
 
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+import time
+from functools import lru_cache
+from typing import Dict, List, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Response
 from pydantic import BaseModel
 
 from ..core.executor import (
     ExecutorProvider,
     ExecutorRegistry,
+    HealthStatus,
     Runtime,
 )
 from ..utils.auth import verify_api_key
 
 router = APIRouter(prefix="/api/v1/providers", tags=["providers"])
 
+# Short-lived health cache so status polling doesn't hit providers every time
+HEALTH_CACHE_TTL_SECONDS = 1.0
+_health_cache: Dict[ExecutorProvider, Tuple[float, HealthStatus]] = {}
+
+
+@lru_cache(maxsize=32)
+def _parse_provider(value: str) -> ExecutorProvider:
+    """Parse provider name (invalid names raise ValueError and aren't cached)"""
+    return ExecutorProvider(value)
+
+
+@lru_cache(maxsize=32)
+def _parse_runtime(value: str) -> Runtime:
+    """Parse runtime name (invalid names raise ValueError and aren't cached)"""
+    return Runtime(value)
+
+
+async def _cached_health(provider: ExecutorProvider) -> HealthStatus:
+    """Get provider health, reusing results younger than the cache TTL"""
+    cached = _health_cache.get(provider)
+    if cached and time.monotonic() - cached[0] < HEALTH_CACHE_TTL_SECONDS:
+        return cached[1]
+
+    executor = ExecutorRegistry.get(provider)
+    health = await executor.health_check()
+    _health_cache[provider] = (time.monotonic(), health)
+    return health
+
 
 # Response Models
 class ProviderInfo(BaseModel):
@@ -79,31 +111,35 @@ async def list_providers(api_key: str = Depends(verify_api_key)):
     """
     List all registered providers with their status.
     """
-    providers_info: List[ProviderInfo] = []
+    providers = ExecutorRegistry.get_available_providers()
+    results = await asyncio.gather(
+        *(_cached_health(provider) for provider in providers),
+        return_exceptions=True,
+    )
 
-    for provider in ExecutorRegistry.get_available_providers():
-        try:
-            executor = ExecutorRegistry.get(provider)
-            health = await executor.health_check()
+    providers_info: List[ProviderInfo] = []
 
-            providers_info.append(
-                ProviderInfo(
-                    name=provider.value,
-                    healthy=health.healthy,
-                    message=health.message,
-                    pool_size=health.pool_size,
-                    available=health.available_containers,
-                    busy=health.busy_containers,
-                )
-            )
-        except Exception as e:
+    for provider, health in zip(providers, results):
+        if isinstance(health, Exception):
             providers_info.append(
                 ProviderInfo(
                     name=provider.value,
                     healthy=False,
-                    message=str(e),
+                    message=str(health),
                 )
             )
+            continue
+
+        providers_info.append(
+            ProviderInfo(
+                name=provider.value,
+                healthy=health.healthy,
+                message=health.message,
+                pool_size=health.pool_size,
+                available=health.available_containers,
+                busy=health.busy_containers,
+            )
+        )
 
     return ProvidersResponse(
         providers=providers_info,
@@ -121,15 +157,14 @@ async def get_provider_status(
     Get status of a specific provider.
     """
     try:
-        executor_provider = ExecutorProvider(provider)
+        executor_provider = _parse_provider(provider)
     except ValueError:
         raise HTTPException(status_code=404, detail=f"Unknown provider: {provider}")
 
     if not ExecutorRegistry.is_registered(executor_provider):
         raise HTTPException(status_code=404, detail=f"Provider not registered: {provider}")
 
-    executor = ExecutorRegistry.get(executor_provider)
-    health = await executor.health_check()
+    health = await _cached_health(executor_provider)
 
     return ProviderInfo(
         name=provider,
@@ -150,7 +185,7 @@ async def get_provider_metrics(
     Get execution metrics for a provider.
     """
     try:
-        executor_provider = ExecutorProvider(provider)
+        executor_provider = _parse_provider(provider)
     except ValueError:
         raise HTTPException(status_code=404, detail=f"Unknown provider: {provider}")
 
@@ -190,7 +225,7 @@ async def warm_up_provider(
     Warm up containers for a provider.
     """
     try:
-        executor_provider = ExecutorProvider(provider)
+        executor_provider = _parse_provider(provider)
     except ValueError:
         raise HTTPException(status_code=404, detail=f"Unknown provider: {provider}")
 
@@ -198,7 +233,7 @@ async def warm_up_provider(
         raise HTTPException(status_code=404, detail=f"Provider not registered: {provider}")
 
     try:
-        runtime = Runtime(request.runtime)
+        runtime = _parse_runtime(request.runtime)
     except ValueError:
         raise HTTPException(status_code=400, detail=f"Unknown runtime: {request.runtime}")
 
@@ -221,7 +256,7 @@ async def health_check_provider(
     Detailed health check for a provider.
     """
     try:
-        executor_provider = ExecutorProvider(provider)
+        executor_provider = _parse_provider(provider)
     except ValueError:
         raise HTTPException(status_code=404, detail=f"Unknown provider: {provider}")
 
@@ -231,4 +266,4 @@ async def health_check_provider(
     executor = ExecutorRegistry.get(executor_provider)
     health = await executor.health_check()
 
-    return health.to_dict()
+    return Response(content=health.to_json(), media_type="application/json")
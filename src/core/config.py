@@ -3,7 +3,6 @@ Sandbox service configuration
 """
 from typing import List, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from functools import lru_cache
 
 class Settings(BaseSettings):
     """Sandbox service settings"""
@@ -34,6 +33,7 @@ class Settings(BaseSettings):
     warm_pool_max_idle_time: int = 300  # seconds
     warm_pool_container_ttl: int = 3600  # seconds
     warm_pool_health_check_interval: int = 30  # seconds
+    warm_pool_predictive_warmup: bool = False
 
     # Docker (Local Executor)
     docker_socket: str = "unix://var/run/docker.sock"
@@ -44,6 +44,8 @@ class Settings(BaseSettings):
     aws_lambda_enabled: bool = False
     aws_lambda_region: str = "ap-northeast-2"
     aws_lambda_function_prefix: str = "nadoo-sandbox"
+    aws_lambda_predictive_warmup: bool = False
+    aws_lambda_s3_staging_bucket: Optional[str] = None
 
     # GCP Cloud Run Configuration
     gcp_cloud_run_enabled: bool = False
@@ -63,6 +65,9 @@ class Settings(BaseSettings):
     max_cpu: float = 0.5
     max_concurrent_executions: int = 10
 
+    # Plugin runner
+    plugin_runner_warm_pool: int = 2  # pre-booted plugin-runner containers
+
     # Redis
     redis_url: str = "redis://localhost:6379/2"
     redis_prefix: str = "nadoo:sandbox:"
@@ -118,7 +123,11 @@ class Settings(BaseSettings):
         case_sensitive=False,
     )
 
-@lru_cache()
+
+# Settings singleton, loaded once at import
+SETTINGS = Settings()
+
+
 def get_settings() -> Settings:
-    """Get cached settings instance"""
-    return Settings()
+    """Get settings instance"""
+    return SETTINGS
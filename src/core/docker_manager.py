@@ -3,25 +3,304 @@ Docker container management for secure code execution
 """
 import asyncio
 import docker
-import uuid
-import tempfile
+import hashlib
+import io
+import secrets
+import tarfile
+import time
 import os
-from typing import Dict, Any, Optional, Tuple
-from pathlib import Path
+from typing import Dict, Any, List, Optional, Set, Tuple
 import logging
+from collections import OrderedDict
+from functools import lru_cache
+from types import MappingProxyType
 
-from .config import get_settings
+from docker.errors import DockerException
+from docker.models.containers import Container
+
+from .config import SETTINGS as settings
+from .warm_pool.shell import run_exec
 
 logger = logging.getLogger(__name__)
-settings = get_settings()
+
+# Pooled containers idle on this and have code exec'd into them
+IDLE_COMMAND = ["tail", "-f", "/dev/null"]
+
+# Code directory inside pooled containers (tmpfs)
+CODE_DIR = "/code"
+STDIN_FILENAME = ".stdin"
+
+# Pooled containers are reused across callers, so nothing an execution
+# writes may survive its reset: the root filesystem is read-only, the only
+# writable paths are tmpfs mounts wiped between executions, and code runs
+# as an unprivileged user
+POOLED_RUN_KWARGS = MappingProxyType({
+    "user": "65534:65534",  # nobody
+    "read_only": True,
+    "tmpfs": {
+        CODE_DIR: "rw,size=16m,mode=1777",
+        # Compiled programs (and go run's builds) execute from /tmp, and
+        # Docker mounts tmpfs noexec unless told otherwise
+        "/tmp": "rw,exec,size=64m,mode=1777",
+    },
+    "environment": {"HOME": "/tmp"},  # Compiler and package caches
+    "pids_limit": 50,
+    "cap_drop": ["ALL"],
+    "security_opt": ["no-new-privileges"],
+})
+
+# Files are unpacked from a tar stream relative to / (put_archive can't
+# write into tmpfs mounts), so archive members are code/... and tmp/...
+EXTRACT_COMMAND = ["tar", "-x", "-f", "-", "-C", "/"]
+
+# Writable paths of pooled containers, emptied between executions (find
+# also catches the dotfiles shell globs miss, like "..name")
+SCRATCH_DIRS = (CODE_DIR, "/tmp")
+CLEAR_SCRATCH_SCRIPT = 'find "$@" -mindepth 1 -delete'
+
+# Kill leftover processes (PID 1 is exempt) and wipe files between executions
+RESET_COMMAND = [
+    "sh", "-c",
+    f"kill -9 -1 2>/dev/null; {CLEAR_SCRATCH_SCRIPT}",
+    "sh", *SCRATCH_DIRS,
+]
+
+# (image, mem_limit, cpu_quota)
+PoolKey = Tuple[str, str, int]
+
+# Compile-then-run languages build this binary before running it; the
+# binary is cached so identical code skips the compile step (always under
+# /tmp, which pooled containers wipe on reset)
+COMPILED_PROGRAM = "/tmp/program"
+COMPILE_COMMANDS: Dict[str, str] = {
+    "rust": "rustc {name} -o /tmp/program",
+    "cpp": "g++ {name} -o /tmp/program",
+}
+COMPILED_LANGUAGES = frozenset(COMPILE_COMMANDS)
+ARTIFACT_CACHE_SIZE = 64
+ARTIFACT_CACHE_TTL = 3600.0  # seconds
+
+FILE_EXTENSIONS: Dict[str, str] = {
+    "python": "py",
+    "javascript": "js",
+    "typescript": "ts",
+    "java": "java",
+    "go": "go",
+    "rust": "rs",
+    "cpp": "cpp",
+    "csharp": "cs",
+    "ruby": "rb",
+    "php": "php",
+    "sql": "sql",
+    "bash": "sh",
+}
+
+# Command templates: {name} is the code file name, {stem} the name without extension
+EXECUTION_COMMANDS: Dict[str, str] = {
+    "python": "python {name}",
+    "javascript": "node {name}",
+    "typescript": "npx ts-node {name}",
+    "java": "javac {name} && java {stem}",
+    "go": "go run {name}",
+    "rust": "rustc {name} -o /tmp/program && /tmp/program",
+    "cpp": "g++ {name} -o /tmp/program && /tmp/program",
+    "csharp": "dotnet script {name}",
+    "ruby": "ruby {name}",
+    "php": "php {name}",
+    "sql": "psql -f {name}",
+    "bash": "bash {name}",
+}
+
+
+@lru_cache(maxsize=None)
+def _base_run_kwargs(image: str) -> MappingProxyType:
+    """Container settings shared by every execution of an image, built once"""
+    return MappingProxyType({
+        "image": image,
+        "working_dir": CODE_DIR,
+        "mem_limit": settings.max_memory,
+        "cpu_quota": int(settings.max_cpu * 100000),
+        "network_mode": "none",  # No network access
+    })
+
+
+def _build_archive(
+    files: Dict[str, str],
+    prefix: str = "",
+    program: Optional[bytes] = None,
+) -> bytes:
+    """
+    Build an in-memory tar archive from {name: content}
+
+    Args:
+        prefix: Directory prepended to every file name
+        program: Compiled program to add as tmp/program
+    """
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w") as tar:
+        for name, content in files.items():
+            data = content.encode("utf-8")
+            info = tarfile.TarInfo(name=prefix + name)
+            info.size = len(data)
+            info.mode = 0o644
+            tar.addfile(info, io.BytesIO(data))
+
+        if program is not None:
+            info = tarfile.TarInfo(name=COMPILED_PROGRAM.lstrip("/"))
+            info.size = len(program)
+            info.mode = 0o755
+            tar.addfile(info, io.BytesIO(program))
+    return buf.getvalue()
+
+
+class ArtifactCache:
+    """Small LRU cache with per-entry expiry for compiled programs"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: bytes) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+class WarmPool:
+    """
+    Idle containers kept running between executions
+
+    Containers are keyed by (image, mem_limit, cpu_quota). Code is unpacked
+    from a tar stream over exec (put_archive can't write into the tmpfs
+    mounts) and run with exec, keeping container create/remove round-trips
+    off the execution path.
+    """
+
+    def __init__(self, client: docker.DockerClient, max_idle: int):
+        self.client = client
+        self.max_idle = max_idle
+        self._idle: Dict[PoolKey, List[Container]] = {}
+        self._idle_count = 0
+
+    @staticmethod
+    def _key(image: str) -> PoolKey:
+        kwargs = _base_run_kwargs(image)
+        return (image, kwargs["mem_limit"], kwargs["cpu_quota"])
+
+    def _create(self, key: PoolKey) -> Container:
+        """Start an idle container (blocking)"""
+        return self.client.containers.run(
+            **_base_run_kwargs(key[0]),
+            **POOLED_RUN_KWARGS,
+            command=IDLE_COMMAND,
+            detach=True,
+        )
+
+    async def warm_up(self, image: str, count: int) -> int:
+        """
+        Pre-create idle containers for an image
+
+        Returns:
+            Number of containers added to the pool
+        """
+        key = self._key(image)
+        count = min(count, self.max_idle - self._idle_count)
+        if count <= 0:
+            return 0
+
+        results = await asyncio.gather(
+            *(asyncio.to_thread(self._create, key) for _ in range(count)),
+            return_exceptions=True,
+        )
+
+        added = 0
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to warm container for {image}: {result}")
+                continue
+            self._idle.setdefault(key, []).append(result)
+            self._idle_count += 1
+            added += 1
+        return added
+
+    async def acquire(self, image: str) -> Container:
+        """Take an idle container for image, creating one on a miss"""
+        key = self._key(image)
+        idle = self._idle.get(key)
+        if idle:
+            self._idle_count -= 1
+            return idle.pop()
+        return await asyncio.to_thread(self._create, key)
+
+    async def release(self, image: str, container: Container) -> None:
+        """Reset a container and return it to the pool"""
+        try:
+            exit_code, _, _ = await run_exec(self.client.api, container.id, RESET_COMMAND)
+            reusable = exit_code == 0
+        except (DockerException, OSError) as e:
+            logger.warning(f"Failed to reset container {container.short_id}: {e}")
+            reusable = False
+
+        if reusable and self._idle_count < self.max_idle:
+            self._idle.setdefault(self._key(image), []).append(container)
+            self._idle_count += 1
+            return
+
+        await self.discard(container)
+
+    async def discard(self, container: Container) -> None:
+        """Remove a container instead of returning it to the pool"""
+        try:
+            await asyncio.to_thread(container.remove, force=True)
+        except DockerException as e:
+            logger.warning(f"Failed to remove container {container.short_id}: {e}")
+
+    async def close(self) -> None:
+        """Remove all idle containers"""
+        containers = [c for idle in self._idle.values() for c in idle]
+        self._idle.clear()
+        self._idle_count = 0
+        await asyncio.gather(*(self.discard(c) for c in containers))
+
 
 class DockerManager:
     """Manages Docker containers for code execution"""
 
-    def __init__(self):
+    def __init__(self, pool_size: Optional[int] = None):
         self.client = docker.from_env()
         self.active_containers: Dict[str, Any] = {}
 
+        # Admission limit shared by all executions on this manager
+        self._max_concurrent = settings.max_concurrent_executions
+        self._semaphore = asyncio.BoundedSemaphore(self._max_concurrent)
+        self._running = 0
+
+        # Images known to be present locally
+        self._ensured_images: Set[str] = set()
+
+        # Compiled binaries by code hash and language
+        self._artifacts = ArtifactCache(ARTIFACT_CACHE_SIZE, ARTIFACT_CACHE_TTL)
+
+        # Warm containers, capped at the concurrency limit (0 disables pooling)
+        if pool_size is None:
+            pool_size = settings.max_concurrent_executions
+        self.pool = WarmPool(self.client, pool_size) if pool_size > 0 else None
+
     async def execute_code(
         self,
         code: str,
@@ -39,53 +318,206 @@ class DockerManager:
         if language not in settings.supported_languages:
             raise ValueError(f"Unsupported language: {language}")
 
-        container_id = str(uuid.uuid4())
         timeout = timeout or settings.max_execution_time
 
-        try:
-            # Prepare code file
-            code_file = await self._prepare_code_file(code, language)
+        # Get container image
+        image = settings.language_images.get(language)
+        if not image:
+            raise ValueError(f"No Docker image configured for {language}")
 
-            # Get container image
-            image = settings.language_images.get(language)
-            if not image:
-                raise ValueError(f"No Docker image configured for {language}")
+        # Pull image if not exists (checked once per image)
+        if image not in self._ensured_images:
+            await asyncio.to_thread(self._ensure_image, image)
+            self._ensured_images.add(image)
 
-            # Pull image if not exists
+        # Cap concurrent executions before touching any container
+        async with self._semaphore:
+            self._running += 1
             try:
-                self.client.images.get(image)
-            except docker.errors.ImageNotFound:
-                logger.info(f"Pulling Docker image: {image}")
-                self.client.images.pull(image)
-
-            # Prepare command
-            command = self._get_execution_command(language, code_file.name)
-
-            # Create and run container
-            container = self.client.containers.run(
-                image=image,
-                command=command,
-                volumes={
-                    str(code_file.parent): {
-                        "bind": "/code",
-                        "mode": "ro"
-                    }
-                },
-                working_dir="/code",
-                mem_limit=settings.max_memory,
-                cpu_quota=int(settings.max_cpu * 100000),
-                network_mode="none",  # No network access
-                remove=False,
-                detach=True,
-                stdin_open=bool(stdin),
-                environment=environment or {},
+                if self.pool is not None:
+                    return await self._execute_pooled(
+                        code, language, image, stdin, environment, timeout
+                    )
+                return await self._execute_oneshot(
+                    code, language, image, stdin, environment, timeout
+                )
+            finally:
+                self._running -= 1
+
+    @property
+    def slots_available(self) -> int:
+        """Number of executions that can start without waiting"""
+        return self._max_concurrent - self._running
+
+    def _ensure_image(self, image: str) -> None:
+        """Pull image if it is not present locally (blocking)"""
+        try:
+            self.client.images.get(image)
+        except docker.errors.ImageNotFound:
+            logger.info(f"Pulling Docker image: {image}")
+            self.client.images.pull(image)
+
+    async def warm_up(self, language: str, count: int = 1) -> int:
+        """
+        Pre-create pooled containers for a language
+
+        Returns:
+            Number of containers added to the pool
+        """
+        image = settings.language_images.get(language)
+        if self.pool is None or not image:
+            return 0
+        return await self.pool.warm_up(image, count)
+
+    async def _execute_pooled(
+        self,
+        code: str,
+        language: str,
+        image: str,
+        stdin: Optional[str],
+        environment: Optional[Dict[str, str]],
+        timeout: int,
+    ) -> Tuple[str, str, int]:
+        """Execute code by exec'ing into a pooled container"""
+        artifact_key = None
+        artifact = None
+        compile_command = None
+        if language in COMPILED_LANGUAGES:
+            digest = hashlib.blake2b(code.encode("utf-8"), digest_size=16).hexdigest()
+            artifact_key = f"{digest}:{language}"
+            artifact = self._artifacts.get(artifact_key)
+            if artifact is None:
+                compile_command = self._get_compile_command(language)
+
+        files, command = self._prepare_files(
+            code, language, stdin, precompiled=artifact_key is not None
+        )
+
+        container = await self.pool.acquire(image)
+        try:
+            exit_code, stdout, stderr, built = await asyncio.wait_for(
+                self._inject_and_exec(
+                    container,
+                    _build_archive(files, prefix="code/", program=artifact),
+                    command,
+                    environment,
+                    compile_command,
+                ),
+                timeout=timeout
             )
+        except asyncio.TimeoutError:
+            # The exec keeps running inside the container - replace it
+            await self.pool.discard(container)
+            return "", "Execution timeout exceeded", -1
+        except Exception as e:
+            logger.error(f"Error executing code: {e}")
+            await self.pool.discard(container)
+            raise
 
-            self.active_containers[container_id] = container
+        await self.pool.release(image, container)
+
+        if built is not None:
+            self._artifacts.set(artifact_key, built)
+
+        return (
+            stdout.decode("utf-8", errors="replace"),
+            stderr.decode("utf-8", errors="replace"),
+            exit_code,
+        )
+
+    async def _inject_and_exec(
+        self,
+        container: Container,
+        archive: bytes,
+        command: str,
+        environment: Optional[Dict[str, str]],
+        compile_command: Optional[str] = None,
+    ) -> Tuple[int, bytes, bytes, Optional[bytes]]:
+        """
+        Unpack code into a pooled container and run it
+
+        Args:
+            archive: Files (and any cached compiled program) relative to /
+            compile_command: Build the program first and collect it for caching
+
+        Returns:
+            Tuple of (exit code, stdout, stderr, compiled program or None)
+        """
+        api = self.client.api
+        exit_code, _, stderr = await run_exec(api, container.id, EXTRACT_COMMAND, stdin=archive)
+        if exit_code != 0:
+            raise RuntimeError(f"Failed to unpack code: {stderr.decode('utf-8', errors='replace')}")
+
+        built = None
+        compile_stdout = compile_stderr = b""
+        if compile_command is not None:
+            # The program is collected before any user code has run, so the
+            # cached copy (served to later callers) is exactly what was built.
+            # The compile step doesn't see the caller's environment, which
+            # isn't part of the cache key.
+            exit_code, compile_stdout, compile_stderr = await run_exec(
+                api, container.id, ["sh", "-c", compile_command]
+            )
+            if exit_code != 0:
+                return exit_code, compile_stdout, compile_stderr, None
+
+            exit_code, built, stderr = await run_exec(api, container.id, ["cat", COMPILED_PROGRAM])
+            if exit_code != 0:
+                raise RuntimeError(
+                    f"Failed to read compiled program: {stderr.decode('utf-8', errors='replace')}"
+                )
+
+        exit_code, stdout, stderr = await run_exec(
+            api, container.id, ["sh", "-c", command], environment=environment or None
+        )
+        return exit_code, compile_stdout + stdout, compile_stderr + stderr, built
+
+    def _create_and_start(
+        self,
+        image: str,
+        archive: bytes,
+        command: str,
+        environment: Optional[Dict[str, str]],
+    ) -> Container:
+        """Create a one-shot container, inject code and start it (blocking, one thread hop)"""
+        container = self.client.containers.create(
+            **_base_run_kwargs(image),
+            command=["sh", "-c", command],
+            environment=environment or {},
+        )
+        try:
+            container.put_archive(CODE_DIR, archive)
+            container.start()
+        except Exception:
+            container.remove(force=True)
+            raise
+        return container
 
-            # Send stdin if provided
-            if stdin:
-                container.attach_socket(params={"stdin": 1, "stream": 1}).send(stdin.encode())
+    async def _execute_oneshot(
+        self,
+        code: str,
+        language: str,
+        image: str,
+        stdin: Optional[str],
+        environment: Optional[Dict[str, str]],
+        timeout: int,
+    ) -> Tuple[str, str, int]:
+        """Execute code in a dedicated container that is removed afterwards"""
+        container_id = secrets.token_hex(8)
+
+        try:
+            files, command = self._prepare_files(code, language, stdin)
+
+            # Create the container, inject code, then start it
+            container = await asyncio.to_thread(
+                self._create_and_start,
+                image,
+                _build_archive(files),
+                command,
+                environment,
+            )
+
+            self.active_containers[container_id] = container
 
             # Wait for completion with timeout
             try:
@@ -95,15 +527,24 @@ class DockerManager:
                 )
                 exit_code = exit_code["StatusCode"]
             except asyncio.TimeoutError:
-                container.kill()
+                # Force removal in the finally block kills the container
                 return "", "Execution timeout exceeded", -1
 
-            # Get output
-            logs = container.logs(stdout=True, stderr=True, stream=False)
-            stdout = container.logs(stdout=True, stderr=False).decode("utf-8")
-            stderr = container.logs(stdout=False, stderr=True).decode("utf-8")
+            # Get output - replay the log once, split into (stdout, stderr)
+            stdout, stderr = await asyncio.to_thread(
+                container.attach,
+                stdout=True,
+                stderr=True,
+                stream=False,
+                logs=True,
+                demux=True,
+            )
 
-            return stdout, stderr, exit_code
+            return (
+                stdout.decode("utf-8", errors="replace") if stdout else "",
+                stderr.decode("utf-8", errors="replace") if stderr else "",
+                exit_code,
+            )
 
         except Exception as e:
             logger.error(f"Error executing code: {e}")
@@ -113,83 +554,74 @@ class DockerManager:
             if container_id in self.active_containers:
                 container = self.active_containers.pop(container_id)
                 try:
-                    container.remove(force=True)
-                except:
-                    pass
+                    await asyncio.to_thread(container.remove, force=True)
+                except (DockerException, OSError) as e:
+                    logger.debug(f"Container cleanup failed: {e}")
 
-            # Remove temp file
-            try:
-                if 'code_file' in locals():
-                    os.unlink(code_file)
-            except:
-                pass
-
-    async def _prepare_code_file(self, code: str, language: str) -> Path:
-        """Prepare code file for execution"""
-        extension = self._get_file_extension(language)
-
-        # Create temp file
-        with tempfile.NamedTemporaryFile(
-            mode="w",
-            suffix=f".{extension}",
-            dir=settings.temp_dir,
-            delete=False
-        ) as f:
-            f.write(code)
-            return Path(f.name)
+    def _prepare_files(
+        self,
+        code: str,
+        language: str,
+        stdin: Optional[str],
+        precompiled: bool = False,
+    ) -> Tuple[Dict[str, str], str]:
+        """
+        Build the files to inject into /code and the shell command to run
+
+        Args:
+            precompiled: Run the compiled program (built or restored separately)
+                instead of the source
+
+        Returns:
+            Tuple of ({filename: content}, command)
+        """
+        filename = f"main.{self._get_file_extension(language)}"
+        files = {filename: code}
+        if precompiled:
+            command = COMPILED_PROGRAM
+        else:
+            command = self._get_execution_command(language, filename)
+
+        if stdin:
+            files[STDIN_FILENAME] = stdin
+            command = f"({command}) < {STDIN_FILENAME}"
+
+        return files, command
 
     def _get_file_extension(self, language: str) -> str:
         """Get file extension for language"""
-        extensions = {
-            "python": "py",
-            "javascript": "js",
-            "typescript": "ts",
-            "java": "java",
-            "go": "go",
-            "rust": "rs",
-            "cpp": "cpp",
-            "csharp": "cs",
-            "ruby": "rb",
-            "php": "php",
-            "sql": "sql",
-            "bash": "sh",
-        }
-        return extensions.get(language, "txt")
+        return FILE_EXTENSIONS.get(language, "txt")
+
+    def _get_compile_command(self, language: str) -> str:
+        """Get the compile-only command for a compile-then-run language"""
+        return COMPILE_COMMANDS[language].format(name=f"main.{self._get_file_extension(language)}")
 
     def _get_execution_command(self, language: str, filename: str) -> str:
         """Get execution command for language"""
         basename = os.path.basename(filename)
-
-        commands = {
-            "python": f"python {basename}",
-            "javascript": f"node {basename}",
-            "typescript": f"npx ts-node {basename}",
-            "java": f"javac {basename} && java {basename[:-5]}",
-            "go": f"go run {basename}",
-            "rust": f"rustc {basename} -o /tmp/program && /tmp/program",
-            "cpp": f"g++ {basename} -o /tmp/program && /tmp/program",
-            "csharp": f"dotnet script {basename}",
-            "ruby": f"ruby {basename}",
-            "php": f"php {basename}",
-            "sql": f"psql -f {basename}",
-            "bash": f"bash {basename}",
-        }
-        return commands.get(language, f"cat {basename}")
+        template = EXECUTION_COMMANDS.get(language, "cat {name}")
+        return template.format(name=basename, stem=os.path.splitext(basename)[0])
 
     async def cleanup_container(self, container_id: str):
         """Force cleanup a container"""
         if container_id in self.active_containers:
             container = self.active_containers.pop(container_id)
             try:
-                container.kill()
-                container.remove(force=True)
-            except:
-                pass
+                # Forced removal kills the container if it is still running
+                await asyncio.to_thread(container.remove, force=True)
+            except (DockerException, OSError) as e:
+                logger.debug(f"Container cleanup failed: {e}")
 
     async def cleanup_all(self):
         """Cleanup all active containers"""
-        for container_id in list(self.active_containers.keys()):
-            await self.cleanup_container(container_id)
+        container_ids = list(self.active_containers.keys())
+        await asyncio.gather(
+            *(self.cleanup_container(container_id) for container_id in container_ids),
+            return_exceptions=True,
+        )
+
+        if self.pool is not None:
+            await self.pool.close()
 
     def get_container_stats(self, container_id: str) -> Optional[Dict[str, Any]]:
         """Get container resource usage stats"""
@@ -202,6 +634,7 @@ class DockerManager:
                     "memory_usage": stats["memory_stats"]["usage"],
                     "memory_limit": stats["memory_stats"]["limit"],
                 }
-            except:
+            except (DockerException, OSError, KeyError) as e:
+                logger.debug(f"Failed to get container stats: {e}")
                 return None
         return None
@@ -5,15 +5,46 @@ High-level client for executing code across different providers.
 Provides a simple interface for workflows and plugins.
 """
 
+import asyncio
+import dataclasses
+import hashlib
 import logging
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 
-from .interface import ExecutorProvider, Runtime
+from .interface import BaseExecutor, ExecutorProvider, Runtime
 from .models import ExecutionRequest, ExecutionResult, HealthStatus
 from .registry import ExecutorRegistry
 
 logger = logging.getLogger(__name__)
 
+# Provider health checks run concurrently, at most this many at a time
+HEALTH_CHECK_CONCURRENCY = 8
+HEALTH_CHECK_TIMEOUT_SECONDS = 30.0
+
+# Version -> runtime for the language helpers (unknown versions use the default)
+PYTHON_VERSIONS = {"3.11": Runtime.PYTHON_311, "3.12": Runtime.PYTHON_312}
+NODE_VERSIONS = {"20": Runtime.NODE_20, "22": Runtime.NODE_22}
+GO_VERSIONS = {"1.21": Runtime.GO_121, "1.22": Runtime.GO_122}
+
+
+def _request_key(request: ExecutionRequest) -> str:
+    """Hash everything that affects an execution's outcome"""
+    material = repr(
+        (
+            request.code,
+            request.runtime.value,
+            request.entry_point,
+            request.stdin,
+            sorted(request.environment.items()),
+            sorted(request.files.items()),
+            request.timeout_ms,
+            request.memory_mb,
+            request.cpu_cores,
+            request.preferred_provider,
+        )
+    )
+    return hashlib.blake2b(material.encode("utf-8"), digest_size=16).hexdigest()
+
 
 class UnifiedExecutorClient:
     """
@@ -46,6 +77,8 @@ class UnifiedExecutorClient:
         self,
         default_provider: Optional[ExecutorProvider] = None,
         enable_fallback: bool = True,
+        health_check_timeout: float = HEALTH_CHECK_TIMEOUT_SECONDS,
+        coalesce_identical: bool = False,
     ):
         """
         Initialize executor client.
@@ -53,9 +86,21 @@ class UnifiedExecutorClient:
         Args:
             default_provider: Default provider to use (overrides registry default)
             enable_fallback: Whether to enable automatic fallback on failure
+            health_check_timeout: Per-provider timeout for health_check_all
+            coalesce_identical: Share one execution between identical concurrent
+                requests. Only safe for side-effect free code.
         """
         self.default_provider = default_provider
         self.enable_fallback = enable_fallback
+        self.health_check_timeout = health_check_timeout
+        self.coalesce_identical = coalesce_identical
+
+        # In-flight executions by request key (when coalescing)
+        self._inflight: Dict[str, "asyncio.Future[ExecutionResult]"] = {}
+
+        # Registered providers, refreshed when the registry changes
+        self._providers_snapshot: Optional[Tuple[ExecutorProvider, ...]] = None
+        self._providers_generation = -1
 
     async def execute(
         self,
@@ -109,6 +154,110 @@ class UnifiedExecutorClient:
             user_id=user_id,
         )
 
+        if not self.coalesce_identical:
+            return await self._dispatch(request)
+
+        key = _request_key(request)
+        while (inflight := self._inflight.get(key)) is not None:
+            try:
+                result = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                # Only this caller's own cancellation propagates; if the
+                # caller that started the work was cancelled, run it again
+                if not inflight.cancelled() or asyncio.current_task().cancelling():
+                    raise
+                continue
+            return dataclasses.replace(result, execution_id=request.execution_id)
+
+        future: "asyncio.Future[ExecutionResult]" = asyncio.get_running_loop().create_future()
+        # Mark the outcome retrieved even when nobody else is waiting
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+
+        try:
+            result = await self._dispatch(request)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._inflight.pop(key, None)
+
+    async def execute_many(
+        self,
+        requests: Sequence[ExecutionRequest],
+        *,
+        max_parallel: int = 8,
+    ) -> List[ExecutionResult]:
+        """
+        Execute a batch of requests concurrently.
+
+        Without fallback, executors are resolved once per batch instead of
+        per request. At most max_parallel executions run at a time so the
+        batch does not oversubscribe the provider.
+
+        Args:
+            requests: Execution requests
+            max_parallel: Maximum concurrent executions
+
+        Returns:
+            Results in request order
+        """
+        semaphore = asyncio.Semaphore(max_parallel)
+
+        if self.enable_fallback:
+            run = self._dispatch
+        else:
+            default = self.default_provider or ExecutorRegistry.get_default()
+            executors: Dict[ExecutorProvider, BaseExecutor] = {}
+            for request in requests:
+                provider = request.preferred_provider or default
+                if provider not in executors:
+                    executors[provider] = ExecutorRegistry.get(provider)
+
+            async def run(request: ExecutionRequest) -> ExecutionResult:
+                return await executors[request.preferred_provider or default].execute(request)
+
+        async def run_one(request: ExecutionRequest) -> ExecutionResult:
+            async with semaphore:
+                return await run(request)
+
+        return list(await asyncio.gather(*(run_one(request) for request in requests)))
+
+    async def execute_batch(self, requests: Sequence[ExecutionRequest]) -> List[ExecutionResult]:
+        """
+        Execute a batch of requests on a single provider.
+
+        Unlike execute_many, the provider sees the whole batch and can share
+        setup between requests (Local Docker reuses one container per
+        runtime). The batch is routed by the first request's provider.
+
+        Args:
+            requests: Execution requests
+
+        Returns:
+            Results in request order
+        """
+        if not requests:
+            return []
+
+        if self.enable_fallback:
+            return await ExecutorRegistry.execute_batch_with_fallback(requests)
+
+        provider = (
+            requests[0].preferred_provider
+            or self.default_provider
+            or ExecutorRegistry.get_default()
+        )
+        return await ExecutorRegistry.get(provider).execute_batch(requests)
+
+    async def _dispatch(self, request: ExecutionRequest) -> ExecutionResult:
+        """Run a request on its provider, with fallback if enabled"""
         if self.enable_fallback:
             return await ExecutorRegistry.execute_with_fallback(request)
         else:
@@ -133,7 +282,7 @@ class UnifiedExecutorClient:
         Returns:
             ExecutionResult
         """
-        runtime = Runtime.PYTHON_312 if version == "3.12" else Runtime.PYTHON_311
+        runtime = PYTHON_VERSIONS.get(version, Runtime.PYTHON_311)
         return await self.execute(code, runtime=runtime, entry_point="main.py", **kwargs)
 
     async def execute_node(
@@ -153,7 +302,7 @@ class UnifiedExecutorClient:
         Returns:
             ExecutionResult
         """
-        runtime = Runtime.NODE_22 if version == "22" else Runtime.NODE_20
+        runtime = NODE_VERSIONS.get(version, Runtime.NODE_20)
         return await self.execute(code, runtime=runtime, entry_point="main.js", **kwargs)
 
     async def execute_go(
@@ -173,7 +322,7 @@ class UnifiedExecutorClient:
         Returns:
             ExecutionResult
         """
-        runtime = Runtime.GO_122 if version == "1.22" else Runtime.GO_121
+        runtime = GO_VERSIONS.get(version, Runtime.GO_121)
         return await self.execute(code, runtime=runtime, entry_point="main.go", **kwargs)
 
     async def health_check(
@@ -196,26 +345,49 @@ class UnifiedExecutorClient:
         """
         Check health of all registered providers.
 
+        Checks run concurrently, so the total latency is that of the
+        slowest provider rather than the sum.
+
         Returns:
             Dict mapping provider to its health status
         """
-        results: Dict[ExecutorProvider, HealthStatus] = {}
+        providers = self._get_providers_cached()
+        semaphore = asyncio.BoundedSemaphore(HEALTH_CHECK_CONCURRENCY)
 
-        for provider in ExecutorRegistry.get_available_providers():
+        statuses = await asyncio.gather(
+            *(self._check_one(provider, semaphore) for provider in providers)
+        )
+
+        return dict(zip(providers, statuses))
+
+    async def _check_one(
+        self,
+        provider: ExecutorProvider,
+        semaphore: asyncio.BoundedSemaphore,
+    ) -> HealthStatus:
+        """Health-check a single provider, reporting failures as unhealthy"""
+        async with semaphore:
             try:
                 executor = ExecutorRegistry.get(provider)
-                status = await executor.health_check()
-                results[provider] = status
+                return await asyncio.wait_for(
+                    executor.health_check(),
+                    timeout=self.health_check_timeout,
+                )
+            except asyncio.TimeoutError:
+                logger.error(f"Health check timed out for {provider.value}")
+                return HealthStatus(
+                    healthy=False,
+                    provider=provider,
+                    message="Health check timed out",
+                )
             except Exception as e:
                 logger.error(f"Health check failed for {provider.value}: {e}")
-                results[provider] = HealthStatus(
+                return HealthStatus(
                     healthy=False,
                     provider=provider,
                     message=str(e),
                 )
 
-        return results
-
     async def warm_up(
         self,
         runtime: Runtime,
@@ -236,9 +408,21 @@ class UnifiedExecutorClient:
         executor = ExecutorRegistry.get(provider or self.default_provider)
         return await executor.warm_up(runtime, count)
 
+    def _get_providers_cached(self) -> Tuple[ExecutorProvider, ...]:
+        """Get registered providers, reusing the snapshot while the registry is unchanged"""
+        generation = ExecutorRegistry.get_generation()
+        if self._providers_snapshot is None or generation != self._providers_generation:
+            self._providers_snapshot = tuple(ExecutorRegistry.get_available_providers())
+            self._providers_generation = generation
+        return self._providers_snapshot
+
+    def refresh_providers(self) -> None:
+        """Drop the cached provider snapshot"""
+        self._providers_snapshot = None
+
     def get_available_providers(self) -> list[ExecutorProvider]:
         """Get list of available providers"""
-        return ExecutorRegistry.get_available_providers()
+        return list(self._get_providers_cached())
 
     def is_provider_available(self, provider: ExecutorProvider) -> bool:
         """Check if provider is available"""
@@ -7,7 +7,7 @@ New providers should inherit from BaseExecutor and implement all abstract method
 
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, List, Sequence
 
 if TYPE_CHECKING:
     from .models import ExecutionRequest, ExecutionResult, HealthStatus, ExecutorMetrics
@@ -42,31 +42,46 @@ class Runtime(str, Enum):
     JAVA_17 = "java:17"
     JAVA_21 = "java:21"
 
+    # Precomputed per member below
+    _language: str
+    _version: str
+    _docker_image: str
+
     @property
     def language(self) -> str:
         """Extract language name from runtime"""
-        return self.value.split(":")[0]
+        return self._language
 
     @property
     def version(self) -> str:
         """Extract version from runtime"""
-        return self.value.split(":")[1]
+        return self._version
 
     @property
     def docker_image(self) -> str:
         """Get corresponding Docker image name"""
-        image_map = {
-            "python:3.11": "python:3.11-slim",
-            "python:3.12": "python:3.12-slim",
-            "node:20": "node:20-slim",
-            "node:22": "node:22-slim",
-            "go:1.21": "golang:1.21-alpine",
-            "go:1.22": "golang:1.22-alpine",
-            "rust:latest": "rust:latest",
-            "java:17": "openjdk:17-slim",
-            "java:21": "openjdk:21-slim",
-        }
-        return image_map.get(self.value, self.value)
+        return self._docker_image
+
+
+# Runtime value -> Docker image
+_IMAGE_MAP = {
+    "python:3.11": "python:3.11-slim",
+    "python:3.12": "python:3.12-slim",
+    "node:20": "node:20-slim",
+    "node:22": "node:22-slim",
+    "go:1.21": "golang:1.21-alpine",
+    "go:1.22": "golang:1.22-alpine",
+    "rust:latest": "rust:latest",
+    "java:17": "openjdk:17-slim",
+    "java:21": "openjdk:21-slim",
+}
+
+# Store runtime details on each member once, so the properties are plain
+# attribute reads instead of dict lookups or string splits
+for _runtime in Runtime:
+    _runtime._language, _runtime._version = _runtime.value.split(":")
+    _runtime._docker_image = _IMAGE_MAP.get(_runtime.value, _runtime.value)
+del _runtime
 
 
 class BaseExecutor(ABC):
@@ -109,6 +124,24 @@ class BaseExecutor(ABC):
         """
         pass
 
+    async def execute_batch(
+        self,
+        requests: Sequence["ExecutionRequest"],
+    ) -> List["ExecutionResult"]:
+        """
+        Execute several requests as one batch.
+
+        Runs them one at a time by default; override when the provider
+        can share setup (e.g. a container) between requests.
+
+        Args:
+            requests: Execution requests
+
+        Returns:
+            Results in request order
+        """
+        return [await self.execute(request) for request in requests]
+
     @abstractmethod
     async def warm_up(self, runtime: Runtime, count: int = 1) -> int:
         """
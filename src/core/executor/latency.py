@@ -0,0 +1,78 @@
+"""
+Latency Histogram
+
+Streaming percentile estimation for executor metrics.
+"""
+
+import math
+from typing import List, Tuple
+
+# Log-spaced buckets: 4 per power of two, covering 1ms up to ~10 minutes
+BUCKETS_PER_OCTAVE = 4
+MAX_LATENCY_MS = 10 * 60 * 1000
+BUCKET_COUNT = int(math.log2(MAX_LATENCY_MS) * BUCKETS_PER_OCTAVE) + 1
+
+
+def _bucket_value(bucket: int) -> float:
+    """Representative latency (geometric midpoint) of a bucket"""
+    return 2 ** ((bucket + 0.5) / BUCKETS_PER_OCTAVE)
+
+
+class LatencyHistogram:
+    """
+    Fixed-size log-bucketed latency histogram.
+
+    Recording a sample is O(1) and reading percentiles walks a fixed
+    number of buckets, so neither depends on how many samples were seen.
+    Estimates are within ~10% of the true value.
+
+    Example:
+        histogram = LatencyHistogram()
+        histogram.record(12.5)
+        p50, p99 = histogram.percentiles(0.5, 0.99)
+    """
+
+    __slots__ = ("_counts", "_total")
+
+    def __init__(self):
+        self._counts: List[int] = [0] * BUCKET_COUNT
+        self._total = 0
+
+    def __len__(self) -> int:
+        return self._total
+
+    def record(self, value_ms: float) -> None:
+        """Record one latency sample in milliseconds"""
+        if value_ms > 1.0:
+            bucket = min(int(math.log2(value_ms) * BUCKETS_PER_OCTAVE), BUCKET_COUNT - 1)
+        else:
+            bucket = 0
+        self._counts[bucket] += 1
+        self._total += 1
+
+    def percentiles(self, *fractions: float) -> Tuple[float, ...]:
+        """
+        Estimate several percentiles in a single pass.
+
+        Args:
+            fractions: Ascending percentiles as fractions (e.g. 0.5, 0.95)
+
+        Returns:
+            Estimated latencies in milliseconds (0.0 when empty)
+        """
+        if not self._total:
+            return (0.0,) * len(fractions)
+
+        results = []
+        targets = iter(fractions)
+        target = next(targets, None)
+        cumulative = 0
+        for bucket, count in enumerate(self._counts):
+            cumulative += count
+            while target is not None and cumulative >= target * self._total:
+                results.append(_bucket_value(bucket))
+                target = next(targets, None)
+            if target is None:
+                break
+
+        return tuple(results)
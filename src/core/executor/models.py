@@ -9,6 +9,8 @@ from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 from uuid import uuid4
 
+import orjson
+
 from .interface import ExecutorProvider, Runtime
 
 
@@ -17,7 +19,12 @@ def _utcnow() -> datetime:
     return datetime.now(timezone.utc)
 
 
-@dataclass
+def _safe_div(numerator: float, denominator: float) -> float:
+    """Divide, returning 0.0 for a zero denominator"""
+    return numerator / denominator if denominator else 0.0
+
+
+@dataclass(slots=True, frozen=True)
 class ExecutionRequest:
     """Code execution request"""
 
@@ -49,6 +56,10 @@ class ExecutionRequest:
 
     def __post_init__(self):
         """Validate request parameters"""
+        # Valid requests (the common case) pass a single combined check
+        if self.code and self.timeout_ms > 0 and self.memory_mb > 0 and self.cpu_cores > 0:
+            return
+
         if not self.code:
             raise ValueError("code cannot be empty")
         if self.timeout_ms <= 0:
@@ -59,7 +70,7 @@ class ExecutionRequest:
             raise ValueError("cpu_cores must be positive")
 
 
-@dataclass
+@dataclass(slots=True)
 class ExecutionResult:
     """Code execution result"""
 
@@ -117,8 +128,17 @@ class ExecutionResult:
             "execution_id": self.execution_id,
         }
 
+    def to_json(self) -> bytes:
+        """
+        Serialize to JSON without building an intermediate dict
 
-@dataclass
+        orjson encodes dataclasses, enums and datetimes natively, producing
+        the same document as to_dict().
+        """
+        return orjson.dumps(self)
+
+
+@dataclass(slots=True)
 class HealthStatus:
     """Provider health status"""
 
@@ -150,8 +170,12 @@ class HealthStatus:
             "checks": self.checks,
         }
 
+    def to_json(self) -> bytes:
+        """Serialize to JSON without building an intermediate dict"""
+        return orjson.dumps(self)
 
-@dataclass
+
+@dataclass(slots=True)
 class PoolStatus:
     """Warm pool status"""
 
@@ -171,7 +195,7 @@ class PoolStatus:
         return self.busy / self.total
 
 
-@dataclass
+@dataclass(slots=True)
 class ExecutorMetrics:
     """Provider execution metrics"""
 
@@ -207,28 +231,26 @@ class ExecutorMetrics:
     first_execution_at: Optional[datetime] = None
     last_execution_at: Optional[datetime] = None
 
-    @property
-    def success_rate(self) -> float:
-        """Execution success rate (0.0 - 1.0)"""
-        if self.total_executions == 0:
-            return 0.0
-        return self.successful_executions / self.total_executions
-
-    @property
-    def cold_start_ratio(self) -> float:
-        """Cold start ratio (0.0 - 1.0)"""
-        total = self.cold_start_count + self.warm_start_count
-        if total == 0:
-            return 0.0
-        return self.cold_start_count / total
+    # Derived ratios (0.0 - 1.0), kept current by update_ratios()
+    success_rate: float = field(default=0.0, init=False)
+    cold_start_ratio: float = field(default=0.0, init=False)
+    pool_hit_ratio: float = field(default=0.0, init=False)
 
-    @property
-    def pool_hit_ratio(self) -> float:
-        """Pool hit ratio (0.0 - 1.0)"""
-        total = self.pool_hits + self.pool_misses
-        if total == 0:
-            return 0.0
-        return self.pool_hits / total
+    def __post_init__(self):
+        self.update_ratios()
+
+    def update_ratios(self) -> None:
+        """
+        Recompute derived ratios from the counters.
+
+        Providers call this when they update counters, so reads (and
+        to_dict()) don't redo the divisions.
+        """
+        self.success_rate = _safe_div(self.successful_executions, self.total_executions)
+        self.cold_start_ratio = _safe_div(
+            self.cold_start_count, self.cold_start_count + self.warm_start_count
+        )
+        self.pool_hit_ratio = _safe_div(self.pool_hits, self.pool_hits + self.pool_misses)
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization"""
@@ -2,12 +2,27 @@
 Executor Providers
 
 Concrete implementations of BaseExecutor for different backends.
+
+Providers are imported on first access (PEP 562), so only the cloud SDKs
+of providers actually in use get loaded.
 """
 
-from .local_docker import LocalDockerExecutor
-from .aws_lambda import AWSLambdaExecutor
-from .gcp_cloud_run import GCPCloudRunExecutor
-from .azure_container import AzureContainerExecutor
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .local_docker import LocalDockerExecutor
+    from .aws_lambda import AWSLambdaExecutor
+    from .gcp_cloud_run import GCPCloudRunExecutor
+    from .azure_container import AzureContainerExecutor
+
+# Provider class -> defining submodule
+_PROVIDER_MODULES = {
+    "LocalDockerExecutor": "local_docker",
+    "AWSLambdaExecutor": "aws_lambda",
+    "GCPCloudRunExecutor": "gcp_cloud_run",
+    "AzureContainerExecutor": "azure_container",
+}
 
 __all__ = [
     "LocalDockerExecutor",
@@ -15,3 +30,13 @@ __all__ = [
     "GCPCloudRunExecutor",
     "AzureContainerExecutor",
 ]
+
+
+def __getattr__(name: str):
+    module_name = _PROVIDER_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    provider_class = getattr(import_module(f".{module_name}", __name__), name)
+    globals()[name] = provider_class  # skip __getattr__ next time
+    return provider_class
@@ -7,11 +7,22 @@ Leverages Lambda's built-in warm pool for fast execution.
 
 import asyncio
 import base64
-import json
+import functools
+import threading
 import logging
+import math
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+
+import orjson
 
 from ..interface import BaseExecutor, ExecutorProvider, Runtime
+from ..latency import LatencyHistogram
 from ..models import ExecutionRequest, ExecutionResult, HealthStatus, ExecutorMetrics
 from ..exceptions import ExecutorNotAvailableError
 
@@ -30,6 +41,70 @@ except ImportError:
     Config = None
     ClientError = Exception
 
+# Number of recent execution times kept for latency stats
+EXECUTION_TIME_WINDOW = 1000
+
+WARMUP_PAYLOAD = orjson.dumps({"warmup": True})
+
+# Lambda reclaims idle execution environments after several minutes;
+# assume none survive past this when inferring cold starts locally
+ENVIRONMENT_IDLE_TIMEOUT_SECONDS = 300.0
+
+# Predictive pre-warm: demand is measured over a sliding window and the
+# pool is re-sized on a fixed interval
+DEMAND_WINDOW_SECONDS = 60.0
+AUTOSCALE_INTERVAL_SECONDS = 30.0
+
+# Request files larger than this in total go through S3 (when a staging
+# bucket is configured) - sync invoke payloads are capped at 6MB
+S3_STAGING_THRESHOLD_BYTES = 512 * 1024
+S3_STAGING_PREFIX = "staging"
+
+
+_session_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def _get_session() -> "boto3.Session":
+    """Shared boto3 session (credential resolution and loaders are reused)"""
+    return boto3.Session()
+
+
+@functools.lru_cache(maxsize=None)
+def _get_client(
+    service_name: str,
+    region: str,
+    max_retries: int,
+    connect_timeout: int,
+    read_timeout: int,
+    max_pool_connections: int,
+):
+    """
+    Get an AWS client shared by executors with the same settings.
+
+    Clients are thread-safe, so executors that differ only in function
+    prefix share one HTTP connection pool instead of opening their own.
+    """
+    config = Config(
+        region_name=region,
+        retries={"max_attempts": max_retries, "mode": "adaptive"},
+        connect_timeout=connect_timeout,
+        read_timeout=read_timeout,
+        max_pool_connections=max_pool_connections,
+    )
+    # Creating clients from one session isn't thread-safe
+    with _session_lock:
+        return _get_session().client(service_name, config=config)
+
+
+@dataclass(slots=True)
+class _FunctionWarmth:
+    """Locally observed execution environment state for one function"""
+
+    environments: int = 0
+    in_flight: int = 0
+    last_used: float = 0.0
+
 
 class AWSLambdaExecutor(BaseExecutor):
     """
@@ -50,7 +125,8 @@ class AWSLambdaExecutor(BaseExecutor):
 
     provider = ExecutorProvider.AWS_LAMBDA
 
-    # Runtime to Lambda function suffix mapping
+    # Runtime to Lambda function suffix mapping (runtimes not listed here
+    # get a suffix derived from their value, filled in below)
     RUNTIME_SUFFIX_MAP = {
         Runtime.PYTHON_311: "python-3-11",
         Runtime.PYTHON_312: "python-3-12",
@@ -67,6 +143,10 @@ class AWSLambdaExecutor(BaseExecutor):
         max_retries: int = 3,
         connect_timeout: int = 10,
         read_timeout: int = 60,
+        max_concurrency: int = 64,
+        capture_logs: bool = False,
+        predictive_warmup: bool = False,
+        s3_staging_bucket: Optional[str] = None,
     ):
         """
         Initialize AWS Lambda executor.
@@ -77,6 +157,16 @@ class AWSLambdaExecutor(BaseExecutor):
             max_retries: Max retry attempts for failed invocations
             connect_timeout: Connection timeout in seconds
             read_timeout: Read timeout in seconds
+            max_concurrency: Max in-flight Lambda API calls. Also sizes the
+                HTTP connection pool; a smaller pool makes urllib3 discard
+                connections ("Connection pool is full") under load
+            capture_logs: Request the invocation log tail and detect cold
+                starts from it; otherwise cold starts are inferred locally
+            predictive_warmup: Periodically pre-warm functions to match
+                recent demand
+            s3_staging_bucket: Bucket for staging large request files; the
+                function then receives S3 keys in "files_s3" instead of
+                contents in "files"
         """
         if not BOTO3_AVAILABLE:
             raise ImportError(
@@ -86,19 +176,45 @@ class AWSLambdaExecutor(BaseExecutor):
 
         self.region = region
         self.function_prefix = function_prefix
+        self.capture_logs = capture_logs
+        self._log_kwargs = {"LogType": "Tail"} if capture_logs else {}
+        self._warmth: dict[str, _FunctionWarmth] = {}
+
+        # Recent invocation times per runtime, for predictive pre-warm
+        self.max_concurrency = max_concurrency
+        self.predictive_warmup = predictive_warmup
+        self._demand: dict[Runtime, deque[float]] = {}
+        self._autoscale_task: Optional[asyncio.Task] = None
+
+        # Function names are fixed once the prefix is known
+        self._function_names: dict[Runtime, str] = {
+            runtime: f"{function_prefix}-{suffix}"
+            for runtime, suffix in self.RUNTIME_SUFFIX_MAP.items()
+        }
 
         # Configure boto3 client
-        config = Config(
-            region_name=region,
-            retries={"max_attempts": max_retries, "mode": "adaptive"},
-            connect_timeout=connect_timeout,
-            read_timeout=read_timeout,
+        client_settings = (region, max_retries, connect_timeout, read_timeout, max_concurrency)
+        self.lambda_client = _get_client("lambda", *client_settings)
+
+        # Large files are staged in S3 instead of inlined in the payload
+        self.s3_staging_bucket = s3_staging_bucket
+        self.s3_client = _get_client("s3", *client_settings) if s3_staging_bucket else None
+
+        # Dedicated threads for blocking boto3 calls, sized to the HTTP
+        # connection pool, so fan-out isn't capped by the default executor
+        self._call_pool = ThreadPoolExecutor(
+            max_workers=max_concurrency,
+            thread_name_prefix="lambda-call",
         )
-        self.lambda_client = boto3.client("lambda", config=config)
 
         # Metrics
         self._metrics = ExecutorMetrics(provider=self.provider)
-        self._execution_times: list[float] = []
+        # Ring buffer of recent execution times, packed as C doubles
+        self._execution_times = array("d", bytes(8 * EXECUTION_TIME_WINDOW))
+        self._execution_times_index = 0
+        self._execution_times_count = 0
+        self._execution_times_sum = 0.0
+        self._latency = LatencyHistogram()
 
     async def initialize(self) -> None:
         """Initialize executor - verify Lambda functions exist"""
@@ -107,7 +223,7 @@ class AWSLambdaExecutor(BaseExecutor):
         # Verify at least one function exists
         try:
             function_name = self._get_function_name(Runtime.PYTHON_311)
-            await asyncio.to_thread(
+            await self._call(
                 self.lambda_client.get_function,
                 FunctionName=function_name,
             )
@@ -115,11 +231,15 @@ class AWSLambdaExecutor(BaseExecutor):
         except ClientError as e:
             logger.warning(f"Lambda function not found: {e}")
 
+        if self.predictive_warmup and self._autoscale_task is None:
+            self._autoscale_task = asyncio.create_task(self._autoscale_loop())
+
         logger.info("AWSLambdaExecutor initialized")
 
     async def execute(self, request: ExecutionRequest) -> ExecutionResult:
         """Execute code using Lambda function"""
         start_time = datetime.now(timezone.utc)
+        start_ns = time.monotonic_ns()  # durations aren't affected by clock changes
         function_name = self._get_function_name(request.runtime)
 
         # Build Lambda payload
@@ -133,18 +253,26 @@ class AWSLambdaExecutor(BaseExecutor):
             "memory_mb": request.memory_mb,
         }
 
+        if self.predictive_warmup:
+            self._record_demand(request.runtime)
+        inferred_cold_start = self._begin_invocation(function_name)
         try:
+            if self.s3_client is not None and request.files:
+                if sum(map(len, request.files.values())) > S3_STAGING_THRESHOLD_BYTES:
+                    del payload["files"]
+                    payload["files_s3"] = await self._stage_files(request)
+
             # Invoke Lambda
-            response = await asyncio.to_thread(
+            response = await self._call(
                 self.lambda_client.invoke,
                 FunctionName=function_name,
                 InvocationType="RequestResponse",
-                LogType="Tail",  # Get execution logs
-                Payload=json.dumps(payload),
+                Payload=orjson.dumps(payload),
+                **self._log_kwargs,
             )
 
             # Parse response
-            response_payload = json.loads(response["Payload"].read())
+            response_payload = orjson.loads(response["Payload"].read())
 
             # Check for Lambda error
             if "FunctionError" in response:
@@ -154,39 +282,44 @@ class AWSLambdaExecutor(BaseExecutor):
                     stdout="",
                     stderr=error_message,
                     exit_code=-1,
-                    execution_time_ms=self._calculate_duration(start_time),
-                    cold_start=self._is_cold_start(response),
+                    execution_time_ms=self._calculate_duration(start_ns),
+                    cold_start=self._is_cold_start(response, inferred_cold_start),
                     provider=self.provider,
                     execution_id=request.execution_id,
+                    started_at=start_time,
+                    completed_at=datetime.now(timezone.utc),
                 )
 
-            # Extract execution result
-            success = response_payload.get("exit_code", 1) == 0
-            execution_time_ms = response_payload.get(
-                "duration_ms",
-                self._calculate_duration(start_time),
-            )
-
-            # Update metrics
-            self._update_metrics(execution_time_ms, success)
+            # Extract execution result (a missing exit code counts as failure)
+            exit_code = response_payload.get("exit_code", 1)
+            stdout = response_payload.get("stdout", "")
+            stderr = response_payload.get("stderr", "")
+            execution_time_ms = response_payload.get("duration_ms")
+            if execution_time_ms is None:
+                execution_time_ms = self._calculate_duration(start_ns)
+            success = exit_code == 0
 
-            cold_start = self._is_cold_start(response)
+            cold_start = self._is_cold_start(response, inferred_cold_start)
             if cold_start:
                 self._metrics.cold_start_count += 1
             else:
                 self._metrics.warm_start_count += 1
 
+            # Update metrics
+            completed_at = datetime.now(timezone.utc)
+            self._update_metrics(execution_time_ms, success, completed_at)
+
             return ExecutionResult(
                 success=success,
-                stdout=response_payload.get("stdout", ""),
-                stderr=response_payload.get("stderr", ""),
-                exit_code=response_payload.get("exit_code", 0),
+                stdout=stdout,
+                stderr=stderr,
+                exit_code=exit_code,
                 execution_time_ms=execution_time_ms,
                 cold_start=cold_start,
                 provider=self.provider,
                 execution_id=request.execution_id,
                 started_at=start_time,
-                completed_at=datetime.now(timezone.utc),
+                completed_at=completed_at,
             )
 
         except ClientError as e:
@@ -207,10 +340,12 @@ class AWSLambdaExecutor(BaseExecutor):
                 stdout="",
                 stderr=f"Lambda error: {error_message}",
                 exit_code=-1,
-                execution_time_ms=self._calculate_duration(start_time),
+                execution_time_ms=self._calculate_duration(start_ns),
                 cold_start=False,
                 provider=self.provider,
                 execution_id=request.execution_id,
+                started_at=start_time,
+                completed_at=datetime.now(timezone.utc),
             )
 
         except Exception as e:
@@ -222,25 +357,144 @@ class AWSLambdaExecutor(BaseExecutor):
                 stdout="",
                 stderr=str(e),
                 exit_code=-1,
-                execution_time_ms=self._calculate_duration(start_time),
+                execution_time_ms=self._calculate_duration(start_ns),
                 cold_start=False,
                 provider=self.provider,
                 execution_id=request.execution_id,
+                started_at=start_time,
+                completed_at=datetime.now(timezone.utc),
+            )
+
+        finally:
+            self._end_invocation(function_name)
+
+    async def _stage_files(self, request: ExecutionRequest) -> Dict[str, Any]:
+        """
+        Upload request files to the staging bucket concurrently.
+
+        Staged objects are expected to be expired by a bucket lifecycle rule.
+
+        Returns:
+            S3 location of each file, for the Lambda payload
+        """
+        prefix = f"{S3_STAGING_PREFIX}/{request.execution_id}"
+        keys = {name: f"{prefix}/{name}" for name in request.files}
+
+        await asyncio.gather(*(
+            self._call(
+                self.s3_client.put_object,
+                Bucket=self.s3_staging_bucket,
+                Key=keys[name],
+                Body=content.encode("utf-8"),
             )
+            for name, content in request.files.items()
+        ))
+
+        return {"bucket": self.s3_staging_bucket, "keys": keys}
+
+    async def _call(self, method: Callable[..., Any], **kwargs: Any) -> Any:
+        """Run a blocking Lambda client method on the call pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._call_pool, functools.partial(method, **kwargs))
 
     def _get_function_name(self, runtime: Runtime) -> str:
         """Get Lambda function name for runtime"""
-        suffix = self.RUNTIME_SUFFIX_MAP.get(runtime)
+        return self._function_names[runtime]
+
+    def _record_demand(self, runtime: Runtime) -> None:
+        """Record an invocation for demand-based pre-warming"""
+        now = time.monotonic()
+        demand = self._demand.get(runtime)
+        if demand is None:
+            demand = self._demand[runtime] = deque()
+
+        # Only the demand window is ever read, so keep nothing older
+        cutoff = now - DEMAND_WINDOW_SECONDS
+        while demand and demand[0] < cutoff:
+            demand.popleft()
+        demand.append(now)
+
+    def _warm_environments(self, function_name: str, now: float) -> int:
+        """Number of execution environments believed warm for a function"""
+        warmth = self._warmth.get(function_name)
+        if warmth is None:
+            return 0
+        if not warmth.in_flight and now - warmth.last_used > ENVIRONMENT_IDLE_TIMEOUT_SECONDS:
+            return 0
+        return warmth.environments
+
+    async def autoscale_warm_pool(self) -> Dict[Runtime, int]:
+        """
+        Pre-warm functions to match recent demand.
+
+        The required warm pool is estimated with Little's law: request
+        rate over the demand window times the average execution time.
+        Runtimes with no recent demand are forgotten.
+
+        Returns:
+            Number of instances warmed per runtime
+        """
+        now = time.monotonic()
+        cutoff = now - DEMAND_WINDOW_SECONDS
+        avg_seconds = self._metrics.avg_execution_time_ms / 1000
+        warmed: Dict[Runtime, int] = {}
+
+        for runtime, demand in list(self._demand.items()):
+            while demand and demand[0] < cutoff:
+                demand.popleft()
+            if not demand:
+                del self._demand[runtime]
+                continue
+
+            rate = len(demand) / DEMAND_WINDOW_SECONDS
+            target = min(math.ceil(rate * avg_seconds), self.max_concurrency)
+            function_name = self._get_function_name(runtime)
+            if target > self._warm_environments(function_name, now):
+                # N concurrent invokes leave N environments warm, so warm
+                # the full target rather than the difference
+                warmed[runtime] = await self.warm_up(runtime, target)
 
-        if suffix:
-            return f"{self.function_prefix}-{suffix}"
+        return warmed
 
-        # Fallback: convert runtime value
-        runtime_str = runtime.value.replace(":", "-").replace(".", "-")
-        return f"{self.function_prefix}-{runtime_str}"
+    async def _autoscale_loop(self) -> None:
+        """Run autoscale_warm_pool on a fixed interval"""
+        while True:
+            await asyncio.sleep(AUTOSCALE_INTERVAL_SECONDS)
+            try:
+                await self.autoscale_warm_pool()
+            except Exception as e:
+                logger.warning(f"Lambda pre-warm failed: {e}")
 
-    def _is_cold_start(self, response: dict) -> bool:
+    def _begin_invocation(self, function_name: str) -> bool:
+        """
+        Track an invocation starting and infer whether it needs a new
+        execution environment (i.e. is a cold start)
+        """
+        now = time.monotonic()
+        warmth = self._warmth.get(function_name)
+        if warmth is None:
+            warmth = self._warmth[function_name] = _FunctionWarmth()
+        else:
+            warmth.environments = self._warm_environments(function_name, now)
+
+        warmth.in_flight += 1
+        warmth.last_used = now
+        if warmth.in_flight > warmth.environments:
+            warmth.environments = warmth.in_flight
+            return True
+        return False
+
+    def _end_invocation(self, function_name: str) -> None:
+        """Track an invocation finishing"""
+        warmth = self._warmth[function_name]
+        warmth.in_flight -= 1
+        warmth.last_used = time.monotonic()
+
+    def _is_cold_start(self, response: dict, inferred: bool) -> bool:
         """Check if Lambda execution was a cold start"""
+        if not self.capture_logs:
+            return inferred
+
         # Parse CloudWatch logs to detect Init Duration
         log_result = response.get("LogResult", "")
         if log_result:
@@ -251,13 +505,17 @@ class AWSLambdaExecutor(BaseExecutor):
                 pass
         return False
 
-    def _calculate_duration(self, start_time: datetime) -> float:
-        """Calculate duration in milliseconds"""
-        delta = datetime.now(timezone.utc) - start_time
-        return delta.total_seconds() * 1000
+    def _calculate_duration(self, start_ns: int) -> float:
+        """Calculate duration in milliseconds since a monotonic_ns() start"""
+        return (time.monotonic_ns() - start_ns) / 1e6
 
-    def _update_metrics(self, execution_time_ms: float, success: bool) -> None:
-        """Update execution metrics"""
+    def _update_metrics(
+        self,
+        execution_time_ms: float,
+        success: bool,
+        now: Optional[datetime] = None,
+    ) -> None:
+        """Update execution metrics (now: completion time, if already known)"""
         self._metrics.total_executions += 1
 
         if success:
@@ -265,20 +523,47 @@ class AWSLambdaExecutor(BaseExecutor):
         else:
             self._metrics.failed_executions += 1
 
-        self._execution_times.append(execution_time_ms)
-        if len(self._execution_times) > 1000:
-            self._execution_times = self._execution_times[-1000:]
-
-        if self._execution_times:
-            self._metrics.avg_execution_time_ms = (
-                sum(self._execution_times) / len(self._execution_times)
-            )
-
-        now = datetime.now(timezone.utc)
+        # Keep a running sum over the window so the average is O(1)
+        times = self._execution_times
+        index = self._execution_times_index
+        if self._execution_times_count == EXECUTION_TIME_WINDOW:
+            evicted = times[index]
+            self._execution_times_sum -= evicted
+        else:
+            evicted = None
+            self._execution_times_count += 1
+        times[index] = execution_time_ms
+        self._execution_times_index = (index + 1) % EXECUTION_TIME_WINDOW
+        self._execution_times_sum += execution_time_ms
+
+        self._latency.record(execution_time_ms)
+
+        count = self._execution_times_count
+        metrics = self._metrics
+        metrics.avg_execution_time_ms = self._execution_times_sum / count
+
+        # Min/max only need a rescan when the evicted sample was the extreme
+        # (evictions only happen once the buffer is full)
+        if count == 1:
+            metrics.min_execution_time_ms = metrics.max_execution_time_ms = execution_time_ms
+        else:
+            if evicted == metrics.min_execution_time_ms:
+                metrics.min_execution_time_ms = min(times)
+            elif execution_time_ms < metrics.min_execution_time_ms:
+                metrics.min_execution_time_ms = execution_time_ms
+            if evicted == metrics.max_execution_time_ms:
+                metrics.max_execution_time_ms = max(times)
+            elif execution_time_ms > metrics.max_execution_time_ms:
+                metrics.max_execution_time_ms = execution_time_ms
+
+        if now is None:
+            now = datetime.now(timezone.utc)
         if self._metrics.first_execution_at is None:
             self._metrics.first_execution_at = now
         self._metrics.last_execution_at = now
 
+        self._metrics.update_ratios()
+
     async def warm_up(self, runtime: Runtime, count: int = 1) -> int:
         """
         Warm up Lambda function.
@@ -288,29 +573,42 @@ class AWSLambdaExecutor(BaseExecutor):
         is not configured.
         """
         function_name = self._get_function_name(runtime)
-        warmed = 0
 
-        for _ in range(count):
-            try:
-                # Invoke with minimal payload to warm up
-                await asyncio.to_thread(
-                    self.lambda_client.invoke,
-                    FunctionName=function_name,
-                    InvocationType="RequestResponse",
-                    Payload=json.dumps({"warmup": True}),
-                )
+        # Invocations must overlap - sequential calls would keep reusing
+        # the same execution environment instead of starting new ones
+        results = await asyncio.gather(
+            *(self._invoke_warmup(function_name) for _ in range(count)),
+            return_exceptions=True,
+        )
+
+        warmed = 0
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning(f"Warmup invocation failed: {result}")
+            else:
                 warmed += 1
-            except Exception as e:
-                logger.warning(f"Warmup invocation failed: {e}")
 
         return warmed
 
+    async def _invoke_warmup(self, function_name: str) -> None:
+        """Invoke function with minimal payload to warm up an instance"""
+        self._begin_invocation(function_name)
+        try:
+            await self._call(
+                self.lambda_client.invoke,
+                FunctionName=function_name,
+                InvocationType="RequestResponse",
+                Payload=WARMUP_PAYLOAD,
+            )
+        finally:
+            self._end_invocation(function_name)
+
     async def health_check(self) -> HealthStatus:
         """Check Lambda executor health"""
         try:
             function_name = self._get_function_name(Runtime.PYTHON_311)
 
-            response = await asyncio.to_thread(
+            response = await self._call(
                 self.lambda_client.get_function,
                 FunctionName=function_name,
             )
@@ -345,9 +643,26 @@ class AWSLambdaExecutor(BaseExecutor):
             )
 
     async def cleanup(self) -> None:
-        """Cleanup - nothing to do for Lambda"""
+        """Cleanup - stop pre-warming and release the call pool threads"""
+        if self._autoscale_task is not None:
+            self._autoscale_task.cancel()
+            self._autoscale_task = None
+        self._call_pool.shutdown(wait=False, cancel_futures=True)
         logger.info("AWSLambdaExecutor cleanup complete")
 
     async def get_metrics(self) -> ExecutorMetrics:
         """Get execution metrics"""
-        return self._metrics
+        metrics = self._metrics
+        (
+            metrics.p50_execution_time_ms,
+            metrics.p95_execution_time_ms,
+            metrics.p99_execution_time_ms,
+        ) = self._latency.percentiles(0.5, 0.95, 0.99)
+        return metrics
+
+
+for _runtime in Runtime:
+    AWSLambdaExecutor.RUNTIME_SUFFIX_MAP.setdefault(
+        _runtime, _runtime.value.replace(":", "-").replace(".", "-")
+    )
+del _runtime
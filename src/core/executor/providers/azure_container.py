@@ -5,9 +5,14 @@ Execute code using Azure Container Apps Jobs.
 """
 
 import asyncio
-import json
 import logging
+import time
+from collections import deque
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+import orjson
 
 from ..interface import BaseExecutor, ExecutorProvider, Runtime
 from ..models import ExecutionRequest, ExecutionResult, HealthStatus, ExecutorMetrics
@@ -17,9 +22,10 @@ logger = logging.getLogger(__name__)
 
 # Optional Azure SDK imports
 try:
-    from azure.identity import DefaultAzureCredential
-    from azure.mgmt.appcontainers import ContainerAppsAPIClient
+    from azure.identity.aio import DefaultAzureCredential
+    from azure.mgmt.appcontainers.aio import ContainerAppsAPIClient
     from azure.core.exceptions import ResourceNotFoundError, AzureError
+    from azure.core.pipeline.policies import AsyncRetryPolicy
 
     AZURE_AVAILABLE = True
 except ImportError:
@@ -28,6 +34,93 @@ except ImportError:
     ContainerAppsAPIClient = None
     ResourceNotFoundError = Exception
     AzureError = Exception
+    AsyncRetryPolicy = object
+
+# FILES value for requests without files (the common case)
+_EMPTY_FILES = "{}"
+
+# Non-idempotent requests (job starts) are only retried on these HTTP
+# statuses, where the request wasn't processed; a timeout or other 5xx can
+# arrive after the execution was created
+SUBMIT_RETRY_STATUS_CODES = frozenset({429, 503})
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 0.5
+RETRY_BACKOFF_MAX_SECONDS = 5.0
+
+# How long a health check result is reused before the job is looked up again
+HEALTH_CACHE_TTL_SECONDS = 10.0
+
+# Number of recent execution times kept for latency stats
+EXECUTION_TIME_WINDOW = 1000
+
+# Execution status polling: start fast for short jobs, back off to a cap
+POLL_INITIAL_DELAY_SECONDS = 0.5
+POLL_MAX_DELAY_SECONDS = 5.0
+
+# Job execution states after which the status no longer changes
+TERMINAL_EXECUTION_STATES = frozenset({"Succeeded", "Failed", "Stopped", "Degraded"})
+
+
+class _SubmitSafeRetryPolicy(AsyncRetryPolicy):
+    """
+    azure-core retry policy that doesn't replay POST/PATCH on ambiguous failures
+
+    The default policy retries POST on 500/503/504 and on any response with
+    Retry-After. Other methods keep the default behaviour; backoff still
+    honours Retry-After.
+    """
+
+    def is_retry(self, settings, response) -> bool:
+        if response.http_request.method.upper() in ("POST", "PATCH"):
+            return bool(settings["total"]) and (
+                response.http_response.status_code in SUBMIT_RETRY_STATUS_CODES
+            )
+        return super().is_retry(settings, response)
+
+
+@dataclass(slots=True)
+class _SharedClient:
+    """Client and credential shared by executors in one subscription"""
+
+    client: Any
+    credential: Any
+    users: int = 0
+
+
+# Executors in the same subscription share one client (and its HTTP
+# connection pool) and one credential (and its token cache)
+_shared_clients: Dict[str, _SharedClient] = {}
+
+
+def _acquire_client(subscription_id: str) -> Any:
+    """Get the shared client for a subscription, creating it on first use"""
+    shared = _shared_clients.get(subscription_id)
+    if shared is None:
+        credential = DefaultAzureCredential()
+        shared = _shared_clients[subscription_id] = _SharedClient(
+            client=ContainerAppsAPIClient(
+                credential,
+                subscription_id,
+                retry_policy=_SubmitSafeRetryPolicy(
+                    retry_total=RETRY_TOTAL,
+                    retry_backoff_factor=RETRY_BACKOFF_FACTOR,
+                    retry_backoff_max=RETRY_BACKOFF_MAX_SECONDS,
+                ),
+            ),
+            credential=credential,
+        )
+    shared.users += 1
+    return shared.client
+
+
+async def _release_client(subscription_id: str) -> None:
+    """Release a shared client, closing it once no executor uses it"""
+    shared = _shared_clients[subscription_id]
+    shared.users -= 1
+    if shared.users == 0:
+        del _shared_clients[subscription_id]
+        await shared.client.close()
+        await shared.credential.close()
 
 
 class AzureContainerExecutor(BaseExecutor):
@@ -71,20 +164,28 @@ class AzureContainerExecutor(BaseExecutor):
         if not AZURE_AVAILABLE:
             raise ImportError(
                 "azure-mgmt-appcontainers is required for Azure executor. "
-                "Install with: pip install azure-mgmt-appcontainers azure-identity"
+                "Install with: pip install azure-mgmt-appcontainers azure-identity aiohttp"
             )
 
         self.subscription_id = subscription_id
         self.resource_group = resource_group
         self.job_prefix = job_prefix
 
-        # Initialize Azure client
-        credential = DefaultAzureCredential()
-        self.client = ContainerAppsAPIClient(credential, subscription_id)
+        # Job names are fixed once the prefix is known
+        self._job_names: dict[Runtime, str] = {
+            runtime: f"{job_prefix}-{self._job_suffix(runtime)}" for runtime in Runtime
+        }
+
+        # Initialize Azure client (asyncio transport, no thread per call)
+        self.client = _acquire_client(subscription_id)
 
         # Metrics
         self._metrics = ExecutorMetrics(provider=self.provider)
-        self._execution_times: list[float] = []
+        self._execution_times: deque[float] = deque(maxlen=EXECUTION_TIME_WINDOW)
+        self._execution_times_sum = 0.0
+
+        # Last health check as (monotonic time, status)
+        self._health_cache: Optional[Tuple[float, HealthStatus]] = None
 
     async def initialize(self) -> None:
         """Initialize executor"""
@@ -94,6 +195,7 @@ class AzureContainerExecutor(BaseExecutor):
     async def execute(self, request: ExecutionRequest) -> ExecutionResult:
         """Execute code using Container Apps Job"""
         start_time = datetime.now(timezone.utc)
+        start_ns = time.monotonic_ns()  # durations aren't affected by clock changes
         job_name = self._get_job_name(request.runtime)
 
         try:
@@ -105,8 +207,9 @@ class AzureContainerExecutor(BaseExecutor):
                 job_name, execution, request.timeout_ms
             )
 
-            execution_time_ms = self._calculate_duration(start_time)
-            self._update_metrics(execution_time_ms, result["success"])
+            execution_time_ms = self._calculate_duration(start_ns)
+            completed_at = datetime.now(timezone.utc)
+            self._update_metrics(execution_time_ms, result["success"], completed_at)
 
             return ExecutionResult(
                 success=result["success"],
@@ -118,10 +221,11 @@ class AzureContainerExecutor(BaseExecutor):
                 provider=self.provider,
                 execution_id=request.execution_id,
                 started_at=start_time,
-                completed_at=datetime.now(timezone.utc),
+                completed_at=completed_at,
             )
 
         except ResourceNotFoundError:
+            self._health_cache = None
             raise ExecutorNotAvailableError(
                 f"Container Apps job not found: {job_name}",
                 provider=self.provider,
@@ -130,49 +234,55 @@ class AzureContainerExecutor(BaseExecutor):
         except AzureError as e:
             logger.error(f"Azure error: {e}")
             self._metrics.failed_executions += 1
-
-            return ExecutionResult(
-                success=False,
-                stdout="",
-                stderr=str(e),
-                exit_code=-1,
-                execution_time_ms=self._calculate_duration(start_time),
-                cold_start=True,
-                provider=self.provider,
-                execution_id=request.execution_id,
-            )
+            self._health_cache = None
+            return self._failure_result(start_time, start_ns, request, e)
 
         except Exception as e:
             logger.error(f"Unexpected error: {e}", exc_info=True)
             self._metrics.failed_executions += 1
+            self._health_cache = None
+            return self._failure_result(start_time, start_ns, request, e)
 
-            return ExecutionResult(
-                success=False,
-                stdout="",
-                stderr=str(e),
-                exit_code=-1,
-                execution_time_ms=self._calculate_duration(start_time),
-                cold_start=True,
-                provider=self.provider,
-                execution_id=request.execution_id,
-            )
+    def _failure_result(
+        self,
+        start_time: datetime,
+        start_ns: int,
+        request: ExecutionRequest,
+        error: Exception,
+    ) -> ExecutionResult:
+        """Build the result for an execution that raised"""
+        return ExecutionResult(
+            success=False,
+            stdout="",
+            stderr=str(error),
+            exit_code=-1,
+            execution_time_ms=self._calculate_duration(start_ns),
+            cold_start=True,
+            provider=self.provider,
+            execution_id=request.execution_id,
+            started_at=start_time,
+            completed_at=datetime.now(timezone.utc),
+        )
 
     async def _start_job(self, job_name: str, request: ExecutionRequest):
         """Start Container Apps job execution"""
+        files_json = orjson.dumps(request.files).decode() if request.files else _EMPTY_FILES
+
         # Build environment variables
         env_vars = [
             {"name": "CODE", "value": request.code},
             {"name": "ENTRY_POINT", "value": request.entry_point},
             {"name": "STDIN", "value": request.stdin or ""},
-            {"name": "FILES", "value": json.dumps(request.files)},
+            {"name": "FILES", "value": files_json},
         ]
-        env_vars.extend(
-            {"name": k, "value": v} for k, v in request.environment.items()
-        )
+        if request.environment:
+            env_vars.extend(
+                {"name": k, "value": v} for k, v in request.environment.items()
+            )
 
-        # Start job with template override
-        result = await asyncio.to_thread(
-            self.client.jobs.begin_start,
+        # Start job with template override. The start LRO only acknowledges
+        # the start, so take the initial response instead of polling it
+        poller = await self.client.jobs.begin_start(
             resource_group_name=self.resource_group,
             job_name=job_name,
             template={
@@ -186,29 +296,21 @@ class AzureContainerExecutor(BaseExecutor):
                     }
                 ],
             },
+            polling=False,
         )
 
-        return result
+        return await poller.result()
 
     async def _wait_for_execution(
-        self, job_name: str, operation, timeout_ms: int
+        self, job_name: str, started, timeout_ms: int
     ) -> dict:
         """Wait for job execution to complete"""
         try:
-            result = await asyncio.wait_for(
-                asyncio.to_thread(operation.result),
+            execution = await asyncio.wait_for(
+                self._poll_execution(job_name, started.name),
                 timeout=timeout_ms / 1000 + 30,
             )
 
-            # Check execution status
-            execution_name = result.name
-            execution = await asyncio.to_thread(
-                self.client.job_execution.get,
-                resource_group_name=self.resource_group,
-                job_name=job_name,
-                job_execution_name=execution_name,
-            )
-
             succeeded = execution.status == "Succeeded"
             return {
                 "success": succeeded,
@@ -225,21 +327,55 @@ class AzureContainerExecutor(BaseExecutor):
                 "exit_code": -1,
             }
 
+    async def _poll_execution(self, job_name: str, execution_name: str):
+        """
+        Poll a job execution until it reaches a terminal state.
+
+        Polls on a short, growing interval instead of using the SDK
+        poller, which honours the service's long Retry-After. The first
+        poll is issued right away so short jobs finish in one round trip.
+        """
+        delay = POLL_INITIAL_DELAY_SECONDS
+        while True:
+            execution = await self.client.job_execution.get(
+                resource_group_name=self.resource_group,
+                job_name=job_name,
+                job_execution_name=execution_name,
+            )
+            if execution.status in TERMINAL_EXECUTION_STATES:
+                return execution
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, POLL_MAX_DELAY_SECONDS)
+
+    @classmethod
+    def _job_suffix(cls, runtime: Runtime) -> str:
+        """Get job name suffix for runtime"""
+        suffix = cls.RUNTIME_SUFFIX_MAP.get(runtime)
+        if suffix:
+            return suffix
+        return runtime.value.replace(":", "-").replace(".", "-")
+
     def _get_job_name(self, runtime: Runtime) -> str:
         """Get Container Apps job name for runtime"""
-        suffix = self.RUNTIME_SUFFIX_MAP.get(runtime)
-        if suffix:
-            return f"{self.job_prefix}-{suffix}"
-        runtime_str = runtime.value.replace(":", "-").replace(".", "-")
-        return f"{self.job_prefix}-{runtime_str}"
+        return self._job_names[runtime]
+
+    def _calculate_duration(self, start_ns: int) -> float:
+        """Calculate duration in milliseconds since a monotonic_ns() start"""
+        return (time.monotonic_ns() - start_ns) / 1e6
 
-    def _calculate_duration(self, start_time: datetime) -> float:
-        """Calculate duration in milliseconds"""
-        delta = datetime.now(timezone.utc) - start_time
-        return delta.total_seconds() * 1000
+    def _update_metrics(
+        self,
+        execution_time_ms: float,
+        success: bool,
+        now: Optional[datetime] = None,
+    ) -> None:
+        """
+        Update execution metrics
 
-    def _update_metrics(self, execution_time_ms: float, success: bool) -> None:
-        """Update execution metrics"""
+        Only counters and the sample window are touched per execution;
+        averages and ratios are derived when metrics are read. `now` is
+        the completion time, if the caller already has it.
+        """
         self._metrics.total_executions += 1
         self._metrics.cold_start_count += 1
 
@@ -248,16 +384,15 @@ class AzureContainerExecutor(BaseExecutor):
         else:
             self._metrics.failed_executions += 1
 
-        self._execution_times.append(execution_time_ms)
-        if len(self._execution_times) > 1000:
-            self._execution_times = self._execution_times[-1000:]
+        # Keep a running sum over the window so the average is O(1)
+        times = self._execution_times
+        if len(times) == times.maxlen:
+            self._execution_times_sum -= times[0]
+        times.append(execution_time_ms)
+        self._execution_times_sum += execution_time_ms
 
-        if self._execution_times:
-            self._metrics.avg_execution_time_ms = (
-                sum(self._execution_times) / len(self._execution_times)
-            )
-
-        now = datetime.now(timezone.utc)
+        if now is None:
+            now = datetime.now(timezone.utc)
         if self._metrics.first_execution_at is None:
             self._metrics.first_execution_at = now
         self._metrics.last_execution_at = now
@@ -267,46 +402,76 @@ class AzureContainerExecutor(BaseExecutor):
         return 0
 
     async def health_check(self) -> HealthStatus:
-        """Check Azure Container Apps executor health"""
-        try:
-            job_name = self._get_job_name(Runtime.PYTHON_311)
-
-            job = await asyncio.to_thread(
-                self.client.jobs.get,
-                resource_group_name=self.resource_group,
-                job_name=job_name,
-            )
+        """
+        Check Azure Container Apps executor health
 
-            return HealthStatus(
-                healthy=True,
-                provider=self.provider,
-                message="OK",
-                checks={
-                    "job_exists": True,
-                    "job_name": job_name,
-                    "provisioning_state": job.provisioning_state,
-                },
-            )
+        Results are reused for HEALTH_CACHE_TTL_SECONDS so frequent probes
+        don't each cost an API read; a failed execution drops the cache.
+        """
+        cached = self._health_cache
+        if cached and time.monotonic() - cached[0] < HEALTH_CACHE_TTL_SECONDS:
+            return cached[1]
+
+        health = await self._check_health()
+        self._health_cache = (time.monotonic(), health)
+        return health
+
+    async def _check_health(self) -> HealthStatus:
+        """Look up every runtime's job, concurrently, to check executor health"""
+        job_names = [self._job_names[runtime] for runtime in self.RUNTIME_SUFFIX_MAP]
+        results = await asyncio.gather(
+            *(
+                self.client.jobs.get(
+                    resource_group_name=self.resource_group,
+                    job_name=job_name,
+                )
+                for job_name in job_names
+            ),
+            return_exceptions=True,
+        )
 
-        except ResourceNotFoundError:
+        jobs: Dict[str, bool] = {}
+        provisioning_states: Dict[str, str] = {}
+        error: Optional[BaseException] = None
+        for job_name, result in zip(job_names, results):
+            if isinstance(result, ResourceNotFoundError):
+                jobs[job_name] = False
+            elif isinstance(result, BaseException):
+                error = error or result
+            else:
+                jobs[job_name] = True
+                provisioning_states[job_name] = result.provisioning_state
+
+        job_exists = any(jobs.values())
+        if not job_exists and error is not None:
             return HealthStatus(
                 healthy=False,
                 provider=self.provider,
-                message="Job not found",
-                checks={"job_exists": False},
+                message=str(error),
             )
 
-        except Exception as e:
-            return HealthStatus(
-                healthy=False,
-                provider=self.provider,
-                message=str(e),
-            )
+        missing = [job_name for job_name, exists in jobs.items() if not exists]
+        return HealthStatus(
+            healthy=job_exists,
+            provider=self.provider,
+            message=f"Jobs not found: {', '.join(missing)}" if missing else "OK",
+            checks={
+                "job_exists": job_exists,
+                "jobs": jobs,
+                "provisioning_states": provisioning_states,
+            },
+        )
 
     async def cleanup(self) -> None:
-        """Cleanup - nothing to do"""
+        """Cleanup - release the shared client"""
+        await _release_client(self.subscription_id)
         logger.info("AzureContainerExecutor cleanup complete")
 
     async def get_metrics(self) -> ExecutorMetrics:
         """Get execution metrics"""
+        if self._execution_times:
+            self._metrics.avg_execution_time_ms = (
+                self._execution_times_sum / len(self._execution_times)
+            )
+        self._metrics.update_ratios()
         return self._metrics
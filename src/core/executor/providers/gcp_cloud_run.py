@@ -5,9 +5,15 @@ Execute code using Google Cloud Run Jobs.
 """
 
 import asyncio
-import json
 import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+import orjson
 
 from ..interface import BaseExecutor, ExecutorProvider, Runtime
 from ..models import ExecutionRequest, ExecutionResult, HealthStatus, ExecutorMetrics
@@ -28,6 +34,66 @@ except ImportError:
     NotFound = Exception
 
 
+@dataclass(slots=True)
+class _SharedClients:
+    """Cloud Run clients shared by all executors"""
+
+    jobs_client: Any
+    executions_client: Any
+    users: int = 0
+
+
+# Cloud Run clients aren't tied to a project, so all executors share one
+# pair of gRPC channels
+_shared_clients: Optional[_SharedClients] = None
+
+
+def _acquire_clients() -> _SharedClients:
+    """Get the shared Cloud Run clients, creating them on first use"""
+    global _shared_clients
+    if _shared_clients is None:
+        _shared_clients = _SharedClients(
+            jobs_client=run_v2.JobsAsyncClient(),
+            executions_client=run_v2.ExecutionsAsyncClient(),
+        )
+    _shared_clients.users += 1
+    return _shared_clients
+
+
+async def _release_clients() -> None:
+    """Release the shared clients, closing them once no executor uses them"""
+    global _shared_clients
+    shared = _shared_clients
+    shared.users -= 1
+    if shared.users == 0:
+        _shared_clients = None
+        await shared.jobs_client.transport.close()
+        await shared.executions_client.transport.close()
+
+
+# FILES value for requests without files (the common case)
+_EMPTY_FILES = "{}"
+
+# Job submissions failing with these HTTP statuses are retried with
+# jittered exponential backoff. run_job isn't idempotent - a timeout or
+# 5xx can arrive after the execution was created - so only throttling and
+# unavailability, where the request wasn't processed, are retried
+RETRYABLE_STATUS_CODES = frozenset({429, 503})
+SUBMIT_ATTEMPTS = 4
+RETRY_BASE_DELAY_SECONDS = 0.5
+RETRY_MAX_DELAY_SECONDS = 5.0
+
+# How long a health check result is reused before the job is looked up again
+HEALTH_CACHE_TTL_SECONDS = 10.0
+
+# Number of recent execution times kept for latency stats
+EXECUTION_TIME_WINDOW = 1000
+
+# Execution status polling: start fast for short jobs, back off to a cap
+POLL_INITIAL_DELAY_SECONDS = 0.5
+POLL_MAX_DELAY_SECONDS = 5.0
+
+
 class GCPCloudRunExecutor(BaseExecutor):
     """
     GCP Cloud Run based executor.
@@ -76,13 +142,23 @@ class GCPCloudRunExecutor(BaseExecutor):
         self.region = region
         self.job_prefix = job_prefix
 
-        # Initialize Cloud Run client
-        self.jobs_client = run_v2.JobsClient()
-        self.executions_client = run_v2.ExecutionsClient()
+        # Job names are fixed once the prefix is known
+        self._job_names: dict[Runtime, str] = {
+            runtime: f"{job_prefix}-{self._job_suffix(runtime)}" for runtime in Runtime
+        }
+
+        # Initialize Cloud Run clients (asyncio gRPC, no thread per call)
+        shared = _acquire_clients()
+        self.jobs_client = shared.jobs_client
+        self.executions_client = shared.executions_client
 
         # Metrics
         self._metrics = ExecutorMetrics(provider=self.provider)
-        self._execution_times: list[float] = []
+        self._execution_times: deque[float] = deque(maxlen=EXECUTION_TIME_WINDOW)
+        self._execution_times_sum = 0.0
+
+        # Last health check as (monotonic time, status)
+        self._health_cache: Optional[Tuple[float, HealthStatus]] = None
 
     async def initialize(self) -> None:
         """Initialize executor"""
@@ -92,17 +168,19 @@ class GCPCloudRunExecutor(BaseExecutor):
     async def execute(self, request: ExecutionRequest) -> ExecutionResult:
         """Execute code using Cloud Run Job"""
         start_time = datetime.now(timezone.utc)
+        start_ns = time.monotonic_ns()  # durations aren't affected by clock changes
         job_name = self._get_job_name(request.runtime)
 
         try:
             # Create execution with overrides
-            execution = await self._run_job(job_name, request)
+            execution = await self._run_job_with_retry(job_name, request)
 
             # Wait for completion
             result = await self._wait_for_execution(execution, request.timeout_ms)
 
-            execution_time_ms = self._calculate_duration(start_time)
-            self._update_metrics(execution_time_ms, result["success"])
+            execution_time_ms = self._calculate_duration(start_ns)
+            completed_at = datetime.now(timezone.utc)
+            self._update_metrics(execution_time_ms, result["success"], completed_at)
 
             return ExecutionResult(
                 success=result["success"],
@@ -114,10 +192,11 @@ class GCPCloudRunExecutor(BaseExecutor):
                 provider=self.provider,
                 execution_id=request.execution_id,
                 started_at=start_time,
-                completed_at=datetime.now(timezone.utc),
+                completed_at=completed_at,
             )
 
         except NotFound:
+            self._health_cache = None
             raise ExecutorNotAvailableError(
                 f"Cloud Run job not found: {job_name}",
                 provider=self.provider,
@@ -126,52 +205,74 @@ class GCPCloudRunExecutor(BaseExecutor):
         except GoogleAPIError as e:
             logger.error(f"Cloud Run error: {e}")
             self._metrics.failed_executions += 1
-
-            return ExecutionResult(
-                success=False,
-                stdout="",
-                stderr=str(e),
-                exit_code=-1,
-                execution_time_ms=self._calculate_duration(start_time),
-                cold_start=True,
-                provider=self.provider,
-                execution_id=request.execution_id,
-            )
+            self._health_cache = None
+            return self._failure_result(start_time, start_ns, request, e)
 
         except Exception as e:
             logger.error(f"Unexpected error: {e}", exc_info=True)
             self._metrics.failed_executions += 1
+            self._health_cache = None
+            return self._failure_result(start_time, start_ns, request, e)
 
-            return ExecutionResult(
-                success=False,
-                stdout="",
-                stderr=str(e),
-                exit_code=-1,
-                execution_time_ms=self._calculate_duration(start_time),
-                cold_start=True,
-                provider=self.provider,
-                execution_id=request.execution_id,
-            )
+    def _failure_result(
+        self,
+        start_time: datetime,
+        start_ns: int,
+        request: ExecutionRequest,
+        error: Exception,
+    ) -> ExecutionResult:
+        """Build the result for an execution that raised"""
+        return ExecutionResult(
+            success=False,
+            stdout="",
+            stderr=str(error),
+            exit_code=-1,
+            execution_time_ms=self._calculate_duration(start_ns),
+            cold_start=True,
+            provider=self.provider,
+            execution_id=request.execution_id,
+            started_at=start_time,
+            completed_at=datetime.now(timezone.utc),
+        )
+
+    async def _run_job_with_retry(self, job_name: str, request: ExecutionRequest):
+        """Submit the job, retrying throttled and unavailable responses"""
+        for attempt in range(SUBMIT_ATTEMPTS):
+            try:
+                return await self._run_job(job_name, request)
+            except GoogleAPIError as e:
+                status = getattr(e, "code", None)
+                if status not in RETRYABLE_STATUS_CODES or attempt == SUBMIT_ATTEMPTS - 1:
+                    raise
+                delay = min(RETRY_BASE_DELAY_SECONDS * 2**attempt, RETRY_MAX_DELAY_SECONDS)
+                logger.warning(
+                    f"Cloud Run job submit failed with {status}, retrying in ~{delay:.1f}s"
+                )
+                await asyncio.sleep(random.uniform(delay / 2, delay))
 
     async def _run_job(self, job_name: str, request: ExecutionRequest):
         """Run Cloud Run job with overrides"""
         parent = f"projects/{self.project_id}/locations/{self.region}/jobs/{job_name}"
 
+        files_json = orjson.dumps(request.files).decode() if request.files else _EMPTY_FILES
+
+        # Build environment variables as plain mappings - proto-plus marshals
+        # them straight into the protobuf without an EnvVar wrapper each
+        env_vars = [
+            {"name": "CODE", "value": request.code},
+            {"name": "ENTRY_POINT", "value": request.entry_point},
+            {"name": "STDIN", "value": request.stdin or ""},
+            {"name": "FILES", "value": files_json},
+        ]
+        if request.environment:
+            env_vars.extend(
+                {"name": k, "value": v} for k, v in request.environment.items()
+            )
+
         # Build override with code and parameters
         override = run_v2.RunJobRequest.Overrides(
             container_overrides=[
-                run_v2.RunJobRequest.Overrides.ContainerOverride(
-                    env=[
-                        run_v2.EnvVar(name="CODE", value=request.code),
-                        run_v2.EnvVar(name="ENTRY_POINT", value=request.entry_point),
-                        run_v2.EnvVar(name="STDIN", value=request.stdin or ""),
-                        run_v2.EnvVar(name="FILES", value=json.dumps(request.files)),
-                        *[
-                            run_v2.EnvVar(name=k, value=v)
-                            for k, v in request.environment.items()
-                        ],
-                    ],
-                )
+                run_v2.RunJobRequest.Overrides.ContainerOverride(env=env_vars)
             ],
             timeout=f"{request.timeout_ms // 1000}s",
         )
@@ -181,10 +282,7 @@ class GCPCloudRunExecutor(BaseExecutor):
             overrides=override,
         )
 
-        operation = await asyncio.to_thread(
-            self.jobs_client.run_job,
-            request=run_request,
-        )
+        operation = await self.jobs_client.run_job(request=run_request)
 
         return operation
 
@@ -192,7 +290,7 @@ class GCPCloudRunExecutor(BaseExecutor):
         """Wait for job execution to complete"""
         try:
             result = await asyncio.wait_for(
-                asyncio.to_thread(operation.result),
+                self._poll_execution(operation.metadata.name),
                 timeout=timeout_ms / 1000 + 30,  # Add buffer
             )
 
@@ -213,21 +311,51 @@ class GCPCloudRunExecutor(BaseExecutor):
                 "exit_code": -1,
             }
 
+    async def _poll_execution(self, execution_name: str):
+        """
+        Poll an execution until it completes.
+
+        Polls on a short, growing interval instead of waiting on
+        operation.result(), whose default polling is much coarser. The
+        first poll is issued right away so short jobs finish in one round trip.
+        """
+        delay = POLL_INITIAL_DELAY_SECONDS
+        while True:
+            execution = await self.executions_client.get_execution(name=execution_name)
+            if execution.completion_time:
+                return execution
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, POLL_MAX_DELAY_SECONDS)
+
+    @classmethod
+    def _job_suffix(cls, runtime: Runtime) -> str:
+        """Get job name suffix for runtime"""
+        suffix = cls.RUNTIME_SUFFIX_MAP.get(runtime)
+        if suffix:
+            return suffix
+        return runtime.value.replace(":", "-").replace(".", "-")
+
     def _get_job_name(self, runtime: Runtime) -> str:
         """Get Cloud Run job name for runtime"""
-        suffix = self.RUNTIME_SUFFIX_MAP.get(runtime)
-        if suffix:
-            return f"{self.job_prefix}-{suffix}"
-        runtime_str = runtime.value.replace(":", "-").replace(".", "-")
-        return f"{self.job_prefix}-{runtime_str}"
+        return self._job_names[runtime]
 
-    def _calculate_duration(self, start_time: datetime) -> float:
-        """Calculate duration in milliseconds"""
-        delta = datetime.now(timezone.utc) - start_time
-        return delta.total_seconds() * 1000
+    def _calculate_duration(self, start_ns: int) -> float:
+        """Calculate duration in milliseconds since a monotonic_ns() start"""
+        return (time.monotonic_ns() - start_ns) / 1e6
 
-    def _update_metrics(self, execution_time_ms: float, success: bool) -> None:
-        """Update execution metrics"""
+    def _update_metrics(
+        self,
+        execution_time_ms: float,
+        success: bool,
+        now: Optional[datetime] = None,
+    ) -> None:
+        """
+        Update execution metrics
+
+        Only counters and the sample window are touched per execution;
+        averages and ratios are derived when metrics are read. `now` is
+        the completion time, if the caller already has it.
+        """
         self._metrics.total_executions += 1
         self._metrics.cold_start_count += 1  # Always cold start
 
@@ -236,16 +364,15 @@ class GCPCloudRunExecutor(BaseExecutor):
         else:
             self._metrics.failed_executions += 1
 
-        self._execution_times.append(execution_time_ms)
-        if len(self._execution_times) > 1000:
-            self._execution_times = self._execution_times[-1000:]
-
-        if self._execution_times:
-            self._metrics.avg_execution_time_ms = (
-                sum(self._execution_times) / len(self._execution_times)
-            )
+        # Keep a running sum over the window so the average is O(1)
+        times = self._execution_times
+        if len(times) == times.maxlen:
+            self._execution_times_sum -= times[0]
+        times.append(execution_time_ms)
+        self._execution_times_sum += execution_time_ms
 
-        now = datetime.now(timezone.utc)
+        if now is None:
+            now = datetime.now(timezone.utc)
         if self._metrics.first_execution_at is None:
             self._metrics.first_execution_at = now
         self._metrics.last_execution_at = now
@@ -255,46 +382,68 @@ class GCPCloudRunExecutor(BaseExecutor):
         return 0
 
     async def health_check(self) -> HealthStatus:
-        """Check Cloud Run executor health"""
-        try:
-            job_name = self._get_job_name(Runtime.PYTHON_311)
-            parent = f"projects/{self.project_id}/locations/{self.region}/jobs/{job_name}"
-
-            # Verify job exists by fetching it
-            await asyncio.to_thread(
-                self.jobs_client.get_job,
-                name=parent,
-            )
+        """
+        Check Cloud Run executor health
 
-            return HealthStatus(
-                healthy=True,
-                provider=self.provider,
-                message="OK",
-                checks={
-                    "job_exists": True,
-                    "job_name": job_name,
-                },
-            )
+        Results are reused for HEALTH_CACHE_TTL_SECONDS so frequent probes
+        don't each cost an API read; a failed execution drops the cache.
+        """
+        cached = self._health_cache
+        if cached and time.monotonic() - cached[0] < HEALTH_CACHE_TTL_SECONDS:
+            return cached[1]
+
+        health = await self._check_health()
+        self._health_cache = (time.monotonic(), health)
+        return health
+
+    async def _check_health(self) -> HealthStatus:
+        """Look up every runtime's job, concurrently, to check executor health"""
+        job_names = [self._job_names[runtime] for runtime in self.RUNTIME_SUFFIX_MAP]
+        parent = f"projects/{self.project_id}/locations/{self.region}/jobs"
+        results = await asyncio.gather(
+            *(self.jobs_client.get_job(name=f"{parent}/{job_name}") for job_name in job_names),
+            return_exceptions=True,
+        )
 
-        except NotFound:
+        jobs: Dict[str, bool] = {}
+        error: Optional[BaseException] = None
+        for job_name, result in zip(job_names, results):
+            if isinstance(result, NotFound):
+                jobs[job_name] = False
+            elif isinstance(result, BaseException):
+                error = error or result
+            else:
+                jobs[job_name] = True
+
+        job_exists = any(jobs.values())
+        if not job_exists and error is not None:
             return HealthStatus(
                 healthy=False,
                 provider=self.provider,
-                message="Job not found",
-                checks={"job_exists": False},
+                message=str(error),
             )
 
-        except Exception as e:
-            return HealthStatus(
-                healthy=False,
-                provider=self.provider,
-                message=str(e),
-            )
+        missing = [job_name for job_name, exists in jobs.items() if not exists]
+        return HealthStatus(
+            healthy=job_exists,
+            provider=self.provider,
+            message=f"Jobs not found: {', '.join(missing)}" if missing else "OK",
+            checks={
+                "job_exists": job_exists,
+                "jobs": jobs,
+            },
+        )
 
     async def cleanup(self) -> None:
-        """Cleanup - nothing to do"""
+        """Cleanup - release the shared clients"""
+        await _release_clients()
         logger.info("GCPCloudRunExecutor cleanup complete")
 
     async def get_metrics(self) -> ExecutorMetrics:
         """Get execution metrics"""
+        if self._execution_times:
+            self._metrics.avg_execution_time_ms = (
+                self._execution_times_sum / len(self._execution_times)
+            )
+        self._metrics.update_ratios()
         return self._metrics
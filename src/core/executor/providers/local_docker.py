@@ -5,21 +5,87 @@ Warm Pool based Docker executor for fast, isolated code execution.
 """
 
 import asyncio
+import io
 import logging
+import math
+import shlex
+import tarfile
 import time
+from collections import deque
 from datetime import datetime, timezone
-from typing import Optional
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import docker
 
 from ..interface import BaseExecutor, ExecutorProvider, Runtime
 from ..models import ExecutionRequest, ExecutionResult, HealthStatus, ExecutorMetrics
-from ..exceptions import ExecutionTimeoutError
+from ..exceptions import ExecutionTimeoutError, ExecutorError
+from ..latency import LatencyHistogram
 from ...warm_pool.manager import WarmPoolManager
+from ...warm_pool.coalescer import DockerCallCoalescer
 from ...warm_pool.container import WarmContainer
+from ...warm_pool.shell import (
+    ContainerShell,
+    ShellError,
+    UnsupportedTransportError,
+    run_exec,
+)
 
 logger = logging.getLogger(__name__)
 
+# Number of recent execution times kept for avg/min/max stats
+EXECUTION_TIME_WINDOW = 1000
+
+# Predictive pool sizing: arrival rates are smoothed (EWMA) on a fixed
+# interval; runtimes whose rate decays below the floor are forgotten
+AUTOSCALE_INTERVAL_SECONDS = 30.0
+ARRIVAL_RATE_ALPHA = 0.3
+MIN_ARRIVAL_RATE = 1 / 600
+
+# Code files are unpacked from a tar stream into /tmp (a tmpfs, which the
+# put_archive API can't write into), ending up under /tmp/code
+EXTRACT_CODE_COMMAND = ["tar", "-x", "-f", "-", "-C", "/tmp"]
+
+# Kill every process in the container's PID namespace except init and the
+# calling shell (which also catches user code that left its process group),
+# then clear the code files for the next run
+KILL_USER_SCRIPT = "kill -s KILL -- -1 2>/dev/null"
+RESET_SCRIPT = f"{KILL_USER_SCRIPT}; rm -rf /tmp/code"
+
+# A reset that takes longer than this means the container can't be trusted
+# (e.g. its shell is stuck behind user code); it is removed instead
+RESET_TIMEOUT_SECONDS = 10.0
+
+
+def _build_code_archive(request: ExecutionRequest) -> bytes:
+    """Build an in-memory tar of the entry point and extra files under code/"""
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w") as tar:
+        code_dir = tarfile.TarInfo(name="code")
+        code_dir.type = tarfile.DIRTYPE
+        code_dir.mode = 0o755
+        tar.addfile(code_dir)
+
+        for name, content in ((request.entry_point, request.code), *request.files.items()):
+            data = content.encode("utf-8")
+            info = tarfile.TarInfo(name=f"code/{name}")
+            info.size = len(data)
+            info.mode = 0o644
+            tar.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+
+def _datetime_from_ns(timestamp_ns: int) -> datetime:
+    """UTC datetime from a time.time_ns() timestamp"""
+    return datetime.fromtimestamp(timestamp_ns / 1e9, timezone.utc)
+
+
+@lru_cache(maxsize=256)
+def _format_exec_command(template: Tuple[str, ...], entry_point: str) -> Tuple[str, ...]:
+    """Fill a runtime command template with the entry point"""
+    return tuple(part.format(entry_point=entry_point) for part in template)
+
 
 class LocalDockerExecutor(BaseExecutor):
     """
@@ -33,21 +99,23 @@ class LocalDockerExecutor(BaseExecutor):
     - Fast execution (~50-100ms warm start)
     - Full isolation (network, filesystem, resources)
     - Automatic health monitoring and replacement
+    - Commands run over a persistent in-container shell, not an exec each
     """
 
     provider = ExecutorProvider.LOCAL_DOCKER
 
-    # Execution commands per runtime
+    # Execution command templates per runtime (tuples, so formatted
+    # commands can be cached)
     EXEC_COMMANDS = {
-        Runtime.PYTHON_311: ["python3", "/tmp/code/{entry_point}"],
-        Runtime.PYTHON_312: ["python3", "/tmp/code/{entry_point}"],
-        Runtime.NODE_20: ["node", "/tmp/code/{entry_point}"],
-        Runtime.NODE_22: ["node", "/tmp/code/{entry_point}"],
-        Runtime.GO_121: ["go", "run", "/tmp/code/{entry_point}"],
-        Runtime.GO_122: ["go", "run", "/tmp/code/{entry_point}"],
-        Runtime.RUST_LATEST: ["rustc", "/tmp/code/{entry_point}", "-o", "/tmp/out", "&&", "/tmp/out"],
-        Runtime.JAVA_17: ["java", "/tmp/code/{entry_point}"],
-        Runtime.JAVA_21: ["java", "/tmp/code/{entry_point}"],
+        Runtime.PYTHON_311: ("python3", "/tmp/code/{entry_point}"),
+        Runtime.PYTHON_312: ("python3", "/tmp/code/{entry_point}"),
+        Runtime.NODE_20: ("node", "/tmp/code/{entry_point}"),
+        Runtime.NODE_22: ("node", "/tmp/code/{entry_point}"),
+        Runtime.GO_121: ("go", "run", "/tmp/code/{entry_point}"),
+        Runtime.GO_122: ("go", "run", "/tmp/code/{entry_point}"),
+        Runtime.RUST_LATEST: ("rustc", "/tmp/code/{entry_point}", "-o", "/tmp/out", "&&", "/tmp/out"),
+        Runtime.JAVA_17: ("java", "/tmp/code/{entry_point}"),
+        Runtime.JAVA_21: ("java", "/tmp/code/{entry_point}"),
     }
 
     def __init__(
@@ -58,6 +126,8 @@ class LocalDockerExecutor(BaseExecutor):
         health_check_interval_seconds: int = 30,
         memory_limit: str = "256m",
         cpu_limit: float = 0.5,
+        persistent_shell: bool = True,
+        predictive_warmup: bool = False,
     ):
         """
         Initialize executor.
@@ -69,6 +139,10 @@ class LocalDockerExecutor(BaseExecutor):
             health_check_interval_seconds: Health check interval
             memory_limit: Memory limit per container
             cpu_limit: CPU limit per container
+            persistent_shell: Run commands over a long-lived shell per
+                container instead of a docker exec per command
+            predictive_warmup: Periodically grow each runtime's pool to
+                match its recent arrival rate
 
         Raises:
             docker.errors.DockerException: If Docker is not available
@@ -91,9 +165,27 @@ class LocalDockerExecutor(BaseExecutor):
             cpu_limit=cpu_limit,
         )
 
+        self.persistent_shell = persistent_shell
+
+        # Identical concurrent daemon calls (pings, warm-up bursts) share one
+        self._coalescer = DockerCallCoalescer()
+
+        # Arrivals per runtime since the last autoscale pass, and their
+        # smoothed rate (per second), for predictive pool sizing
+        self.predictive_warmup = predictive_warmup
+        self._arrivals: Dict[Runtime, int] = {}
+        self._arrival_rates: Dict[Runtime, float] = {}
+        self._last_autoscale_at = time.monotonic()
+        self._autoscale_task: Optional[asyncio.Task] = None
+
         # Metrics tracking
         self._metrics = ExecutorMetrics(provider=self.provider)
-        self._execution_times: list[float] = []
+        self._execution_times: deque[float] = deque(maxlen=EXECUTION_TIME_WINDOW)
+        self._execution_times_sum = 0.0
+        self._latency = LatencyHistogram()
+        # Execution timestamps as time.time_ns(), converted in get_metrics()
+        self._first_execution_ns: Optional[int] = None
+        self._last_execution_ns: Optional[int] = None
 
     async def initialize(self) -> None:
         """Initialize executor and warm pool"""
@@ -105,6 +197,10 @@ class LocalDockerExecutor(BaseExecutor):
         await self.warm_up(Runtime.PYTHON_311, count=3)
         await self.warm_up(Runtime.NODE_20, count=2)
 
+        if self.predictive_warmup and self._autoscale_task is None:
+            self._last_autoscale_at = time.monotonic()
+            self._autoscale_task = asyncio.create_task(self._autoscale_loop())
+
         logger.info("LocalDockerExecutor initialized")
 
     async def execute(self, request: ExecutionRequest) -> ExecutionResult:
@@ -117,34 +213,150 @@ class LocalDockerExecutor(BaseExecutor):
         Returns:
             ExecutionResult with stdout, stderr, and metrics
         """
-        start_time = time.time()
-        cold_start = False
-        container: Optional[WarmContainer] = None
+        start_ns = time.time_ns()
+        self._arrivals[request.runtime] = self._arrivals.get(request.runtime, 0) + 1
 
+        # 1. Acquire container from pool
         try:
-            # 1. Acquire container from pool
-            container = await self.pool_manager.acquire(request.runtime)
+            container, cold_start = await self._acquire_container(request.runtime)
+        except Exception as e:
+            return self._failure_result(request, e, start_ns)
 
-            if container is None:
-                # Cold start - create new container
-                cold_start = True
-                self._metrics.cold_start_count += 1
-                self._metrics.pool_misses += 1
+        try:
+            # 2. Execute code in container
+            return await self._execute_request(container, request, cold_start, start_ns)
+        finally:
+            # 3. Reset and release container
+            await self._release_container(container, request.runtime, cold_start)
 
-                logger.debug(f"Cold start for {request.runtime.value}")
-                container = await self.pool_manager._create_container(request.runtime)
-            else:
-                self._metrics.warm_start_count += 1
-                self._metrics.pool_hits += 1
+    async def execute_batch(self, requests: Sequence[ExecutionRequest]) -> List[ExecutionResult]:
+        """
+        Execute several requests, reusing one container per runtime.
 
-            # 2. Execute code in container
+        Requests for the same runtime run back to back in a single
+        container, cleared in between, instead of each acquiring and
+        releasing its own. Runtimes are run concurrently.
+
+        A request that times out gets a failed result rather than raising,
+        so results already produced aren't lost. Its container is removed,
+        and the requests queued behind it for that runtime fail without
+        running.
+
+        Args:
+            requests: Execution requests
+
+        Returns:
+            Results in request order
+        """
+        results: List[Optional[ExecutionResult]] = [None] * len(requests)
+        groups: Dict[Runtime, List[int]] = {}
+        for index, request in enumerate(requests):
+            groups.setdefault(request.runtime, []).append(index)
+            self._arrivals[request.runtime] = self._arrivals.get(request.runtime, 0) + 1
+
+        async def run_group(runtime: Runtime, indices: List[int]) -> None:
+            start_ns = time.time_ns()
+            try:
+                container, cold_start = await self._acquire_container(runtime)
+            except Exception as e:
+                for index in indices:
+                    results[index] = self._failure_result(requests[index], e, start_ns)
+                return
+
+            discard = False
+            skipped: List[int] = []
+            try:
+                for position, index in enumerate(indices):
+                    request = requests[index]
+                    if discard:
+                        skipped = indices[position:]
+                        break
+                    if position:
+                        start_ns = time.time_ns()
+                        self._metrics.warm_start_count += 1
+                        self._metrics.update_ratios()
+                        try:
+                            await self._clear_container(container)
+                        except Exception as e:
+                            results[index] = self._failure_result(request, e, start_ns)
+                            discard = True
+                            continue
+                    try:
+                        results[index] = await self._execute_request(
+                            container, request, cold_start and not position, start_ns
+                        )
+                    except ExecutionTimeoutError as e:
+                        results[index] = self._failure_result(
+                            request, e, start_ns, cold_start and not position
+                        )
+                        discard = True
+            finally:
+                if discard:
+                    # Don't reuse a container whose run or reset was cut short
+                    await self.pool_manager._remove_container(
+                        container, runtime, from_pool=not cold_start
+                    )
+                else:
+                    await self._release_container(container, runtime, cold_start)
+
+            if skipped:
+                logger.warning(
+                    f"Not running {len(skipped)} {runtime.value} batch request(s): "
+                    f"their container was discarded"
+                )
+                error = ExecutorError(
+                    "Not run: the batch's container was discarded", provider=self.provider
+                )
+                skipped_ns = time.time_ns()
+                for index in skipped:
+                    results[index] = self._failure_result(
+                        requests[index], error, skipped_ns, log=False
+                    )
+
+        await asyncio.gather(*(run_group(runtime, indices) for runtime, indices in groups.items()))
+        return results
+
+    async def _acquire_container(self, runtime: Runtime) -> Tuple[WarmContainer, bool]:
+        """
+        Acquire a container from the pool, creating one on a miss.
+
+        Returns:
+            Tuple of (container, whether it was a cold start)
+        """
+        container = await self.pool_manager.acquire(runtime)
+        cold_start = container is None
+
+        if cold_start:
+            # Cold start - create new container
+            self._metrics.cold_start_count += 1
+            self._metrics.pool_misses += 1
+
+            logger.debug(f"Cold start for {runtime.value}")
+            container = await self.pool_manager._create_container(runtime)
+        else:
+            self._metrics.warm_start_count += 1
+            self._metrics.pool_hits += 1
+        self._metrics.update_ratios()
+
+        return container, cold_start
+
+    async def _execute_request(
+        self,
+        container: WarmContainer,
+        request: ExecutionRequest,
+        cold_start: bool,
+        start_ns: int,
+    ) -> ExecutionResult:
+        """Run one request in an acquired container and record its metrics"""
+        try:
             result = await self._execute_in_container(container, request)
 
-            # 3. Calculate execution time
-            execution_time_ms = (time.time() - start_time) * 1000
+            # Calculate execution time
+            completed_ns = time.time_ns()
+            execution_time_ms = (completed_ns - start_ns) / 1e6
 
-            # 4. Update metrics
-            self._update_metrics(execution_time_ms, result["success"])
+            # Update metrics
+            self._update_metrics(execution_time_ms, result["success"], completed_ns)
             container.record_execution(execution_time_ms, result["success"])
 
             return ExecutionResult(
@@ -158,18 +370,17 @@ class LocalDockerExecutor(BaseExecutor):
                 container_id=container.id,
                 memory_used_mb=result.get("memory_used_mb"),
                 execution_id=request.execution_id,
-                started_at=datetime.now(timezone.utc),
-                completed_at=datetime.now(timezone.utc),
+                started_at=_datetime_from_ns(start_ns),
+                completed_at=_datetime_from_ns(completed_ns),
             )
 
         except asyncio.TimeoutError:
             execution_time_ms = request.timeout_ms
             self._metrics.timeout_executions += 1
 
-            if container:
-                # Kill any running processes
-                await self._kill_container_processes(container)
-                container.record_execution(execution_time_ms, False)
+            # Kill any running processes
+            await self._kill_container_processes(container)
+            container.record_execution(execution_time_ms, False)
 
             raise ExecutionTimeoutError(
                 timeout_ms=request.timeout_ms,
@@ -178,41 +389,67 @@ class LocalDockerExecutor(BaseExecutor):
             )
 
         except Exception as e:
-            logger.error(f"Execution failed: {e}", exc_info=True)
+            return self._failure_result(request, e, start_ns, cold_start, container)
 
-            if container:
-                container.record_execution(
-                    (time.time() - start_time) * 1000, False
-                )
-
-            self._metrics.failed_executions += 1
+    def _failure_result(
+        self,
+        request: ExecutionRequest,
+        error: Exception,
+        start_ns: int,
+        cold_start: bool = False,
+        container: Optional[WarmContainer] = None,
+        log: bool = True,
+    ) -> ExecutionResult:
+        """
+        Record a failed execution and build its result.
 
-            return ExecutionResult(
-                success=False,
-                stdout="",
-                stderr=str(e),
-                exit_code=-1,
-                execution_time_ms=(time.time() - start_time) * 1000,
-                cold_start=cold_start,
-                provider=self.provider,
-                execution_id=request.execution_id,
-            )
+        Called from the handler of the error by default, which is logged
+        with its traceback; pass log=False for errors that weren't raised.
+        """
+        if log:
+            logger.error(f"Execution failed: {error}", exc_info=True)
+        execution_time_ms = (time.time_ns() - start_ns) / 1e6
+
+        if container:
+            container.record_execution(execution_time_ms, False)
+
+        self._metrics.failed_executions += 1
+
+        return ExecutionResult(
+            success=False,
+            stdout="",
+            stderr=str(error),
+            exit_code=-1,
+            execution_time_ms=execution_time_ms,
+            cold_start=cold_start,
+            provider=self.provider,
+            execution_id=request.execution_id,
+        )
 
-        finally:
-            # 5. Reset and release container
-            if container:
-                try:
-                    await self._reset_container(container)
+    async def _release_container(
+        self,
+        container: WarmContainer,
+        runtime: Runtime,
+        cold_start: bool,
+    ) -> None:
+        """Reset a container and return it to the pool"""
+        try:
+            await self._reset_container(container)
+        except Exception as e:
+            logger.error(f"Failed to reset container {container.id}, removing it: {e!r}")
+            await self.pool_manager._remove_container(container, runtime, from_pool=not cold_start)
+            return
 
-                    if cold_start:
-                        # Add new container to pool
-                        await self.pool_manager.add(container, request.runtime)
-                    else:
-                        # Release back to pool
-                        await self.pool_manager.release(container, request.runtime)
+        try:
+            if cold_start:
+                # Add new container to pool
+                await self.pool_manager.add(container, runtime)
+            else:
+                # Release back to pool
+                await self.pool_manager.release(container, runtime)
 
-                except Exception as e:
-                    logger.error(f"Failed to release container: {e}")
+        except Exception as e:
+            logger.error(f"Failed to release container: {e}")
 
     async def _execute_in_container(
         self,
@@ -250,58 +487,32 @@ class LocalDockerExecutor(BaseExecutor):
         container: WarmContainer,
         request: ExecutionRequest,
     ) -> None:
-        """Write code and additional files to container"""
-        # Create code directory
-        await asyncio.to_thread(
-            container.container.exec_run,
-            ["mkdir", "-p", "/tmp/code"],
-        )
-
-        # Write main code file
-        code_content = request.code.encode("utf-8")
-        await self._write_file_to_container(
-            container,
-            f"/tmp/code/{request.entry_point}",
-            code_content,
-        )
+        """Write code and additional files to container in a single command"""
+        archive = _build_code_archive(request)
 
-        # Write additional files
-        for filename, content in request.files.items():
-            await self._write_file_to_container(
-                container,
-                f"/tmp/code/{filename}",
-                content.encode("utf-8"),
+        shell = await self._get_shell(container)
+        if shell is not None:
+            exit_code, _, stderr = await shell.run(shlex.join(EXTRACT_CODE_COMMAND), stdin=archive)
+        else:
+            exit_code, _, stderr = await run_exec(
+                self.docker_client.api,
+                container.container.id,
+                EXTRACT_CODE_COMMAND,
+                stdin=archive,
+            )
+        if exit_code != 0:
+            raise RuntimeError(
+                f"Failed to write code files: {stderr.decode('utf-8', errors='replace')}"
             )
-
-    async def _write_file_to_container(
-        self,
-        container: WarmContainer,
-        path: str,
-        content: bytes,
-    ) -> None:
-        """Write file content to container using exec"""
-        import base64
-
-        encoded = base64.b64encode(content).decode("utf-8")
-
-        # Use echo and base64 decode to write file
-        cmd = f"echo '{encoded}' | base64 -d > {path}"
-        await asyncio.to_thread(
-            container.container.exec_run,
-            ["sh", "-c", cmd],
-        )
 
     def _build_exec_command(self, request: ExecutionRequest) -> list[str]:
         """Build execution command for runtime"""
         template = self.EXEC_COMMANDS.get(
             request.runtime,
-            ["python3", "/tmp/code/{entry_point}"],
+            ("python3", "/tmp/code/{entry_point}"),
         )
 
-        return [
-            part.format(entry_point=request.entry_point)
-            for part in template
-        ]
+        return list(_format_exec_command(template, request.entry_point))
 
     async def _run_exec(
         self,
@@ -311,56 +522,95 @@ class LocalDockerExecutor(BaseExecutor):
         environment: dict,
     ) -> tuple[int, tuple[str, str]]:
         """Run command in container"""
-        # Build environment string
-        env_list = [f"{k}={v}" for k, v in environment.items()]
-
-        result = await asyncio.to_thread(
-            container.container.exec_run,
-            cmd,
-            environment=env_list if env_list else None,
-            stdin=stdin is not None,
-            demux=True,
-        )
-
-        exit_code = result.exit_code
-        output = result.output
-
-        if output:
-            stdout = output[0].decode("utf-8", errors="replace") if output[0] else ""
-            stderr = output[1].decode("utf-8", errors="replace") if output[1] else ""
+        shell = await self._get_shell(container)
+        if shell is not None:
+            if environment:
+                cmd = ["env", *(f"{k}={v}" for k, v in environment.items()), *cmd]
+            exit_code, stdout, stderr = await shell.run(shlex.join(cmd), stdin=stdin)
         else:
-            stdout, stderr = "", ""
+            exit_code, stdout, stderr = await run_exec(
+                self.docker_client.api,
+                container.container.id,
+                cmd,
+                stdin=stdin.encode("utf-8") if stdin is not None else None,
+                environment=environment or None,
+            )
 
-        return exit_code, (stdout, stderr)
+        return exit_code, (
+            stdout.decode("utf-8", errors="replace"),
+            stderr.decode("utf-8", errors="replace"),
+        )
 
     async def _reset_container(self, container: WarmContainer) -> None:
         """Reset container state for reuse"""
         container.mark_resetting()
+        await self._clear_container(container)
 
-        # Clean up code files
-        await asyncio.to_thread(
-            container.container.exec_run,
-            ["rm", "-rf", "/tmp/code"],
-        )
+    async def _clear_container(self, container: WarmContainer) -> None:
+        """
+        Kill anything left of the user code and clean up code files.
 
-        # Kill any remaining processes (except the main tail process)
-        await asyncio.to_thread(
-            container.container.exec_run,
-            ["pkill", "-9", "-f", "python|node|go|java|rustc"],
-        )
+        Raises:
+            asyncio.TimeoutError: If the reset doesn't finish in time (the
+                shell, if used, is closed; the container must not be reused)
+        """
+        shell = await self._get_shell(container)
+        if shell is not None:
+            reset = shell.run(RESET_SCRIPT)
+        else:
+            reset = run_exec(
+                self.docker_client.api,
+                container.container.id,
+                ["sh", "-c", RESET_SCRIPT],
+            )
+        await asyncio.wait_for(reset, RESET_TIMEOUT_SECONDS)
+
+    async def _get_shell(self, container: WarmContainer) -> Optional[ContainerShell]:
+        """
+        Get the container's persistent shell, opening it if needed.
+
+        Returns None when persistent shells are disabled or can't be opened,
+        in which case commands fall back to one docker exec each. Only an
+        unsupported transport disables them; other failures fall back for
+        this call and the shell is opened again next time.
+        """
+        if not self.persistent_shell:
+            return None
+
+        shell = container.shell
+        if shell is None or shell.closed:
+            try:
+                shell = container.shell = await ContainerShell.open(
+                    self.docker_client.api, container.container.id
+                )
+            except UnsupportedTransportError as e:
+                logger.warning(f"Persistent shell unavailable, using docker exec: {e}")
+                self.persistent_shell = False
+                return None
+            except (ShellError, docker.errors.DockerException, OSError) as e:
+                logger.warning(f"Failed to open shell in {container.id}, using docker exec: {e}")
+                return None
+        return shell
 
     async def _kill_container_processes(self, container: WarmContainer) -> None:
         """Kill all user processes in container"""
         try:
-            await asyncio.to_thread(
-                container.container.exec_run,
-                ["pkill", "-9", "-f", "."],
+            # The shell (if any) was closed by the timeout, so use an exec
+            await run_exec(
+                self.docker_client.api,
+                container.container.id,
+                ["sh", "-c", KILL_USER_SCRIPT],
             )
         except Exception:
             pass
 
-    def _update_metrics(self, execution_time_ms: float, success: bool) -> None:
-        """Update execution metrics"""
+    def _update_metrics(
+        self,
+        execution_time_ms: float,
+        success: bool,
+        now_ns: Optional[int] = None,
+    ) -> None:
+        """Update execution metrics (now_ns: completion time, if already known)"""
         self._metrics.total_executions += 1
 
         if success:
@@ -368,42 +618,104 @@ class LocalDockerExecutor(BaseExecutor):
         else:
             self._metrics.failed_executions += 1
 
-        # Track execution times for percentile calculation
-        self._execution_times.append(execution_time_ms)
+        # Keep a running sum over the window so the average is O(1)
+        times = self._execution_times
+        evicted = times[0] if len(times) == times.maxlen else None
+        if evicted is not None:
+            self._execution_times_sum -= evicted
+        times.append(execution_time_ms)
+        self._execution_times_sum += execution_time_ms
 
-        # Keep only last 1000 samples
-        if len(self._execution_times) > 1000:
-            self._execution_times = self._execution_times[-1000:]
+        # Percentiles come from a histogram instead of sorting the window
+        self._latency.record(execution_time_ms)
 
-        # Update timing stats
-        if self._execution_times:
-            self._metrics.avg_execution_time_ms = (
-                sum(self._execution_times) / len(self._execution_times)
-            )
-            self._metrics.min_execution_time_ms = min(self._execution_times)
-            self._metrics.max_execution_time_ms = max(self._execution_times)
+        metrics = self._metrics
+        metrics.avg_execution_time_ms = self._execution_times_sum / len(times)
 
-            sorted_times = sorted(self._execution_times)
-            n = len(sorted_times)
-            self._metrics.p50_execution_time_ms = sorted_times[n // 2]
-            self._metrics.p95_execution_time_ms = sorted_times[int(n * 0.95)]
-            self._metrics.p99_execution_time_ms = sorted_times[int(n * 0.99)]
+        # Min/max only need a rescan when the evicted sample was the extreme
+        if len(times) == 1:
+            metrics.min_execution_time_ms = metrics.max_execution_time_ms = execution_time_ms
+        else:
+            if evicted == metrics.min_execution_time_ms:
+                metrics.min_execution_time_ms = min(times)
+            elif execution_time_ms < metrics.min_execution_time_ms:
+                metrics.min_execution_time_ms = execution_time_ms
+            if evicted == metrics.max_execution_time_ms:
+                metrics.max_execution_time_ms = max(times)
+            elif execution_time_ms > metrics.max_execution_time_ms:
+                metrics.max_execution_time_ms = execution_time_ms
 
         # Update timestamps
-        now = datetime.now(timezone.utc)
-        if self._metrics.first_execution_at is None:
-            self._metrics.first_execution_at = now
-        self._metrics.last_execution_at = now
+        if now_ns is None:
+            now_ns = time.time_ns()
+        if self._first_execution_ns is None:
+            self._first_execution_ns = now_ns
+        self._last_execution_ns = now_ns
+
+        self._metrics.update_ratios()
 
     async def warm_up(self, runtime: Runtime, count: int = 1) -> int:
         """Pre-warm containers for a runtime"""
-        return await self.pool_manager.warm_up(runtime, count)
+        return await self._coalescer.call(
+            ("warm_up", runtime, count),
+            lambda: self.pool_manager.warm_up(runtime, count),
+        )
+
+    async def autoscale_warm_pool(self) -> Dict[Runtime, int]:
+        """
+        Grow runtime pools to match recent demand.
+
+        Each runtime's arrival rate is an EWMA over autoscale passes; the
+        pool it needs is estimated with Little's law (rate times average
+        execution time), clamped to [1, pool_size_per_runtime]. Pools are
+        only grown here - idle containers are retired by the pool manager.
+
+        Returns:
+            Number of containers created per runtime
+        """
+        now = time.monotonic()
+        elapsed = max(now - self._last_autoscale_at, 1.0)
+        self._last_autoscale_at = now
+        arrivals, self._arrivals = self._arrivals, {}
+
+        avg_seconds = self._metrics.avg_execution_time_ms / 1000
+        max_size = self.pool_manager.pool_size_per_runtime
+        warmed: Dict[Runtime, int] = {}
+
+        for runtime in self._arrival_rates.keys() | arrivals.keys():
+            rate = (
+                ARRIVAL_RATE_ALPHA * arrivals.get(runtime, 0) / elapsed
+                + (1 - ARRIVAL_RATE_ALPHA) * self._arrival_rates.get(runtime, 0.0)
+            )
+            if rate < MIN_ARRIVAL_RATE:
+                self._arrival_rates.pop(runtime, None)
+                continue
+            self._arrival_rates[runtime] = rate
+
+            target = min(max(math.ceil(rate * avg_seconds), 1), max_size)
+            current = (await self.pool_manager.get_status(runtime)).total
+            if target > current:
+                warmed[runtime] = await self.warm_up(runtime, target - current)
+
+        return warmed
+
+    async def _autoscale_loop(self) -> None:
+        """Run autoscale_warm_pool on a fixed interval"""
+        while True:
+            await asyncio.sleep(AUTOSCALE_INTERVAL_SECONDS)
+            try:
+                await self.autoscale_warm_pool()
+            except Exception as e:
+                logger.warning(f"Warm pool autoscale failed: {e}")
 
     async def health_check(self) -> HealthStatus:
         """Check executor health"""
         try:
             # Check Docker connectivity
-            self.docker_client.ping()
+            await self._coalescer.call(
+                "ping",
+                lambda: asyncio.to_thread(self.docker_client.ping),
+            )
 
             # Get pool status
             pool_status = await self.pool_manager.get_status()
@@ -433,9 +745,21 @@ class LocalDockerExecutor(BaseExecutor):
     async def cleanup(self) -> None:
         """Cleanup all resources"""
         logger.info("Cleaning up LocalDockerExecutor")
+        if self._autoscale_task is not None:
+            self._autoscale_task.cancel()
+            self._autoscale_task = None
         await self.pool_manager.stop()
         logger.info("LocalDockerExecutor cleaned up")
 
     async def get_metrics(self) -> ExecutorMetrics:
         """Get execution metrics"""
-        return self._metrics
+        metrics = self._metrics
+        (
+            metrics.p50_execution_time_ms,
+            metrics.p95_execution_time_ms,
+            metrics.p99_execution_time_ms,
+        ) = self._latency.percentiles(0.5, 0.95, 0.99)
+        if self._last_execution_ns is not None:
+            metrics.first_execution_at = _datetime_from_ns(self._first_execution_ns)
+            metrics.last_execution_at = _datetime_from_ns(self._last_execution_ns)
+        return metrics
@@ -1,25 +1,35 @@
 """
 Executor Provider Registry
 
-Singleton registry for managing execution providers.
+Process-wide registry for managing execution providers.
 Supports fallback chains for high availability.
 """
 
+import asyncio
 import logging
-from typing import Dict, List, Optional
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
 
 from .interface import BaseExecutor, ExecutorProvider
-from .models import ExecutionRequest, ExecutionResult
+from .models import ExecutionRequest, ExecutionResult, HealthStatus
 from .exceptions import ExecutorNotFoundError, ExecutorNotAvailableError
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Provider health is reused across requests; once stale it is still used
+# while a refresh runs in the background
+HEALTH_CACHE_TTL_SECONDS = 10.0
+
 
 class ExecutorRegistry:
     """
-    Singleton registry for executor providers.
+    Process-wide registry for executor providers.
 
-    Manages provider registration, lookup, and fallback chains.
+    Manages provider registration, lookup, and fallback chains. All state
+    lives on the class and is used through classmethods; the class is
+    never instantiated.
 
     Example:
         # Register providers
@@ -34,16 +44,18 @@ class ExecutorRegistry:
         result = await ExecutorRegistry.execute_with_fallback(request)
     """
 
-    _instance: Optional["ExecutorRegistry"] = None
     _executors: Dict[ExecutorProvider, BaseExecutor] = {}
     _default_provider: ExecutorProvider = ExecutorProvider.LOCAL_DOCKER
     _fallback_chain: List[ExecutorProvider] = []
     _initialized: bool = False
-
-    def __new__(cls) -> "ExecutorRegistry":
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
+    # Bumped whenever the set of registered providers changes
+    _generation: int = 0
+    # Registered (provider, executor) pairs in fallback order (default, then
+    # fallback chain), rebuilt on configuration changes so requests only read it
+    _ordered_executors: Tuple[Tuple[ExecutorProvider, BaseExecutor], ...] = ()
+    # Last health status per provider, as (monotonic time, status)
+    _health: Dict[ExecutorProvider, Tuple[float, HealthStatus]] = {}
+    _health_refreshes: Dict[ExecutorProvider, asyncio.Task] = {}
 
     @classmethod
     def register(cls, provider: ExecutorProvider, executor: BaseExecutor) -> None:
@@ -55,6 +67,9 @@ class ExecutorRegistry:
             executor: Executor instance
         """
         cls._executors[provider] = executor
+        cls._health.pop(provider, None)
+        cls._generation += 1
+        cls._refresh_ordered_executors()
         logger.info(f"Registered executor for provider: {provider.value}")
 
     @classmethod
@@ -67,6 +82,9 @@ class ExecutorRegistry:
         """
         if provider in cls._executors:
             del cls._executors[provider]
+            cls._health.pop(provider, None)
+            cls._generation += 1
+            cls._refresh_ordered_executors()
             logger.info(f"Unregistered executor for provider: {provider.value}")
 
     @classmethod
@@ -112,6 +130,7 @@ class ExecutorRegistry:
             provider: Provider to use as default
         """
         cls._default_provider = provider
+        cls._refresh_ordered_executors()
         logger.info(f"Set default provider: {provider.value}")
 
     @classmethod
@@ -127,7 +146,8 @@ class ExecutorRegistry:
         Args:
             chain: List of providers to try in order after default fails
         """
-        cls._fallback_chain = chain
+        cls._fallback_chain = list(chain)
+        cls._refresh_ordered_executors()
         logger.info(f"Set fallback chain: {[p.value for p in chain]}")
 
     @classmethod
@@ -135,11 +155,28 @@ class ExecutorRegistry:
         """Get current fallback chain"""
         return cls._fallback_chain.copy()
 
+    @classmethod
+    def _refresh_ordered_executors(cls) -> None:
+        """Rebuild the registered executors in order: default -> fallback chain"""
+        order = dict.fromkeys(
+            provider
+            for provider in (cls._default_provider, *cls._fallback_chain)
+            if provider in cls._executors
+        )
+        cls._ordered_executors = tuple(
+            (provider, cls._executors[provider]) for provider in order
+        )
+
     @classmethod
     def get_available_providers(cls) -> List[ExecutorProvider]:
         """Get list of registered providers"""
         return list(cls._executors.keys())
 
+    @classmethod
+    def get_generation(cls) -> int:
+        """Get counter that changes whenever providers are (un)registered"""
+        return cls._generation
+
     @classmethod
     def is_registered(cls, provider: ExecutorProvider) -> bool:
         """Check if provider is registered"""
@@ -161,30 +198,65 @@ class ExecutorRegistry:
         Raises:
             ExecutorNotAvailableError: If all providers fail
         """
-        # Build provider order: preferred -> default -> fallback chain
-        providers: List[ExecutorProvider] = []
+        return await cls._run_with_fallback(
+            request.preferred_provider,
+            lambda executor: executor.execute(request),
+        )
+
+    @classmethod
+    async def execute_batch_with_fallback(
+        cls,
+        requests: Sequence[ExecutionRequest],
+    ) -> List[ExecutionResult]:
+        """
+        Execute a batch of requests on one provider, with fallback on failure.
 
-        if request.preferred_provider and request.preferred_provider in cls._executors:
-            providers.append(request.preferred_provider)
+        The batch is routed as a whole, using the first request's preferred
+        provider; on failure it is retried in full on the next provider.
 
-        if cls._default_provider not in providers and cls._default_provider in cls._executors:
-            providers.append(cls._default_provider)
+        Args:
+            requests: Execution requests
 
-        for provider in cls._fallback_chain:
-            if provider not in providers and provider in cls._executors:
-                providers.append(provider)
+        Returns:
+            Results in request order
 
-        if not providers:
+        Raises:
+            ExecutorNotAvailableError: If all providers fail
+        """
+        if not requests:
+            return []
+
+        return await cls._run_with_fallback(
+            requests[0].preferred_provider,
+            lambda executor: executor.execute_batch(requests),
+        )
+
+    @classmethod
+    async def _run_with_fallback(
+        cls,
+        preferred: Optional[ExecutorProvider],
+        run: Callable[[BaseExecutor], Awaitable[T]],
+    ) -> T:
+        """Run on the first healthy provider that succeeds"""
+        # Provider order: preferred -> default -> fallback chain
+        executors = cls._ordered_executors
+        if preferred and (not executors or executors[0][0] != preferred):
+            preferred_executor = cls._executors.get(preferred)
+            if preferred_executor is not None:
+                executors = (
+                    (preferred, preferred_executor),
+                    *(entry for entry in executors if entry[0] != preferred),
+                )
+
+        if not executors:
             raise ExecutorNotAvailableError("No executor providers registered")
 
         last_error: Optional[Exception] = None
 
-        for provider in providers:
-            executor = cls._executors[provider]
-
+        for provider, executor in executors:
             try:
                 # Check health first
-                health = await executor.health_check()
+                health = await cls._get_health(provider, executor)
                 if not health.healthy:
                     logger.warning(
                         f"Provider {provider.value} unhealthy: {health.message}"
@@ -193,22 +265,65 @@ class ExecutorRegistry:
 
                 # Execute
                 logger.debug(f"Executing with provider: {provider.value}")
-                result = await executor.execute(request)
-                return result
+                return await run(executor)
 
             except Exception as e:
                 logger.warning(
                     f"Provider {provider.value} failed: {e}",
                     exc_info=True,
                 )
+                # Re-check before the next request relies on this provider
+                cls._health.pop(provider, None)
                 last_error = e
                 continue
 
         raise ExecutorNotAvailableError(
-            f"All providers failed. Tried: {[p.value for p in providers]}",
+            f"All providers failed. Tried: {[p.value for p, _ in executors]}",
             last_error=last_error,
         )
 
+    @classmethod
+    async def _get_health(
+        cls,
+        provider: ExecutorProvider,
+        executor: BaseExecutor,
+    ) -> HealthStatus:
+        """Get provider health from the cache, refreshing it once stale"""
+        cached = cls._health.get(provider)
+        if cached is None:
+            return await cls._check_health(provider, executor)
+
+        checked_at, health = cached
+        if (
+            time.monotonic() - checked_at > HEALTH_CACHE_TTL_SECONDS
+            and provider not in cls._health_refreshes
+        ):
+            task = asyncio.create_task(cls._check_health(provider, executor))
+            cls._health_refreshes[provider] = task
+            task.add_done_callback(lambda t: cls._finish_health_refresh(provider, t))
+        return health
+
+    @classmethod
+    async def _check_health(
+        cls,
+        provider: ExecutorProvider,
+        executor: BaseExecutor,
+    ) -> HealthStatus:
+        """Run a provider health check and cache the result"""
+        health = await executor.health_check()
+        # Provider may have been replaced while the check ran
+        if cls._executors.get(provider) is executor:
+            cls._health[provider] = (time.monotonic(), health)
+        return health
+
+    @classmethod
+    def _finish_health_refresh(cls, provider: ExecutorProvider, task: asyncio.Task) -> None:
+        """Forget a background health refresh; a failed one drops the cached status"""
+        if cls._health_refreshes.get(provider) is task:
+            del cls._health_refreshes[provider]
+        if task.cancelled() or task.exception() is not None:
+            cls._health.pop(provider, None)
+
     @classmethod
     async def initialize_all(cls) -> None:
         """Initialize all registered executors"""
@@ -243,6 +358,10 @@ class ExecutorRegistry:
     def reset(cls) -> None:
         """Reset registry state (for testing)"""
         cls._executors.clear()
+        cls._generation += 1
         cls._default_provider = ExecutorProvider.LOCAL_DOCKER
-        cls._fallback_chain.clear()
+        cls._fallback_chain = []
+        cls._ordered_executors = ()
+        cls._health.clear()
+        cls._health_refreshes.clear()
         cls._initialized = False
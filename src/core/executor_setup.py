@@ -13,12 +13,7 @@ from .executor import (
     ExecutorRegistry,
     UnifiedExecutorClient,
 )
-from .executor.providers import (
-    LocalDockerExecutor,
-    AWSLambdaExecutor,
-    GCPCloudRunExecutor,
-    AzureContainerExecutor,
-)
+from .executor import providers  # provider modules load on first use
 
 logger = logging.getLogger(__name__)
 
@@ -42,13 +37,14 @@ async def setup_executors(settings: Settings = None) -> UnifiedExecutorClient:
     if settings.warm_pool_enabled:
         logger.info("Setting up Local Docker Executor with Warm Pool")
 
-        local_executor = LocalDockerExecutor(
+        local_executor = providers.LocalDockerExecutor(
             pool_size_per_runtime=settings.warm_pool_size_per_runtime,
             max_idle_time_seconds=settings.warm_pool_max_idle_time,
             container_ttl_seconds=settings.warm_pool_container_ttl,
             health_check_interval_seconds=settings.warm_pool_health_check_interval,
             memory_limit=settings.max_memory,
             cpu_limit=settings.max_cpu,
+            predictive_warmup=settings.warm_pool_predictive_warmup,
         )
 
         ExecutorRegistry.register(ExecutorProvider.LOCAL_DOCKER, local_executor)
@@ -59,9 +55,11 @@ async def setup_executors(settings: Settings = None) -> UnifiedExecutorClient:
         logger.info("Setting up AWS Lambda Executor")
 
         try:
-            lambda_executor = AWSLambdaExecutor(
+            lambda_executor = providers.AWSLambdaExecutor(
                 region=settings.aws_lambda_region,
                 function_prefix=settings.aws_lambda_function_prefix,
+                predictive_warmup=settings.aws_lambda_predictive_warmup,
+                s3_staging_bucket=settings.aws_lambda_s3_staging_bucket,
             )
             ExecutorRegistry.register(ExecutorProvider.AWS_LAMBDA, lambda_executor)
             logger.info("AWS Lambda Executor registered")
@@ -73,7 +71,7 @@ async def setup_executors(settings: Settings = None) -> UnifiedExecutorClient:
         logger.info("Setting up GCP Cloud Run Executor")
 
         try:
-            gcp_executor = GCPCloudRunExecutor(
+            gcp_executor = providers.GCPCloudRunExecutor(
                 project_id=settings.gcp_project_id,
                 region=settings.gcp_region,
                 job_prefix=settings.gcp_job_prefix,
@@ -92,7 +90,7 @@ async def setup_executors(settings: Settings = None) -> UnifiedExecutorClient:
         logger.info("Setting up Azure Container Apps Executor")
 
         try:
-            azure_executor = AzureContainerExecutor(
+            azure_executor = providers.AzureContainerExecutor(
                 subscription_id=settings.azure_subscription_id,
                 resource_group=settings.azure_resource_group,
                 job_prefix=settings.azure_job_prefix,
@@ -0,0 +1,57 @@
+"""
+Docker Call Coalescer
+
+Shares one Docker daemon call between identical concurrent callers.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class DockerCallCoalescer:
+    """
+    Single-flight deduplication of Docker calls.
+
+    The first caller for a key starts the call; callers arriving with the
+    same key while it is in flight await the same result. The key is
+    dropped once the call completes, so later callers start a fresh call.
+    The shared call runs as its own task, so one caller being cancelled
+    doesn't cancel it for the others.
+
+    Example:
+        coalescer = DockerCallCoalescer()
+        await coalescer.call("ping", lambda: asyncio.to_thread(client.ping))
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, "asyncio.Task[Any]"] = {}
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def call(self, key: Hashable, coro_factory: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run a call, or join an identical one already in flight.
+
+        Args:
+            key: Identifies identical calls
+            coro_factory: Starts the call; only invoked if none is in flight
+
+        Returns:
+            Result of the shared call
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(coro_factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: "asyncio.Task[Any]") -> None:
+        """Forget a completed call"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the outcome retrieved even when every caller was cancelled
+        task.cancelled() or task.exception()
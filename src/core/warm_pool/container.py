@@ -12,6 +12,8 @@ from typing import Optional
 
 from docker.models.containers import Container
 
+from .shell import ContainerShell
+
 
 class ContainerState(str, Enum):
     """Container state in the warm pool"""
@@ -24,7 +26,7 @@ class ContainerState(str, Enum):
     TERMINATING = "terminating"  # Being terminated
 
 
-@dataclass
+@dataclass(slots=True)
 class WarmContainer:
     """
     Wrapper for a Docker container in the warm pool.
@@ -41,6 +43,8 @@ class WarmContainer:
 
     # State
     state: ContainerState = ContainerState.CREATING
+    # Set once a replacement was created ahead of TTL expiry
+    replaced: bool = False
 
     # Timestamps
     created_at: float = field(default_factory=time.time)
@@ -56,6 +60,9 @@ class WarmContainer:
     consecutive_failures: int = 0
     last_error: Optional[str] = None
 
+    # Persistent shell used to run commands, opened on first use
+    shell: Optional[ContainerShell] = field(default=None, repr=False)
+
     def __post_init__(self):
         if not self.container_id:
             self.container_id = self.container.id[:12]
@@ -77,6 +77,7 @@ class PoolHealthChecker:
         while self._running:
             try:
                 await self._check_all_containers()
+                await self.pool_manager.pre_replace_aging()
                 await asyncio.sleep(self.check_interval)
             except asyncio.CancelledError:
                 break
@@ -124,9 +125,11 @@ class PoolHealthChecker:
         """
         from .container import ContainerState
 
-        # Skip containers that are busy or already unhealthy
+        # Skip containers that are busy or already unhealthy (a reset kills
+        # every process in the container, health check included)
         if container.state in (
             ContainerState.BUSY,
+            ContainerState.RESETTING,
             ContainerState.UNHEALTHY,
             ContainerState.TERMINATING,
         ):
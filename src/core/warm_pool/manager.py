@@ -19,6 +19,11 @@ from ..executor.models import PoolStatus
 
 logger = logging.getLogger(__name__)
 
+# Containers past this fraction of their TTL get a replacement created in
+# the background, a few at a time per runtime, before they are retired
+PRE_REPLACE_AGE_FRACTION = 0.95
+MAX_PRE_REPLACEMENTS_PER_RUNTIME = 3
+
 
 class WarmPoolManager:
     """
@@ -205,7 +210,9 @@ class WarmPoolManager:
         """
         async with self._locks[runtime]:
             # Check if container should be replaced
-            if container.should_replace(self.container_ttl, self.max_idle_time):
+            if container.replaced or container.should_replace(
+                self.container_ttl, self.max_idle_time
+            ):
                 logger.info(f"Replacing container {container.id} (TTL/idle)")
                 await self._remove_container(container, runtime)
                 return
@@ -227,6 +234,47 @@ class WarmPoolManager:
             self._pools[runtime].append(container)
             logger.debug(f"Added container {container.id} to {runtime.value} pool")
 
+    async def pre_replace_aging(self) -> int:
+        """
+        Create replacements for containers nearing their TTL.
+
+        Once its replacement is in the pool, an aging container is retired
+        right away if idle, or on release if busy, so TTL expiry never
+        leaves a request waiting for a new container.
+
+        Returns:
+            Number of replacement containers created
+        """
+        threshold = self.container_ttl * PRE_REPLACE_AGE_FRACTION
+        total_created = 0
+
+        for runtime, pool in list(self._pools.items()):
+            aging = [
+                c for c in pool
+                if not c.replaced
+                and c.state not in (ContainerState.UNHEALTHY, ContainerState.TERMINATING)
+                and c.age_seconds > threshold
+            ][:MAX_PRE_REPLACEMENTS_PER_RUNTIME]
+            if not aging:
+                continue
+
+            for container in aging:
+                container.replaced = True
+            created = await self._create_containers(runtime, len(aging))
+            # Containers left without a replacement are retried next pass
+            for container in aging[created:]:
+                container.replaced = False
+
+            async with self._locks[runtime]:
+                for container in aging[:created]:
+                    if container.state == ContainerState.WARM:
+                        await self._remove_container(container, runtime)
+
+            logger.info(f"Pre-replaced {created} aging containers for {runtime.value}")
+            total_created += created
+
+        return total_created
+
     async def get_status(self, runtime: Optional[Runtime] = None) -> PoolStatus:
         """
         Get pool status.
@@ -340,6 +388,8 @@ class WarmPoolManager:
     ) -> None:
         """Remove and cleanup a container"""
         container.mark_terminating()
+        if container.shell is not None:
+            container.shell.close()
 
         if from_pool:
             try:
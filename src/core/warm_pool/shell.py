@@ -0,0 +1,288 @@
+"""
+Container Shell
+
+Long-running shell inside a warm container, so commands are written to an
+already-attached exec socket instead of each paying a docker exec round trip.
+One-off execs are driven over the same kind of raw socket by run_exec().
+"""
+
+import asyncio
+import base64
+import secrets
+import socket
+import struct
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+
+from docker.utils.socket import consume_socket_output, frames_iter
+
+# Multiplexed (non-TTY) exec stream: stream id, 3 pad bytes, payload size
+FRAME_HEADER = struct.Struct(">BxxxL")
+STDOUT = 1
+STDERR = 2
+
+SHELL_COMMAND = ["sh"]
+RECV_SIZE = 64 * 1024
+
+# A new shell must answer a no-op command within this time
+SHELL_START_TIMEOUT_SECONDS = 10.0
+
+# Command stdin is staged here (under a random name of its own - user code
+# can list /tmp, so it must not reveal the end-marker token), so it reaches
+# the command byte for byte instead of through a heredoc, which always ends
+# in a newline
+STDIN_PATH_PREFIX = "/tmp/.stdin-"
+
+
+def _find_marker(buffer: bytearray, marker: bytes, appended: int) -> Optional[int]:
+    """Find marker in buffer, only searching where the last append could complete it"""
+    index = buffer.find(marker, max(len(buffer) - appended - len(marker) + 1, 0))
+    return None if index == -1 else index
+
+
+def _split_frames(buffer: bytearray, stdout: bytearray, stderr: bytearray) -> None:
+    """Move complete frames out of buffer into stdout/stderr"""
+    offset = 0
+    while len(buffer) - offset >= FRAME_HEADER.size:
+        stream, size = FRAME_HEADER.unpack_from(buffer, offset)
+        start = offset + FRAME_HEADER.size
+        end = start + size
+        if len(buffer) < end:
+            break
+        (stderr if stream == STDERR else stdout).extend(buffer[start:end])
+        offset = end
+    del buffer[:offset]
+
+
+def _read_exec_blocking(sock: Any, raw: Any, stdin: Optional[bytes]) -> Tuple[bytes, bytes]:
+    """Feed stdin and read all exec output on a transport the loop can't drive"""
+    if stdin is not None:
+        raw.sendall(stdin)
+        raw.shutdown(socket.SHUT_WR)
+    stdout, stderr = consume_socket_output(frames_iter(sock, tty=False), demux=True)
+    return stdout or b"", stderr or b""
+
+
+async def run_exec(
+    api: Any,
+    container_id: str,
+    cmd: Sequence[str],
+    stdin: Optional[bytes] = None,
+    environment: Optional[Dict[str, str]] = None,
+) -> Tuple[int, bytes, bytes]:
+    """
+    Run a one-off command in a container and wait for it to finish.
+
+    Only the exec create/start/inspect API calls go to a worker thread;
+    input and output move over the attached socket on the event loop, so
+    a long-running command doesn't hold a thread for its whole run.
+
+    Args:
+        api: Low-level Docker API client
+        container_id: Container to run the command in
+        cmd: Command and arguments
+        stdin: Bytes fed to the command's stdin (no stdin if None)
+        environment: Extra environment variables
+
+    Returns:
+        Tuple of (exit code, stdout, stderr)
+    """
+
+    def start() -> Tuple[str, Any]:
+        exec_id = api.exec_create(
+            container_id,
+            list(cmd),
+            stdin=stdin is not None,
+            environment=environment,
+        )["Id"]
+        return exec_id, api.exec_start(exec_id, socket=True)
+
+    exec_id, sock = await asyncio.to_thread(start)
+    raw = getattr(sock, "_sock", sock)
+    try:
+        if type(raw) is not socket.socket:
+            stdout, stderr = await asyncio.to_thread(_read_exec_blocking, sock, raw, stdin)
+        else:
+            raw.setblocking(False)
+            loop = asyncio.get_running_loop()
+            if stdin is not None:
+                await loop.sock_sendall(raw, stdin)
+                raw.shutdown(socket.SHUT_WR)
+
+            stdout = bytearray()
+            stderr = bytearray()
+            buffer = bytearray()
+            while chunk := await loop.sock_recv(raw, RECV_SIZE):
+                buffer += chunk
+                _split_frames(buffer, stdout, stderr)
+    finally:
+        raw.close()
+        sock.close()
+
+    exit_code = (await asyncio.to_thread(api.exec_inspect, exec_id))["ExitCode"]
+    return exit_code, bytes(stdout), bytes(stderr)
+
+
+class ShellError(Exception):
+    """Shell could not be started, or exited mid-command"""
+
+
+class UnsupportedTransportError(ShellError):
+    """Docker transport can't carry a persistent shell (permanent)"""
+
+
+class ContainerShell:
+    """
+    Persistent `sh` attached to a container over one exec socket.
+
+    Each command is followed by end markers carrying a random token on both
+    stdout and stderr; output is read off the multiplexed stream until both
+    markers arrive, so user output can't end a command early. Any failure
+    (including cancellation on timeout) closes the shell, since its stream
+    position is then unknown.
+
+    Example:
+        shell = await ContainerShell.open(docker_client.api, container.id)
+        exit_code, stdout, stderr = await shell.run("python3 main.py")
+    """
+
+    def __init__(self, sock: Any, raw: socket.socket):
+        self._sock = sock
+        self._raw = raw
+        self._buffer = bytearray()
+        self._lock = asyncio.Lock()
+        self.closed = False
+
+    @classmethod
+    async def open(cls, api: Any, container_id: str) -> "ContainerShell":
+        """
+        Start a shell in a container and check that it responds.
+
+        Args:
+            api: Low-level Docker API client
+            container_id: Container to start the shell in
+
+        Raises:
+            UnsupportedTransportError: If the Docker transport isn't a plain socket
+            ShellError: If the shell can't be started or doesn't respond
+        """
+
+        def start() -> Any:
+            exec_id = api.exec_create(container_id, SHELL_COMMAND, stdin=True)["Id"]
+            return api.exec_start(exec_id, socket=True)
+
+        sock = await asyncio.to_thread(start)
+        raw = getattr(sock, "_sock", sock)
+        if type(raw) is not socket.socket:
+            # TLS and named-pipe transports can't be driven by the event loop
+            sock.close()
+            raise UnsupportedTransportError(f"Unsupported Docker transport: {type(raw).__name__}")
+
+        raw.setblocking(False)
+        shell = cls(sock, raw)
+        try:
+            await asyncio.wait_for(shell.run("true"), SHELL_START_TIMEOUT_SECONDS)
+        except (ShellError, OSError, asyncio.TimeoutError) as e:
+            shell.close()
+            raise ShellError(f"Shell did not respond: {e!r}") from e
+        return shell
+
+    async def run(
+        self,
+        command: str,
+        stdin: Optional[Union[str, bytes]] = None,
+    ) -> Tuple[int, bytes, bytes]:
+        """
+        Run a shell command and wait for it to finish.
+
+        Args:
+            command: Shell command line
+            stdin: Text or bytes fed unchanged to the command's stdin
+                (/dev/null if None)
+
+        Returns:
+            Tuple of (exit code, stdout, stderr)
+
+        Raises:
+            ShellError: If the shell is closed or exits
+        """
+        if self.closed:
+            raise ShellError("Shell is closed")
+
+        token = secrets.token_hex(16)
+        if stdin is None:
+            script = f"{{ {command}\n}} </dev/null\n"
+        else:
+            path = f"{STDIN_PATH_PREFIX}{secrets.token_hex(16)}"
+            if isinstance(stdin, str):
+                stdin = stdin.encode("utf-8")
+            encoded = base64.b64encode(stdin).decode("ascii")
+            script = (
+                f"base64 -d >{path} <<'{token}'\n{encoded}\n{token}\n"
+                f"{{ {command}\n}} <{path}\n"
+                f'set -- "$?"; rm -f {path}; (exit "$1")\n'
+            )
+        script += f"printf '%s:%d\\n' {token} \"$?\"; printf '%s\\n' {token} >&2\n"
+
+        async with self._lock:
+            try:
+                loop = asyncio.get_running_loop()
+                await loop.sock_sendall(self._raw, script.encode("utf-8"))
+                return await self._read_result(loop, token.encode("ascii"))
+            except BaseException:
+                self.close()
+                raise
+
+    async def _read_result(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        token: bytes,
+    ) -> Tuple[int, bytes, bytes]:
+        """Read output frames until both end markers have arrived"""
+        stdout = bytearray()
+        stderr = bytearray()
+        stdout_marker = token + b":"
+        stderr_marker = token + b"\n"
+        stdout_end: Optional[int] = None
+        stderr_end: Optional[int] = None
+        exit_code: Optional[int] = None
+
+        while exit_code is None or stderr_end is None:
+            stream, size = FRAME_HEADER.unpack(await self._read_exactly(loop, FRAME_HEADER.size))
+            data = await self._read_exactly(loop, size)
+
+            if stream == STDERR:
+                stderr += data
+                if stderr_end is None:
+                    stderr_end = _find_marker(stderr, stderr_marker, len(data))
+            else:
+                stdout += data
+                if stdout_end is None:
+                    stdout_end = _find_marker(stdout, stdout_marker, len(data))
+                if stdout_end is not None:
+                    # Marker line is "<token>:<exit code>\n"
+                    line_end = stdout.find(b"\n", stdout_end)
+                    if line_end != -1:
+                        code_start = stdout_end + len(stdout_marker)
+                        exit_code = int(stdout[code_start:line_end])
+
+        return exit_code, bytes(stdout[:stdout_end]), bytes(stderr[:stderr_end])
+
+    async def _read_exactly(self, loop: asyncio.AbstractEventLoop, size: int) -> bytes:
+        """Read exactly size bytes from the socket"""
+        while len(self._buffer) < size:
+            chunk = await loop.sock_recv(self._raw, RECV_SIZE)
+            if not chunk:
+                raise ShellError("Shell exited")
+            self._buffer += chunk
+
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def close(self) -> None:
+        """Close the exec socket; the shell exits on end of input"""
+        if self.closed:
+            return
+        self.closed = True
+        self._raw.close()
+        self._sock.close()
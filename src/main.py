@@ -81,11 +81,27 @@ async def lifespan(app: FastAPI):
                 except Exception as e:
                     logger.warning(f"Failed to pull {image}: {e}")
 
+    # Pre-boot plugin-runner containers
+    if settings.plugin_runner_warm_pool > 0:
+        try:
+            from api import plugin_execute
+            warm = await plugin_execute.plugin_runner.ensure_warm(settings.plugin_runner_warm_pool)
+            logger.info(f"Plugin runner warm pool ready: {warm} containers")
+        except Exception as e:
+            logger.warning(f"Failed to warm plugin runner pool: {e}")
+
     yield
 
     # Shutdown
     logger.info("Shutting down sandbox service")
 
+    # Remove warm plugin-runner containers
+    try:
+        from api import plugin_execute
+        await plugin_execute.plugin_runner.shutdown()
+    except Exception:
+        pass
+
     # Shutdown PostHog client
     from core.posthog_client import PostHogClient
     PostHogClient.shutdown()
@@ -236,6 +252,8 @@ def main():
         port=settings.port,
         reload=settings.debug,
         workers=settings.workers if not settings.debug else 1,
+        # uvloop where available (not on Windows), for faster Docker socket IO
+        loop="auto",
         log_level="info" if not settings.debug else "debug",
     )
 
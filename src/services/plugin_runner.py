@@ -2,20 +2,61 @@
 Plugin Runner Service - Manages plugin execution in Docker containers
 """
 import asyncio
-import json
 import logging
+import socket
+import struct
 import time
-from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import docker
-from docker.errors import DockerException, ImageNotFound, ContainerError
+import orjson
+from docker.errors import DockerException, ImageNotFound
+from docker.models.containers import Container
+from docker.utils.socket import consume_socket_output, frames_iter
 
 from core.config import get_settings
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+RUNNER_IMAGE = "nadoo-plugin-runner:latest"
+
+# Warm containers idle until a plugin run is exec'd into them
+IDLE_COMMAND = ["sleep", "infinity"]
+WRAPPER_COMMAND = ["python", "/plugin/wrapper.py"]
+
+# Wrapper I/O frame: 4-byte little-endian payload length + payload
+FRAME_HEADER = struct.Struct("<I")
+
+
+def _frame_input(config: Dict[str, Any], code: str) -> bytes:
+    """Build wrapper stdin: <len><config JSON><len><code>"""
+    config_bytes = orjson.dumps(config)
+    code_bytes = code.encode("utf-8")
+    return b"".join((
+        FRAME_HEADER.pack(len(config_bytes)),
+        config_bytes,
+        FRAME_HEADER.pack(len(code_bytes)),
+        code_bytes,
+    ))
+
+
+def _unframe_output(output: Any) -> Any:
+    """Strip the wrapper's length prefix from container output, if present"""
+    if not isinstance(output, (bytes, bytearray)):
+        return output
+
+    view = memoryview(output)
+    header_size = FRAME_HEADER.size
+    if len(view) >= header_size:
+        (length,) = FRAME_HEADER.unpack_from(view)
+        if length == len(view) - header_size:
+            # Slice the view rather than copying the payload
+            return view[header_size:]
+
+    # Unframed output (older runner image)
+    return view
+
 
 class PluginRunner:
     """Manages plugin execution in sandboxed Docker containers"""
@@ -30,22 +71,151 @@ class PluginRunner:
             logger.error(f"Failed to initialize Docker client: {e}")
             raise
 
+        # Pre-booted containers, created with the default memory limit
+        self._warm_pool: List[Container] = []
+        self._warm_target = 0
+        self._warm_memory_limit = settings.max_memory
+        self._replenish_task: Optional[asyncio.Task] = None
+        self._background_tasks: Set[asyncio.Task] = set()
+
+        self.pool_hits = 0
+        self.pool_misses = 0
+
         # Ensure plugin-runner image exists
         self._ensure_runner_image()
 
     def _ensure_runner_image(self):
         """Ensure plugin-runner image exists"""
         try:
-            self.client.images.get("nadoo-plugin-runner:latest")
+            self.client.images.get(RUNNER_IMAGE)
             logger.info("Plugin runner image found")
         except ImageNotFound:
             logger.warning("Plugin runner image not found. Build it with: cd sandbox && ./scripts/build.sh")
             # Don't raise - we'll handle it at execution time
 
+    def _container_config(self, memory_limit: str) -> Dict[str, Any]:
+        """Build configuration for an idle plugin-runner container"""
+        return {
+            'image': RUNNER_IMAGE,
+            'command': IDLE_COMMAND,
+            'network_mode': 'none',  # No network access
+            'mem_limit': memory_limit,
+            'memswap_limit': memory_limit,  # Disable swap
+            'cpu_quota': int(0.5 * 100000),  # 0.5 CPU
+            'cpu_period': 100000,
+            'pids_limit': 50,  # Max 50 processes
+            'security_opt': ['no-new-privileges'],
+            'cap_drop': ['ALL'],  # Drop all capabilities
+            'read_only': True,  # Read-only root filesystem
+            'tmpfs': {
+                '/tmp': 'size=10M,mode=1777',  # 10MB temp space
+            },
+            'detach': True,
+        }
+
+    async def _boot_container(self, memory_limit: str) -> Container:
+        """Start an idle plugin-runner container"""
+        return await asyncio.to_thread(
+            self.client.containers.run,
+            **self._container_config(memory_limit)
+        )
+
+    async def ensure_warm(self, count: int) -> int:
+        """
+        Boot containers until the warm pool holds `count` of them
+
+        Args:
+            count: Target number of warm containers
+
+        Returns:
+            Number of warm containers available
+        """
+        self._warm_target = count
+        missing = count - len(self._warm_pool)
+        if missing <= 0:
+            return len(self._warm_pool)
+
+        results = await asyncio.gather(
+            *(self._boot_container(self._warm_memory_limit) for _ in range(missing)),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning(f"Failed to warm plugin runner container: {result}")
+            else:
+                self._warm_pool.append(result)
+
+        return len(self._warm_pool)
+
+    def _schedule_replenish(self) -> None:
+        """Top the warm pool back up in the background"""
+        if self._replenish_task is None or self._replenish_task.done():
+            self._replenish_task = asyncio.create_task(self.ensure_warm(self._warm_target))
+
+    async def acquire_container(self, memory_limit: str) -> Container:
+        """
+        Get a running container for one plugin execution
+
+        Warm containers are used when the memory limit matches the pool's;
+        otherwise a container is booted on demand.
+
+        Args:
+            memory_limit: Memory limit (e.g., '256m')
+
+        Returns:
+            Running plugin-runner container
+        """
+        if memory_limit == self._warm_memory_limit and self._warm_pool:
+            self.pool_hits += 1
+            container = self._warm_pool.pop()
+            self._schedule_replenish()
+            return container
+
+        self.pool_misses += 1
+        return await self._boot_container(memory_limit)
+
+    def release_container(self, container: Container) -> None:
+        """
+        Retire a container after its execution
+
+        Containers are single-use so no state leaks between plugins;
+        removal happens in the background, off the response path.
+        """
+        task = asyncio.create_task(self._remove_container(container))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _remove_container(self, container: Container) -> None:
+        """Force-remove a container"""
+        try:
+            await asyncio.to_thread(container.remove, force=True)
+        except DockerException as e:
+            logger.warning(f"Failed to remove plugin container: {e}")
+
+    def _exec_wrapper(self, container: Container, payload: bytes) -> Tuple[int, bytes, bytes]:
+        """
+        Run the wrapper inside container, feeding payload on stdin (blocking)
+
+        Returns:
+            Tuple of (exit code, stdout, stderr)
+        """
+        api = self.client.api
+        exec_id = api.exec_create(container.id, WRAPPER_COMMAND, stdin=True)["Id"]
+        sock = api.exec_start(exec_id, socket=True)
+        try:
+            raw = getattr(sock, "_sock", sock)
+            raw.sendall(payload)
+            raw.shutdown(socket.SHUT_WR)
+            stdout, stderr = consume_socket_output(frames_iter(sock, tty=False), demux=True)
+        finally:
+            sock.close()
+
+        return api.exec_inspect(exec_id)["ExitCode"], stdout or b"", stderr or b""
+
     async def execute(
         self,
-        plugin_dir: str,
-        config_path: str,
+        config: Dict[str, Any],
+        code: str,
         timeout: int = 30,
         memory_limit: str = "256m",
     ) -> Dict[str, Any]:
@@ -53,8 +223,8 @@ class PluginRunner:
         Execute plugin in a sandboxed container
 
         Args:
-            plugin_dir: Directory containing plugin code
-            config_path: Path to config.json
+            config: Execution config passed to the wrapper
+            code: Plugin source code
             timeout: Execution timeout in seconds
             memory_limit: Memory limit (e.g., '256m')
 
@@ -65,9 +235,8 @@ class PluginRunner:
         start_time = time.time()
 
         try:
-            # Verify image exists
             try:
-                self.client.images.get("nadoo-plugin-runner:latest")
+                container = await self.acquire_container(memory_limit)
             except ImageNotFound:
                 return {
                     "success": False,
@@ -75,52 +244,16 @@ class PluginRunner:
                     "details": "Run: cd sandbox && ./scripts/build.sh"
                 }
 
-            # Prepare volume mounts
-            plugin_dir_path = Path(plugin_dir).resolve()
-            config_path_abs = Path(config_path).resolve()
-
-            volumes = {
-                str(plugin_dir_path): {
-                    'bind': '/plugin/code',
-                    'mode': 'ro'  # Read-only
-                },
-                str(config_path_abs): {
-                    'bind': '/plugin/config.json',
-                    'mode': 'ro'  # Read-only
-                }
-            }
-
-            # Container configuration
-            container_config = {
-                'image': 'nadoo-plugin-runner:latest',
-                'volumes': volumes,
-                'network_mode': 'none',  # No network access
-                'mem_limit': memory_limit,
-                'memswap_limit': memory_limit,  # Disable swap
-                'cpu_quota': int(0.5 * 100000),  # 0.5 CPU
-                'cpu_period': 100000,
-                'pids_limit': 50,  # Max 50 processes
-                'security_opt': ['no-new-privileges'],
-                'cap_drop': ['ALL'],  # Drop all capabilities
-                'read_only': True,  # Read-only root filesystem
-                'tmpfs': {
-                    '/tmp': 'size=10M,mode=1777',  # 10MB temp space
-                },
-                'detach': False,
-                'remove': True,  # Auto-remove after execution
-                'stdout': True,
-                'stderr': True,
-            }
+            logger.info(
+                f"Running plugin in container with timeout={timeout}s, memory={memory_limit}"
+            )
 
-            logger.info(f"Starting plugin container with timeout={timeout}s, memory={memory_limit}")
+            payload = _frame_input(config, code)
 
-            # Run container with timeout
+            # Run wrapper with timeout
             try:
-                output = await asyncio.wait_for(
-                    asyncio.to_thread(
-                        self.client.containers.run,
-                        **container_config
-                    ),
+                exit_code, output, stderr = await asyncio.wait_for(
+                    asyncio.to_thread(self._exec_wrapper, container, payload),
                     timeout=timeout + 5  # Add 5s buffer
                 )
             except asyncio.TimeoutError:
@@ -131,18 +264,23 @@ class PluginRunner:
                     "execution_time": time.time() - start_time,
                 }
 
-            # Parse output
-            output_str = output.decode('utf-8') if isinstance(output, bytes) else str(output)
-
             # Try to parse JSON output
             try:
-                result = json.loads(output_str)
-            except json.JSONDecodeError:
-                # If not JSON, treat as raw output
-                logger.warning(f"Container output is not JSON: {output_str[:200]}")
+                result = orjson.loads(_unframe_output(output))
+            except orjson.JSONDecodeError:
+                # If not JSON, the wrapper crashed or was killed (e.g. OOM, 137)
+                output_str = output.decode('utf-8', errors='replace')
+                stderr_str = stderr.decode('utf-8', errors='replace')
+                logger.warning(
+                    f"Container output is not JSON (exit code {exit_code}): {output_str[:200]}"
+                )
                 result = {
                     "success": False,
-                    "error": "Invalid output format",
+                    "error": (
+                        "Invalid output format" if exit_code == 0 else "Container execution error"
+                    ),
+                    "details": stderr_str,
+                    "exit_code": exit_code,
                     "raw_output": output_str,
                 }
 
@@ -152,16 +290,6 @@ class PluginRunner:
             logger.info(f"Plugin execution completed: success={result.get('success')}, time={result['execution_time']:.2f}s")
             return result
 
-        except ContainerError as e:
-            logger.error(f"Container error: {e}")
-            return {
-                "success": False,
-                "error": "Container execution error",
-                "details": str(e),
-                "exit_code": e.exit_status,
-                "execution_time": time.time() - start_time,
-            }
-
         except DockerException as e:
             logger.error(f"Docker error: {e}")
             return {
@@ -181,18 +309,35 @@ class PluginRunner:
             }
 
         finally:
-            # Cleanup container if it's still running
-            if container:
-                try:
-                    container.stop(timeout=1)
-                    container.remove(force=True)
-                except:
-                    pass
+            if container is not None:
+                self.release_container(container)
+
+    def get_pool_status(self) -> Dict[str, int]:
+        """Get warm pool size and hit/miss counters"""
+        return {
+            "warm_containers": len(self._warm_pool),
+            "target_size": self._warm_target,
+            "pool_hits": self.pool_hits,
+            "pool_misses": self.pool_misses,
+        }
+
+    async def shutdown(self) -> None:
+        """Remove warm containers and wait for pending removals"""
+        if self._replenish_task is not None:
+            self._replenish_task.cancel()
+
+        self._warm_target = 0
+        containers, self._warm_pool = self._warm_pool, []
+        await asyncio.gather(
+            *(self._remove_container(container) for container in containers),
+            *self._background_tasks,
+            return_exceptions=True,
+        )
 
     def cleanup_dangling_containers(self):
         """Cleanup any dangling plugin containers"""
         try:
-            filters = {'ancestor': 'nadoo-plugin-runner:latest'}
+            filters = {'ancestor': RUNNER_IMAGE}
             containers = self.client.containers.list(all=True, filters=filters)
 
             for container in containers:
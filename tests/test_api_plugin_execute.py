@@ -0,0 +1,45 @@
+"""
+Tests for the plugin execution API endpoint
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def plugin_client():
+    """Test client for the plugin router, without a Docker daemon"""
+    with patch("docker.from_env", return_value=MagicMock()):
+        from api import plugin_execute
+
+    app = FastAPI()
+    app.include_router(plugin_execute.router)
+    return TestClient(app)
+
+
+def test_execute_plugin_wrong_key_before_validation(plugin_client):
+    """Test authentication runs before the body is validated"""
+    response = plugin_client.post(
+        "/plugin/execute",
+        content=b"not json",
+        headers={"X-API-Key": "wrong-key", "Content-Type": "application/json"},
+    )
+
+    assert response.status_code == 401
+    assert response.json() == {"detail": "Invalid API key"}
+
+
+def test_execute_plugin_invalid_body(plugin_client):
+    """Test an authenticated request with an invalid body is rejected"""
+    from core.config import get_settings
+
+    response = plugin_client.post(
+        "/plugin/execute",
+        json={"tool_name": "search"},
+        headers={"X-API-Key": get_settings().api_key},
+    )
+
+    assert response.status_code == 422
@@ -2,6 +2,11 @@
 Tests for Docker manager
 """
 
+import asyncio
+import io
+import tarfile
+from unittest.mock import AsyncMock, MagicMock, patch
+
 import pytest
 
 
@@ -37,3 +42,152 @@ class TestDockerManager:
         except Exception as e:
             # Docker may not be available in test environment
             pytest.skip(f"Docker not available: {e}")
+
+    def test_pooled_archive_layout(self):
+        """Test pooled archives unpack under /code and /tmp"""
+        from core.docker_manager import _build_archive
+
+        archive = _build_archive({"main.rs": "fn main() {}"}, prefix="code/", program=b"\x7fELF")
+
+        with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+            members = {m.name: m for m in tar.getmembers()}
+            assert set(members) == {"code/main.rs", "tmp/program"}
+            assert members["tmp/program"].mode == 0o755
+            assert tar.extractfile("tmp/program").read() == b"\x7fELF"
+
+    def test_reset_clears_scratch_dirs(self, tmp_path):
+        """Test the reset script removes every entry, including '..' names"""
+        import subprocess
+
+        from core.docker_manager import CLEAR_SCRATCH_SCRIPT, RESET_COMMAND, SCRATCH_DIRS
+
+        for name in ("file", ".hidden", "..c"):
+            (tmp_path / name).write_text("x")
+        (tmp_path / "..dir").mkdir()
+        (tmp_path / "..dir" / "nested").write_text("x")
+
+        subprocess.run(["sh", "-c", CLEAR_SCRATCH_SCRIPT, "sh", str(tmp_path)], check=True)
+
+        assert list(tmp_path.iterdir()) == []
+        assert RESET_COMMAND[-len(SCRATCH_DIRS):] == list(SCRATCH_DIRS)
+
+
+class TestWarmPool:
+    """Tests for WarmPool with a mocked Docker client"""
+
+    @pytest.fixture
+    def run_exec(self):
+        """Patch execs into pooled containers to succeed"""
+        with patch("core.docker_manager.run_exec", new_callable=AsyncMock) as run_exec:
+            run_exec.return_value = (0, b"", b"")
+            yield run_exec
+
+    @pytest.fixture
+    def pool(self):
+        """WarmPool creating a new mock container per miss"""
+        from core.docker_manager import WarmPool
+
+        client = MagicMock()
+        client.containers.run.side_effect = lambda **kwargs: MagicMock()
+        return WarmPool(client, max_idle=2)
+
+    @pytest.mark.asyncio
+    async def test_created_hardened(self, pool, run_exec):
+        """Test pooled containers are read-only, unprivileged and tmpfs-backed"""
+        await pool.acquire("python:3.11-slim")
+
+        kwargs = pool.client.containers.run.call_args.kwargs
+        assert kwargs["read_only"] is True
+        assert kwargs["user"] != "root"
+        assert set(kwargs["tmpfs"]) == {"/code", "/tmp"}
+        assert kwargs["cap_drop"] == ["ALL"]
+        assert kwargs["security_opt"] == ["no-new-privileges"]
+
+    @pytest.mark.asyncio
+    async def test_release_reuses_container(self, pool, run_exec):
+        """Test a reset container is handed out again"""
+        from core.docker_manager import RESET_COMMAND
+
+        container = await pool.acquire("python:3.11-slim")
+        await pool.release("python:3.11-slim", container)
+
+        assert await pool.acquire("python:3.11-slim") is container
+        assert pool.client.containers.run.call_count == 1
+        assert run_exec.call_args.args[2] == RESET_COMMAND
+
+    @pytest.mark.asyncio
+    async def test_release_discards_failed_reset(self, pool, run_exec):
+        """Test a container whose reset fails is removed"""
+        run_exec.return_value = (1, b"", b"find: permission denied")
+        container = await pool.acquire("python:3.11-slim")
+
+        await pool.release("python:3.11-slim", container)
+
+        container.remove.assert_called_once_with(force=True)
+        assert pool._idle_count == 0
+
+
+class TestPooledExecution:
+    """Tests for DockerManager's pooled execution path"""
+
+    @pytest.fixture
+    def manager(self):
+        """DockerManager with a mocked Docker client"""
+        from core.docker_manager import DockerManager
+
+        client = MagicMock()
+        with patch("docker.from_env", return_value=client):
+            return DockerManager(pool_size=2)
+
+    @pytest.mark.asyncio
+    async def test_timeout_discards_container(self, manager):
+        """Test a timed-out container is removed instead of reused"""
+
+        async def hang(*args, **kwargs):
+            await asyncio.sleep(10)
+
+        with patch.object(manager, "_inject_and_exec", side_effect=hang):
+            result = await manager._execute_pooled(
+                "while True: pass", "python", "python:3.11-slim", None, None, 0.01
+            )
+
+        assert result == ("", "Execution timeout exceeded", -1)
+        assert manager.pool._idle_count == 0
+        manager.client.containers.run.return_value.remove.assert_called_once_with(force=True)
+
+    @pytest.mark.asyncio
+    async def test_compiled_program_cached_before_run(self, manager):
+        """Test the program is collected before user code runs, then reused"""
+        from core.docker_manager import COMPILED_PROGRAM, EXTRACT_COMMAND
+
+        calls = []
+
+        async def run_exec(api, container_id, cmd, stdin=None, environment=None):
+            calls.append((cmd, stdin))
+            if cmd == ["cat", COMPILED_PROGRAM]:
+                return 0, b"\x7fELF", b""
+            return 0, b"out" if cmd == ["sh", "-c", COMPILED_PROGRAM] else b"", b""
+
+        with patch("core.docker_manager.run_exec", side_effect=run_exec):
+            first = await manager._execute_pooled(
+                "int main() {}", "cpp", "gcc:13", None, None, 5
+            )
+            first_calls, calls[:] = list(calls), []
+            second = await manager._execute_pooled(
+                "int main() {}", "cpp", "gcc:13", None, None, 5
+            )
+
+        assert first == second == ("out", "", 0)
+
+        commands = [cmd for cmd, _ in first_calls]
+        assert commands.index(["cat", COMPILED_PROGRAM]) < commands.index(
+            ["sh", "-c", COMPILED_PROGRAM]
+        )
+
+        # Cache hit: no compile or collect, the program arrives with the code
+        commands = [cmd for cmd, _ in calls]
+        assert ["cat", COMPILED_PROGRAM] not in commands
+        assert not any("g++" in " ".join(cmd) for cmd in commands)
+        archive = next(stdin for cmd, stdin in calls if cmd == EXTRACT_COMMAND)
+        with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+            assert tar.extractfile("tmp/program").read() == b"\x7fELF"
@@ -2,6 +2,8 @@
 Tests for unified executor client.
 """
 
+import asyncio
+
 import pytest
 
 from core.executor.interface import ExecutorProvider, Runtime
@@ -43,6 +45,71 @@ class TestUnifiedExecutorClient:
         assert request.memory_mb == 128
         assert request.environment == {"KEY": "value"}
 
+    @pytest.mark.asyncio
+    async def test_execute_coalesces_identical_requests(self, mock_executor, reset_registry):
+        """Test identical concurrent requests share one execution."""
+        client = UnifiedExecutorClient(coalesce_identical=True)
+        original_execute = mock_executor.execute
+
+        async def slow_execute(request):
+            await asyncio.sleep(0.01)
+            return await original_execute(request)
+
+        mock_executor.execute = slow_execute
+
+        results = await asyncio.gather(
+            client.execute("print('hello')"),
+            client.execute("print('hello')"),
+            client.execute("print('other')"),
+        )
+
+        assert len(mock_executor.execute_calls) == 2
+        assert all(result.success for result in results)
+        assert results[0].execution_id != results[1].execution_id
+        assert client._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_execute_coalesced_first_caller_cancelled(self, mock_executor, reset_registry):
+        """Test cancelling the first caller doesn't cancel identical waiters."""
+        client = UnifiedExecutorClient(coalesce_identical=True)
+        original_execute = mock_executor.execute
+
+        async def slow_execute(request):
+            await asyncio.sleep(0.01)
+            return await original_execute(request)
+
+        mock_executor.execute = slow_execute
+
+        first = asyncio.create_task(client.execute("print('hello')"))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(client.execute("print('hello')")) for _ in range(2)]
+        await asyncio.sleep(0)
+        first.cancel()
+
+        results = await asyncio.gather(*waiters)
+
+        assert first.cancelled()
+        assert all(result.success for result in results)
+        # One waiter took over the work; the other shared its result
+        assert len(mock_executor.execute_calls) == 1
+        assert client._inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_execute_many(self, mock_executor, reset_registry):
+        """Test batch execution returns results in request order."""
+        from core.executor.models import ExecutionRequest
+
+        client = UnifiedExecutorClient(enable_fallback=False)
+        requests = [
+            ExecutionRequest(code=f"print({i})", runtime=Runtime.PYTHON_311)
+            for i in range(5)
+        ]
+
+        results = await client.execute_many(requests, max_parallel=2)
+
+        assert [r.execution_id for r in results] == [r.execution_id for r in requests]
+        assert len(mock_executor.execute_calls) == 5
+
     @pytest.mark.asyncio
     async def test_execute_python(self, mock_executor, reset_registry):
         """Test Python execution convenience method."""
@@ -142,6 +209,21 @@ class TestUnifiedExecutorClient:
         assert ExecutorProvider.LOCAL_DOCKER in results
         assert results[ExecutorProvider.LOCAL_DOCKER].healthy is True
 
+    @pytest.mark.asyncio
+    async def test_health_check_all_timeout(self, mock_executor, reset_registry):
+        """Test a hanging provider is reported unhealthy."""
+        client = UnifiedExecutorClient(health_check_timeout=0.01)
+
+        async def hang():
+            await asyncio.sleep(10)
+
+        mock_executor.health_check = hang
+
+        results = await client.health_check_all()
+
+        assert results[ExecutorProvider.LOCAL_DOCKER].healthy is False
+        assert results[ExecutorProvider.LOCAL_DOCKER].message == "Health check timed out"
+
     @pytest.mark.asyncio
     async def test_warm_up(self, mock_executor, reset_registry):
         """Test warm up."""
@@ -160,6 +242,19 @@ class TestUnifiedExecutorClient:
 
         assert ExecutorProvider.LOCAL_DOCKER in providers
 
+    def test_get_available_providers_tracks_registry(self, mock_executor, reset_registry):
+        """Test cached providers are refreshed when the registry changes."""
+        from core.executor.registry import ExecutorRegistry
+
+        client = UnifiedExecutorClient()
+        assert client.get_available_providers() == [ExecutorProvider.LOCAL_DOCKER]
+
+        ExecutorRegistry.register(ExecutorProvider.AWS_LAMBDA, mock_executor)
+        assert ExecutorProvider.AWS_LAMBDA in client.get_available_providers()
+
+        ExecutorRegistry.unregister(ExecutorProvider.AWS_LAMBDA)
+        assert client.get_available_providers() == [ExecutorProvider.LOCAL_DOCKER]
+
     def test_is_provider_available(self, mock_executor, reset_registry):
         """Test checking if provider is available."""
         client = UnifiedExecutorClient()
@@ -129,6 +129,15 @@ class TestExecutionRequest:
                 memory_mb=0,
             )
 
+    def test_request_is_immutable(self):
+        """Test request fields cannot be reassigned after validation."""
+        import dataclasses
+
+        request = ExecutionRequest(code="print('hello')", runtime=Runtime.PYTHON_311)
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            request.timeout_ms = 0
+
 
 class TestExecutionResult:
     """Test ExecutionResult model."""
@@ -186,6 +195,22 @@ class TestExecutionResult:
         assert d["provider"] == "local_docker"
         assert d["execution_time_ms"] == 50.0
 
+    def test_result_to_json(self):
+        """Test result JSON encoding matches to_dict."""
+        import orjson
+
+        result = ExecutionResult(
+            success=True,
+            stdout="output",
+            stderr="",
+            exit_code=0,
+            execution_time_ms=50.0,
+            cold_start=False,
+            provider=ExecutorProvider.LOCAL_DOCKER,
+        )
+
+        assert orjson.loads(result.to_json()) == result.to_dict()
+
 
 class TestHealthStatus:
     """Test HealthStatus model."""
@@ -275,6 +300,16 @@ class TestExecutorMetrics:
 
         assert metrics.pool_hit_ratio == 0.8
 
+    def test_metrics_update_ratios(self):
+        """Test ratios are refreshed after counters change."""
+        metrics = ExecutorMetrics(provider=ExecutorProvider.LOCAL_DOCKER)
+
+        metrics.total_executions += 4
+        metrics.successful_executions += 3
+        metrics.update_ratios()
+
+        assert metrics.success_rate == 0.75
+
     def test_metrics_to_dict(self):
         """Test metrics to dict conversion."""
         metrics = ExecutorMetrics(
@@ -0,0 +1,42 @@
+"""
+Tests for LatencyHistogram.
+"""
+
+import pytest
+
+from core.executor.latency import LatencyHistogram
+
+
+class TestLatencyHistogram:
+    """Test LatencyHistogram."""
+
+    def test_empty(self):
+        """Test percentiles of an empty histogram."""
+        histogram = LatencyHistogram()
+
+        assert len(histogram) == 0
+        assert histogram.percentiles(0.5, 0.99) == (0.0, 0.0)
+
+    def test_percentiles(self):
+        """Test percentile estimates stay close to the true values."""
+        histogram = LatencyHistogram()
+        for value in range(1, 1001):
+            histogram.record(float(value))
+
+        p50, p95, p99 = histogram.percentiles(0.5, 0.95, 0.99)
+
+        assert len(histogram) == 1000
+        assert p50 == pytest.approx(500, rel=0.1)
+        assert p95 == pytest.approx(950, rel=0.1)
+        assert p99 == pytest.approx(990, rel=0.1)
+
+    def test_out_of_range_values(self):
+        """Test sub-millisecond and very large samples are clamped."""
+        histogram = LatencyHistogram()
+        histogram.record(0.0)
+        histogram.record(1e9)
+
+        low, high = histogram.percentiles(0.5, 1.0)
+
+        assert low < 2
+        assert high > 500_000
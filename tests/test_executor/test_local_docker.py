@@ -3,13 +3,55 @@ Tests for LocalDockerExecutor.
 """
 
 import asyncio
+import io
+import socket
+import tarfile
 
 import pytest
 from unittest.mock import MagicMock, patch
 
 from core.executor.interface import ExecutorProvider, Runtime
 from core.executor.models import ExecutionRequest
-from core.executor.providers.local_docker import LocalDockerExecutor
+from core.executor.providers.local_docker import LocalDockerExecutor, _build_code_archive
+from core.warm_pool.shell import (
+    FRAME_HEADER,
+    STDERR,
+    STDOUT,
+    ShellError,
+    UnsupportedTransportError,
+)
+
+
+def mock_exec_api(client, exit_code=0, stdout=b"", stderr=b""):
+    """
+    Make low-level exec calls succeed.
+
+    Execs that launch user code produce the given output and exit code;
+    other execs (file writes, resets) succeed without output.
+    """
+    peers = []
+    results = {}
+
+    def exec_create(container_id, cmd, **kwargs):
+        exec_id = f"exec_{len(results)}"
+        runs_code = any(arg.startswith("/tmp/code/") for arg in cmd)
+        results[exec_id] = (exit_code, stdout, stderr) if runs_code else (0, b"", b"")
+        return {"Id": exec_id}
+
+    def exec_start(exec_id, **kwargs):
+        # Socket that accepts input, then reads the framed output and EOF
+        _, out, err = results[exec_id]
+        sock, peer = socket.socketpair()
+        for stream, data in ((STDOUT, out), (STDERR, err)):
+            if data:
+                peer.sendall(FRAME_HEADER.pack(stream, len(data)) + data)
+        peer.shutdown(socket.SHUT_WR)
+        peers.append(peer)
+        return sock
+
+    client.api.exec_create.side_effect = exec_create
+    client.api.exec_start.side_effect = exec_start
+    client.api.exec_inspect.side_effect = lambda exec_id: {"ExitCode": results[exec_id][0]}
 
 
 class TestLocalDockerExecutor:
@@ -34,6 +76,7 @@ class TestLocalDockerExecutor:
         container.reload.return_value = None
 
         client.containers.run.return_value = container
+        mock_exec_api(client, stdout=b"Hello, World!\n")
 
         return client
 
@@ -177,6 +220,98 @@ class TestLocalDockerExecutor:
             with pytest.raises(Exception):  # Should raise timeout error
                 await executor.execute(request)
 
+    @pytest.mark.asyncio
+    async def test_execute_batch(self, executor, mock_docker_client):
+        """Test a batch reuses one container per runtime."""
+        await executor.pool_manager.warm_up(Runtime.PYTHON_311, count=2)
+
+        requests = [
+            ExecutionRequest(code=f"print({i})", runtime=runtime)
+            for i, runtime in enumerate(
+                [Runtime.PYTHON_311, Runtime.NODE_20, Runtime.PYTHON_311, Runtime.PYTHON_311]
+            )
+        ]
+
+        with patch.object(
+            executor.pool_manager, "acquire", wraps=executor.pool_manager.acquire
+        ) as acquire:
+            results = await executor.execute_batch(requests)
+
+        assert acquire.call_count == 2
+        assert [r.execution_id for r in results] == [r.execution_id for r in requests]
+        assert all(r.success for r in results)
+        assert [r.cold_start for r in results] == [False, True, False, False]
+        assert executor._metrics.total_executions == 4
+        assert executor._metrics.warm_start_count == 3
+        assert all(c.is_available for c in executor.pool_manager._pools[Runtime.PYTHON_311])
+
+    @pytest.mark.asyncio
+    async def test_execute_batch_timeout(self, executor, mock_docker_client, caplog):
+        """Test a timeout in a batch fails its group without losing other results."""
+        await executor.pool_manager.warm_up(Runtime.PYTHON_311, count=1)
+        run_exec = executor._run_exec
+        calls = 0
+
+        async def time_out_second(*args, **kwargs):
+            nonlocal calls
+            calls += 1
+            if calls == 2:
+                raise asyncio.TimeoutError()
+            return await run_exec(*args, **kwargs)
+
+        requests = [
+            ExecutionRequest(code=f"print({i})", runtime=Runtime.PYTHON_311)
+            for i in range(4)
+        ]
+
+        with patch.object(executor, "_run_exec", side_effect=time_out_second):
+            results = await executor.execute_batch(requests)
+
+        assert [r.success for r in results] == [True, False, False, False]
+        assert "timed out" in results[1].stderr
+        assert "Not run" in results[2].stderr
+        assert calls == 2
+
+        # Skipped requests are logged once, without a traceback
+        skipped_logs = [r for r in caplog.records if "Not running" in r.getMessage()]
+        assert [r.levelname for r in skipped_logs] == ["WARNING"]
+        assert sum(r.levelname == "ERROR" for r in caplog.records) == 1
+        assert executor.pool_manager._pools[Runtime.PYTHON_311] == []
+
+    @pytest.mark.asyncio
+    async def test_failed_reset_removes_container(self, executor, mock_docker_client):
+        """Test a container whose reset times out isn't returned to the pool."""
+        await executor.pool_manager.warm_up(Runtime.PYTHON_311, count=1)
+
+        with patch.object(executor, "_clear_container", side_effect=asyncio.TimeoutError()):
+            result = await executor.execute(
+                ExecutionRequest(code="print(1)", runtime=Runtime.PYTHON_311)
+            )
+
+        assert result.success is True
+        assert executor.pool_manager._pools[Runtime.PYTHON_311] == []
+        mock_docker_client.containers.run.return_value.remove.assert_called_with(force=True)
+
+    @pytest.mark.asyncio
+    async def test_get_shell_failures(self, executor):
+        """Test only an unsupported transport disables persistent shells."""
+        await executor.pool_manager.warm_up(Runtime.PYTHON_311, count=1)
+        container = executor.pool_manager._pools[Runtime.PYTHON_311][0]
+
+        with patch(
+            "core.executor.providers.local_docker.ContainerShell.open",
+            side_effect=ShellError("Shell exited"),
+        ):
+            assert await executor._get_shell(container) is None
+        assert executor.persistent_shell is True
+
+        with patch(
+            "core.executor.providers.local_docker.ContainerShell.open",
+            side_effect=UnsupportedTransportError("Unsupported Docker transport: NpipeSocket"),
+        ):
+            assert await executor._get_shell(container) is None
+        assert executor.persistent_shell is False
+
     @pytest.mark.asyncio
     async def test_warm_up(self, executor):
         """Test warming up containers."""
@@ -184,6 +319,22 @@ class TestLocalDockerExecutor:
 
         assert count == 3
 
+    @pytest.mark.asyncio
+    async def test_autoscale_warm_pool(self, executor):
+        """Test pools grow to match the smoothed arrival rate."""
+        executor._metrics.avg_execution_time_ms = 2000
+        executor._arrivals = {Runtime.GO_121: 60, Runtime.JAVA_17: 1}
+        executor._last_autoscale_at -= 30
+
+        warmed = await executor.autoscale_warm_pool()
+
+        # 0.3 * 2/s * 2s -> 2 containers; a trickle still keeps one warm
+        assert warmed == {Runtime.GO_121: 2, Runtime.JAVA_17: 1}
+        assert executor._arrivals == {}
+
+        # Decayed rate still fits the existing pools
+        assert await executor.autoscale_warm_pool() == {}
+
     @pytest.mark.asyncio
     async def test_health_check_healthy(self, executor, mock_docker_client):
         """Test health check when healthy."""
@@ -231,6 +382,9 @@ class TestLocalDockerExecutor:
         assert metrics.provider == ExecutorProvider.LOCAL_DOCKER
         assert metrics.total_executions == 3
         assert metrics.avg_execution_time_ms > 0
+        assert metrics.p50_execution_time_ms > 0
+        assert metrics.min_execution_time_ms <= metrics.avg_execution_time_ms <= metrics.max_execution_time_ms
+        assert metrics.first_execution_at <= metrics.last_execution_at
 
     @pytest.mark.asyncio
     async def test_metrics_tracking(self, executor, mock_docker_client):
@@ -268,6 +422,7 @@ class TestLocalDockerExecutorEdgeCases:
         )
 
         client.containers.run.return_value = container
+        mock_exec_api(client)
 
         return client
 
@@ -280,9 +435,10 @@ class TestLocalDockerExecutorEdgeCases:
     @pytest.mark.asyncio
     async def test_execute_with_error_output(self, executor, mock_docker_client):
         """Test execution that produces stderr."""
-        mock_docker_client.containers.run.return_value.exec_run.return_value = MagicMock(
+        mock_exec_api(
+            mock_docker_client,
             exit_code=1,
-            output=(b"", b"Error: something went wrong\n"),
+            stderr=b"Error: something went wrong\n",
         )
 
         await executor.pool_manager.warm_up(Runtime.PYTHON_311, count=1)
@@ -296,6 +452,7 @@ class TestLocalDockerExecutorEdgeCases:
 
         assert result.success is False
         assert result.exit_code == 1
+        assert result.stderr == "Error: something went wrong\n"
 
     @pytest.mark.asyncio
     async def test_execute_different_runtimes(self, executor, mock_docker_client):
@@ -315,4 +472,15 @@ class TestLocalDockerExecutorEdgeCases:
         )
         assert node_result.success is True
 
+    def test_build_code_archive(self):
+        """Test code files are packed into one tar under code/."""
+        request = ExecutionRequest(
+            code="print('main')",
+            runtime=Runtime.PYTHON_311,
+            files={"helper.py": "X = 1"},
+        )
 
+        with tarfile.open(fileobj=io.BytesIO(_build_code_archive(request))) as tar:
+            assert tar.getmember("code").isdir()
+            assert tar.extractfile("code/main.py").read() == b"print('main')"
+            assert tar.extractfile("code/helper.py").read() == b"X = 1"
@@ -3,6 +3,7 @@ Tests for executor registry.
 """
 
 import pytest
+from unittest.mock import patch
 
 from core.executor.interface import ExecutorProvider, Runtime
 from core.executor.registry import ExecutorRegistry
@@ -51,6 +52,14 @@ class TestExecutorRegistry:
         ExecutorRegistry.set_fallback_chain(chain)
         assert ExecutorRegistry.get_fallback_chain() == chain
 
+    def test_fallback_chain_copied(self, mock_executor, reset_registry):
+        """Test later changes to the caller's chain list are not picked up."""
+        chain = [ExecutorProvider.AWS_LAMBDA]
+        ExecutorRegistry.set_fallback_chain(chain)
+        chain.append(ExecutorProvider.GCP_CLOUD_RUN)
+
+        assert ExecutorRegistry.get_fallback_chain() == [ExecutorProvider.AWS_LAMBDA]
+
     def test_is_registered(self, mock_executor, reset_registry):
         """Test checking if provider is registered."""
         assert ExecutorRegistry.is_registered(ExecutorProvider.LOCAL_DOCKER)
@@ -102,6 +111,40 @@ class TestExecutorRegistry:
         assert result.success is True
         assert len(mock_executor.execute_calls) == 1
 
+    @pytest.mark.asyncio
+    async def test_execute_batch_with_fallback(self, mock_executor, reset_registry):
+        """Test a batch runs on one provider, in order."""
+        requests = [
+            ExecutionRequest(code=f"print({i})", runtime=Runtime.PYTHON_311)
+            for i in range(3)
+        ]
+
+        results = await ExecutorRegistry.execute_batch_with_fallback(requests)
+
+        assert [r.execution_id for r in results] == [r.execution_id for r in requests]
+        assert mock_executor.execute_calls == requests
+        assert await ExecutorRegistry.execute_batch_with_fallback([]) == []
+
+    @pytest.mark.asyncio
+    async def test_execute_with_fallback_caches_health(self, mock_executor, reset_registry):
+        """Test health is checked once, then again after a failed execution."""
+        request = ExecutionRequest(
+            code="print('hello')",
+            runtime=Runtime.PYTHON_311,
+        )
+
+        with patch.object(mock_executor, "health_check", wraps=mock_executor.health_check) as health_check:
+            await ExecutorRegistry.execute_with_fallback(request)
+            await ExecutorRegistry.execute_with_fallback(request)
+            assert health_check.call_count == 1
+
+            with patch.object(mock_executor, "execute", side_effect=RuntimeError("boom")):
+                with pytest.raises(ExecutorNotAvailableError):
+                    await ExecutorRegistry.execute_with_fallback(request)
+
+            await ExecutorRegistry.execute_with_fallback(request)
+            assert health_check.call_count == 2
+
     @pytest.mark.asyncio
     async def test_initialize_all(self, mock_executor, reset_registry):
         """Test initializing all executors."""
@@ -0,0 +1,34 @@
+"""
+Tests for PluginRunner
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+
+class TestPluginRunner:
+    """Tests for PluginRunner with a mocked Docker client"""
+
+    @pytest.fixture
+    def runner(self):
+        """PluginRunner whose containers never really run"""
+        from services.plugin_runner import PluginRunner
+
+        with patch("docker.from_env", return_value=MagicMock()):
+            runner = PluginRunner()
+        runner.acquire_container = AsyncMock(return_value=MagicMock())
+        runner.release_container = MagicMock()
+        return runner
+
+    @pytest.mark.asyncio
+    async def test_execute_wrapper_killed(self, runner):
+        """Test a wrapper that dies without output reports its exit code and stderr"""
+        with patch.object(runner, "_exec_wrapper", return_value=(137, b"", b"Killed\n")):
+            result = await runner.execute({"execution_id": "e1"}, "print(1)")
+
+        assert result["success"] is False
+        assert result["error"] == "Container execution error"
+        assert result["exit_code"] == 137
+        assert result["details"] == "Killed\n"
+        runner.release_container.assert_called_once()
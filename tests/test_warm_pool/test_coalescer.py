@@ -0,0 +1,85 @@
+"""
+Tests for DockerCallCoalescer.
+"""
+
+import asyncio
+
+import pytest
+
+from core.warm_pool.coalescer import DockerCallCoalescer
+
+
+class TestDockerCallCoalescer:
+    """Test DockerCallCoalescer."""
+
+    @pytest.mark.asyncio
+    async def test_identical_calls_share_result(self):
+        """Test concurrent calls with the same key run once."""
+        coalescer = DockerCallCoalescer()
+        calls = 0
+
+        async def ping():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        results = await asyncio.gather(*(coalescer.call("ping", ping) for _ in range(5)))
+
+        assert results == [1] * 5
+        assert calls == 1
+        assert len(coalescer) == 0
+
+        # Completed calls aren't reused
+        assert await coalescer.call("ping", ping) == 2
+
+    @pytest.mark.asyncio
+    async def test_different_keys_run_separately(self):
+        """Test calls with different keys don't share a result."""
+        coalescer = DockerCallCoalescer()
+
+        async def echo(value):
+            await asyncio.sleep(0.01)
+            return value
+
+        results = await asyncio.gather(
+            coalescer.call("a", lambda: echo("a")),
+            coalescer.call("b", lambda: echo("b")),
+        )
+
+        assert results == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_error_shared(self):
+        """Test a failed call raises for every waiting caller."""
+        coalescer = DockerCallCoalescer()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("daemon unavailable")
+
+        results = await asyncio.gather(
+            coalescer.call("ping", fail),
+            coalescer.call("ping", fail),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert len(coalescer) == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller(self):
+        """Test cancelling one caller leaves the call running for others."""
+        coalescer = DockerCallCoalescer()
+
+        async def slow():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        first = asyncio.create_task(coalescer.call("slow", slow))
+        second = asyncio.create_task(coalescer.call("slow", slow))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == "done"
+        assert first.cancelled()
@@ -202,6 +202,38 @@ class TestWarmPoolManager:
 
         assert container not in pool_manager._pools[Runtime.PYTHON_311]
 
+    @pytest.mark.asyncio
+    async def test_pre_replace_aging_idle(self, pool_manager):
+        """Test an idle container nearing TTL is replaced right away."""
+        await pool_manager.warm_up(Runtime.PYTHON_311, count=2)
+        aging = pool_manager._pools[Runtime.PYTHON_311][0]
+        aging.created_at -= 3500
+
+        created = await pool_manager.pre_replace_aging()
+
+        assert created == 1
+        assert aging not in pool_manager._pools[Runtime.PYTHON_311]
+        assert len(pool_manager._pools[Runtime.PYTHON_311]) == 2
+
+        # Fresh containers aren't replaced
+        assert await pool_manager.pre_replace_aging() == 0
+
+    @pytest.mark.asyncio
+    async def test_pre_replace_aging_busy(self, pool_manager):
+        """Test a busy container nearing TTL is retired on release."""
+        await pool_manager.warm_up(Runtime.PYTHON_311, count=1)
+        aging = await pool_manager.acquire(Runtime.PYTHON_311)
+        aging.created_at -= 3500
+
+        assert await pool_manager.pre_replace_aging() == 1
+        assert aging.replaced is True
+        assert len(pool_manager._pools[Runtime.PYTHON_311]) == 2
+
+        await pool_manager.release(aging, Runtime.PYTHON_311)
+
+        assert aging not in pool_manager._pools[Runtime.PYTHON_311]
+        assert len(pool_manager._pools[Runtime.PYTHON_311]) == 1
+
 
 class TestWarmPoolManagerIntegration:
     """Integration tests for WarmPoolManager."""
@@ -0,0 +1,176 @@
+"""
+Tests for ContainerShell.
+"""
+
+import socket
+import subprocess
+import threading
+
+import pytest
+from unittest.mock import MagicMock
+
+from core.warm_pool.shell import (
+    ContainerShell,
+    FRAME_HEADER,
+    ShellError,
+    STDERR,
+    STDOUT,
+    run_exec,
+)
+
+
+def fake_exec_api():
+    """
+    Mock Docker API whose exec socket is bridged to a local `sh`.
+
+    Output is framed like Docker's multiplexed exec stream.
+    """
+    sock, peer = socket.socketpair()
+    process = subprocess.Popen(
+        ["sh"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    send_lock = threading.Lock()
+
+    def pump_input():
+        while data := peer.recv(4096):
+            process.stdin.write(data)
+            process.stdin.flush()
+        process.stdin.close()
+
+    def pump_output(pipe, stream):
+        while data := pipe.read1(4096):
+            with send_lock:
+                peer.sendall(FRAME_HEADER.pack(stream, len(data)) + data)
+
+    def pump_outputs():
+        # Like the daemon, end the stream once the shell's output is closed
+        pumps = [
+            threading.Thread(target=pump_output, args=(process.stdout, STDOUT)),
+            threading.Thread(target=pump_output, args=(process.stderr, STDERR)),
+        ]
+        for pump in pumps:
+            pump.start()
+        for pump in pumps:
+            pump.join()
+        peer.shutdown(socket.SHUT_WR)
+
+    threading.Thread(target=pump_input, daemon=True).start()
+    threading.Thread(target=pump_outputs, daemon=True).start()
+
+    api = MagicMock()
+    api.exec_create.return_value = {"Id": "exec_123"}
+    api.exec_start.return_value = sock
+    return api, process
+
+
+class TestContainerShell:
+    """Test ContainerShell."""
+
+    @pytest.fixture
+    def api(self):
+        """Create mock Docker API bridged to a local `sh`."""
+        api, process = fake_exec_api()
+        yield api
+        process.kill()
+        process.wait()
+
+    @pytest.mark.asyncio
+    async def test_run_captures_output(self, api):
+        """Test stdout, stderr and exit code of a command."""
+        shell = await ContainerShell.open(api, "test_container_123")
+
+        exit_code, stdout, stderr = await shell.run("echo out; echo err >&2; (exit 3)")
+
+        assert exit_code == 3
+        assert stdout == b"out\n"
+        assert stderr == b"err\n"
+
+    @pytest.mark.asyncio
+    async def test_run_reuses_shell(self, api):
+        """Test several commands run over the same shell."""
+        shell = await ContainerShell.open(api, "test_container_123")
+
+        for i in range(3):
+            exit_code, stdout, _ = await shell.run(f"printf {i}")
+            assert exit_code == 0
+            assert stdout == str(i).encode()
+
+    @pytest.mark.asyncio
+    async def test_run_with_stdin(self, api):
+        """Test stdin is fed to the command."""
+        shell = await ContainerShell.open(api, "test_container_123")
+
+        exit_code, stdout, _ = await shell.run("cat", stdin="line 1\nline 2")
+
+        assert exit_code == 0
+        assert stdout == b"line 1\nline 2"
+
+        exit_code, stdout, _ = await shell.run("cat; (exit 4)", stdin="")
+
+        assert exit_code == 4
+        assert stdout == b""
+
+        exit_code, stdout, _ = await shell.run("cat", stdin=b"\x00\xff")
+
+        assert exit_code == 0
+        assert stdout == b"\x00\xff"
+
+    @pytest.mark.asyncio
+    async def test_run_after_exit(self, api):
+        """Test a shell that exited is closed and rejects commands."""
+        shell = await ContainerShell.open(api, "test_container_123")
+
+        with pytest.raises(ShellError):
+            await shell.run("exit 0")
+
+        assert shell.closed is True
+        with pytest.raises(ShellError):
+            await shell.run("true")
+
+    @pytest.mark.asyncio
+    async def test_open_without_shell(self):
+        """Test opening fails when nothing answers on the exec socket."""
+        sock, peer = socket.socketpair()
+        peer.shutdown(socket.SHUT_WR)
+        api = MagicMock()
+        api.exec_create.return_value = {"Id": "exec_123"}
+        api.exec_start.return_value = sock
+
+        with pytest.raises(ShellError):
+            await ContainerShell.open(api, "test_container_123")
+
+        peer.close()
+
+
+class TestRunExec:
+    """Test run_exec."""
+
+    @pytest.fixture
+    def api(self):
+        """Create mock Docker API bridged to a local `sh`."""
+        api, process = fake_exec_api()
+        api.exec_inspect.return_value = {"ExitCode": 3}
+        yield api
+        process.kill()
+        process.wait()
+
+    @pytest.mark.asyncio
+    async def test_run_exec(self, api):
+        """Test stdin is sent and output is read until the exec ends."""
+        exit_code, stdout, stderr = await run_exec(
+            api,
+            "test_container_123",
+            ["sh"],
+            stdin=b"echo out; echo err >&2\n",
+        )
+
+        assert exit_code == 3
+        assert stdout == b"out\n"
+        assert stderr == b"err\n"
+        api.exec_create.assert_called_once_with(
+            "test_container_123", ["sh"], stdin=True, environment=None
+        )
+        api.exec_inspect.assert_called_once_with("exec_123")